@@ -1,68 +1,277 @@
-import http.server
-import os
-import socketserver
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import re
 import threading
-import urllib.parse
 import webbrowser
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
-import pkg_resources
-from matplotlib import rc
-from matplotlib.figure import Figure
+if TYPE_CHECKING:
+    import networkx as nx
+    from matplotlib.figure import Figure
 
-rc("svg", fonttype="path")
-import re
-import time
-import tkinter as tk
+    from .cache import GraphCache
+    from .edits import EditLog
+    from .payload import GraphPayload
+    from .server import EditorServer
+
+
+def _package_directory():
+    import importlib.resources
+
+    return str(importlib.resources.files(__package__))
+
+
+def _artist_elements(artist):
+    from matplotlib.collections import Collection, QuadMesh
+    from matplotlib.lines import Line2D
+
+    if isinstance(artist, QuadMesh):
+        rows, columns = artist.get_coordinates().shape[:2]
+        return (rows - 1) * (columns - 1)
+    if isinstance(artist, Collection):
+        return max(len(artist.get_paths()), len(artist.get_offsets()))
+    if isinstance(artist, Line2D) and artist.get_marker() not in ("None", "", " "):
+        return len(artist.get_xdata())
+
+    return 0
+
+
+@contextlib.contextmanager
+def _rasterize_dense(figure, threshold):
+    # Rasterize the artists with the most SVG elements until the rest of the
+    # figure stays below the threshold; axes and text remain vector.
+    counts = [
+        (count, artist)
+        for artist in figure.findobj()
+        if not artist.get_rasterized() and (count := _artist_elements(artist))
+    ]
+    counts.sort(key=lambda item: item[0], reverse=True)
+
+    total = sum(count for count, _ in counts)
+    rasterized = []
+    for count, artist in counts:
+        if total <= threshold:
+            break
+        artist.set_rasterized(True)
+        rasterized.append(artist)
+        total -= count
 
-import networkx as nx
-from pyvis.network import Network
+    try:
+        yield rasterized
+    finally:
+        for artist in rasterized:
+            artist.set_rasterized(False)
+
+
+def _receive_edits(session, node_keys, body):
+    from .edits import EditLog
+
+    log = EditLog.from_json(body)
+    if node_keys is not None:
+        # The graph page refers to nodes by their payload index.
+        for operation in log:
+            if operation["op"] == "remove_nodes":
+                operation["nodes"] = node_keys(operation["nodes"])
+
+    session.receive(log)
+
+
+def _node_keys(nodes, indices):
+    keys = []
+    for index in indices:
+        if not isinstance(index, int) or not 0 <= index < len(nodes):
+            raise ValueError("Invalid node index.")
+        keys.append(nodes[index])
+
+    return keys
+
+
+def _css_length(value, default):
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return f"{value}px"
+
+    return value
+
+
+_START_TAG = re.compile(rb"<[A-Za-z_]")
+
+
+class ExportStats:
+    """
+    Size of the document exported by :class:`MplEditor`.
+
+    Compares the SVG written by Matplotlib with the document served to the
+    editor, which is normalized and, in compact mode, deduplicated. The
+    vector elements of artists rasterized in compact mode are in neither
+    document; they are counted separately.
+
+    Attributes
+    ----------
+    rendered_elements : int
+        Number of elements of the SVG written by Matplotlib.
+
+    rendered_bytes : int
+        Size of the SVG written by Matplotlib.
+
+    elements : int
+        Number of elements of the served document.
+
+    bytes : int
+        Size of the served document.
+
+    rasterized_artists : int
+        Number of artists embedded as bitmaps.
+
+    rasterized_elements : int
+        Number of vector elements the rasterized artists would produce.
+    """
+
+    def __init__(self, rendered, document, rasterized=()):
+        self.rendered_elements = len(_START_TAG.findall(rendered))
+        self.rendered_bytes = len(rendered)
+        self.elements = len(_START_TAG.findall(document))
+        self.bytes = len(document)
+        self.rasterized_artists = len(rasterized)
+        self.rasterized_elements = sum(_artist_elements(a) for a in rasterized)
+
+    def __repr__(self):
+        return (
+            f"ExportStats(elements={self.rendered_elements} -> {self.elements}, "
+            f"bytes={self.rendered_bytes} -> {self.bytes}, "
+            f"rasterized_artists={self.rasterized_artists}, "
+            f"rasterized_elements={self.rasterized_elements})"
+        )
 
 
 class MplEditor:
     """
     Browser-based SVG editor for Matplotlib figures.
 
-    This class converts a Matplotlib figure into an SVG file and opens it in a
-    custom HTML editor served on a lightweight HTTP server. The editor allows
-    interactive manipulation of the SVG image inside a web browser.
+    This class renders a Matplotlib figure into an in-memory SVG document and
+    opens it in a custom HTML editor served by the shared :class:`EditorServer`.
+    The editor allows interactive manipulation of the SVG image inside a web
+    browser.
 
     Parameters
     ----------
     figure : matplotlib.figure.Figure
-        The Matplotlib figure that will be exported as a temporary SVG file.
+        The Matplotlib figure that will be exported as SVG.
+
+    server : EditorServer, optional
+        Server used to serve the editor. Defaults to the process-wide server
+        returned by :func:`get_server`.
+
+    normalize : bool
+        Whether to flatten groups and assign element ids in Python before
+        serving the document, see :func:`JVG.svgproc.normalize_svg`.
+
+    precision : int, optional
+        Number of decimals kept in coordinates of the normalized document.
+
+    compact : bool
+        Export mode for huge figures. Repeated markers, paths and styles are
+        defined once, and when the figure would produce more than
+        ``raster_threshold`` SVG elements the densest artists (scatter
+        markers, meshes, marker lines) are embedded as bitmaps, while axes,
+        text and annotations stay editable vector elements.
+
+    raster_threshold : int
+        Number of data elements above which dense artists are rasterized in
+        compact mode.
+
+    raster_dpi : float
+        Resolution of the rasterized artists.
 
     Attributes
     ----------
     figure : matplotlib.figure.Figure
         Input Matplotlib figure.
 
+    server : EditorServer or None
+        Server passed to the constructor.
+
+    normalize : bool
+        Whether the served document is normalized.
+
+    precision : int or None
+        Coordinate precision of the normalized document.
+
+    compact : bool
+        Whether the compact export mode is used.
+
+    stats : ExportStats or None
+        Element counts and sizes of the last document returned by
+        :meth:`svg_document`.
+
+    session_id : str or None
+        Identifier of the editor session, available after :meth:`edit`.
+
     _package_path : str
-        Absolute path to the package directory used to store temporary files.
+        Absolute path to the package directory.
 
-    _cwd : str
-        Original working directory restored after editing.
+    ready : threading.Event
+        Set as soon as the HTTP server is listening and the editor page can
+        be requested.
 
 
     Notes
     -----
-    - A temporary file ``tmp.svg`` is created inside the package directory.
-    - The editor is served on ``http://localhost:8005``.
+    - The SVG document is kept in memory and never written to disk.
+    - All editors of a process share one server listening on a free port, or
+      on the port given by the ``JVG_PORT`` environment variable.
     - The browser is automatically opened when calling :meth:`edit`.
+    - The page sends its edits back as an :class:`JVG.edits.EditLog`, which
+      can be saved and replayed on other figures with :meth:`apply_edits`.
+    - After changing the figure in Python, :meth:`refresh` updates the open
+      page in place.
     """
 
-    def __init__(self, figure: Figure):
+    def __init__(
+        self,
+        figure: Figure,
+        server: EditorServer = None,
+        normalize: bool = True,
+        precision: int = None,
+        compact: bool = False,
+        raster_threshold: int = 50_000,
+        raster_dpi: float = 150,
+    ):
         """
         Initialize an instance of :class:`MplEditor`.
 
-        This constructor stores the input Matplotlib figure, determines the
-        package directory used for temporary files, and saves the current
-        working directory so that it can be restored after editing.
+        This constructor stores the input Matplotlib figure and determines the
+        package directory. The editor never changes the working directory of
+        the process, so it can be used from several threads at once.
 
         Parameters
         ----------
         figure : matplotlib.figure.Figure
-            The Matplotlib figure that will be exported as a temporary SVG file.
+            The Matplotlib figure that will be exported as SVG.
+
+        server : EditorServer, optional
+            Server used to serve the editor.
+
+        normalize : bool
+            Whether to normalize the document before serving it.
+
+        precision : int, optional
+            Number of decimals kept in coordinates.
+
+        compact : bool
+            Whether to deduplicate and rasterize dense artists.
+
+        raster_threshold : int
+            Number of data elements above which dense artists are rasterized.
+
+        raster_dpi : float
+            Resolution of the rasterized artists.
 
         Attributes
         ----------
@@ -70,136 +279,275 @@ class MplEditor:
             The input Matplotlib figure to be displayed in the browser editor.
 
         _package_path : str
-            Absolute path to the package directory where temporary files are stored.
+            Absolute path to the package directory.
 
-        _cwd : str
-            Original working directory, restored at the end of :meth:`edit`.
+        ready : threading.Event
+            Set once the editor session is registered on a listening server.
 
         Notes
         -----
-        The package directory is obtained using :func:`pkg_resources.resource_filename`.
+        The package directory is obtained using :func:`importlib.resources.files`.
         """
 
         self.figure = figure
+        self.server = server
+        self.session_id = None
+        self.normalize = normalize
+        self.precision = precision
+        self.compact = compact
+        self.raster_threshold = raster_threshold
+        self.raster_dpi = raster_dpi
+
+        self._package_path = _package_directory()
+        self._document = None
+        self.stats = None
+        self._served = None
+        self._stream = None
+
+        self.ready = threading.Event()
+
+    def render_svg(self):
+        """
+        Render the Matplotlib figure into an in-memory SVG document.
 
-        def get_package_directory():
-            return pkg_resources.resource_filename(__name__, "")
+        Text is exported as paths, so the document renders identically
+        without the fonts installed. The output is deterministic: rendering
+        an unchanged figure again yields the same bytes. In compact mode
+        dense artists are rasterized for the duration of the rendering.
 
-        self._package_path = get_package_directory()
-        self._cwd = os.getcwd()
+        Returns
+        -------
+        bytes
+            The SVG document.
+        """
 
-    def save_tmp(self):
+        return self._render()[0]
+
+    def _render(self):
+        # The SVG document and the artists rasterized while rendering it.
+        import matplotlib
+
+        options = {}
+        rasterize = contextlib.nullcontext()
+        if self.compact:
+            options["dpi"] = self.raster_dpi
+            rasterize = _rasterize_dense(self.figure, self.raster_threshold)
+
+        buffer = io.BytesIO()
+        with matplotlib.rc_context(
+            {"svg.fonttype": "path", "svg.hashsalt": "JVG"}
+        ), rasterize as rasterized:
+            self.figure.savefig(
+                buffer,
+                format="svg",
+                bbox_inches="tight",
+                transparent=True,
+                metadata={"Date": None},
+                **options,
+            )
+
+        return buffer.getvalue(), rasterized or []
+
+    def svg_document(self):
         """
-        Save the Matplotlib figure as an SVG file named ``tmp.svg``.
+        Render the document served to the editor.
 
-        The file is written inside the package directory and overwrites
-        any existing version.
+        The rendered SVG is normalized unless ``normalize`` is false. The
+        normalized document is cached and reused as long as the figure
+        renders to the same SVG. The sizes of the rendered and the returned
+        document are stored in :attr:`stats`.
 
         Returns
         -------
-        None
+        bytes
+            The SVG document.
         """
 
-        self.figure.savefig(
-            os.path.join(self._package_path, "tmp.svg"),
-            format="svg",
-            bbox_inches="tight",
-            transparent=True,
-        )
+        from .svgproc import normalize_svg
 
-    def run_server(self):
-        """
-        Start a blocking HTTP server on port 8005.
+        svg, rasterized = self._render()
+        if not self.normalize:
+            self.stats = ExportStats(svg, svg, rasterized)
+            return svg
 
-        The server exposes the package directory so that HTML files and
-        the temporary SVG file can be accessed by the browser.
+        key = (hashlib.sha1(svg).digest(), self.precision, self.compact)
+        if self._document is None or self._document[0] != key:
+            document = normalize_svg(
+                svg, precision=self.precision, deduplicate=self.compact
+            )
+            self._document = key, document, ExportStats(svg, document, rasterized)
+        self.stats = self._document[2]
 
-        Notes
-        -----
-        - This method blocks execution until the process is terminated.
-        - Typically it is run in a daemon thread by :meth:`edit`.
+        return self._document[1]
+
+    def open_in_browser(self, history_limit=None):
         """
+        Open the built-in HTML editor in the system web browser.
 
-        os.chdir(self._package_path)
+        The editor is loaded using ``vecedit.html`` from the session URL and
+        receives the figure and its stream of updates via relative query
+        parameters.
 
-        socketserver.TCPServer.allow_reuse_address = True
-        handler = http.server.SimpleHTTPRequestHandler
-        handler.directory = self._package_path
-        httpd = socketserver.TCPServer(("", 8005), handler)
-        httpd.serve_forever()
+        Parameters
+        ----------
+        history_limit : float, optional
+            Memory budget of the undo history in megabytes, see :meth:`edit`.
 
-    def open_in_browser(self):
+        Returns
+        -------
+        None
         """
-        Open the built-in HTML editor in the system web browser.
+        query = {"graph": "figure.svg", "events": "events"}
+        if history_limit is not None:
+            query["historyLimit"] = history_limit
+
+        url_with_argument = self.server.session_url(
+            self.session_id, "vecedit.html", **query
+        )
+
+        webbrowser.open(url_with_argument)
 
-        The editor is loaded using ``vecedit.html`` and receives
-        the ``tmp.svg`` file via a query parameter.
+    def close(self):
+        """
+        Remove the editor session and release the SVG document it serves.
 
         Returns
         -------
         None
         """
-        os.chdir(self._package_path)
+        if self.server is not None and self.session_id is not None:
+            self.server.unregister(self.session_id)
+            self.session_id = None
+        self._stream = None
 
-        file_path = "vecedit.html"
-        argument = "tmp.svg"
+    def refresh(self):
+        """
+        Push the changes of the figure to the open editor page.
 
-        file_path = file_path.replace("\\", "/")
-        argument = argument.replace("\\", "/")
+        The figure is rendered again and compared by element id with the
+        document last sent to the page, see :func:`JVG.svgproc.diff_svg`.
+        Only the changed elements are sent, as a Server-Sent Event, and the
+        page patches its document in place. Edits made in the browser are
+        kept: elements deleted in the browser stay deleted, and only the
+        attributes and style properties changed in Python are overwritten.
 
-        url_with_argument = f"http://localhost:8005/{os.path.basename(file_path)}?graph={urllib.parse.quote(argument)}"
+        Matplotlib numbers the ids of artists per type, so adding or
+        removing an artist renumbers the following artists of its type. Set
+        the ``gid`` of artists to keep their ids.
 
-        webbrowser.open(url_with_argument)
+        Returns
+        -------
+        int
+            Number of operations sent, ``0`` when the figure is unchanged.
 
-    def del_tmp(self):
+        Raises
+        ------
+        RuntimeError
+            If the editor is not open, see :meth:`edit`.
         """
-        Remove the temporary SVG file if it exists.
+
+        from .svgproc import diff_svg
+
+        if self._stream is None:
+            raise RuntimeError("The editor is not open; call edit() first.")
+
+        document = self.svg_document()
+        operations = diff_svg(self._served, document)
+        if operations:
+            self._stream.publish(json.dumps({"ops": operations}, separators=(",", ":")))
+        self._served = document
+
+        return len(operations)
+
+    def apply_edits(self, log: EditLog) -> bytes:
+        """
+        Apply a recorded edit log to the figure without opening the editor.
+
+        Parameters
+        ----------
+        log : EditLog
+            Edits sent by the editor page, see :meth:`edit`.
 
         Returns
         -------
-        None
+        bytes
+            The edited SVG document.
         """
-        try:
-            if os.path.exists(os.path.join(self._package_path, "tmp.svg")):
-                os.remove(os.path.join(self._package_path, "tmp.svg"))
-        except:
-            pass
 
-    def edit(self):
+        return log.apply_svg(self.svg_document())
+
+    def edit(self, history_limit=None):
         """
         Launch the full browser-based editing workflow.
 
         Steps
         -----
-        1. Save the Matplotlib figure to ``tmp.svg``.
-        2. Start the HTTP server in a background thread.
-        3. Open the browser with the generated editor.
-        4. Restore working directory.
+        1. Render the Matplotlib figure to an in-memory SVG document and
+           normalize it for the editor.
+        2. Start the shared HTTP server if it is not running yet.
+        3. Register the document as a new session.
+        4. Open the browser with the generated editor.
+        5. Return a handle that receives the edits sent back by the page.
+
+        The page stays open for updates pushed with :meth:`refresh`.
+
+        Parameters
+        ----------
+        history_limit : float, optional
+            Memory budget of the undo history in megabytes. The editor
+            records only the changed attributes and elements of every edit
+            and drops the oldest edits once the budget is exceeded. Defaults
+            to 64 MB.
 
         Returns
         -------
-        None
+        EditSession
+            Handle receiving the edits sent back by the page. Its
+            :meth:`~JVG.edits.EditSession.wait` method, or ``await``, returns
+            the edited SVG document, including the changes pushed with
+            :meth:`refresh`.
+
+        Raises
+        ------
+        OSError
+            If the HTTP server could not bind to its port.
         """
 
-        self.save_tmp()
+        from .edits import EditSession
+        from .server import EventStream, MemoryResource, get_server
+
+        document = self.svg_document()
+        svg = MemoryResource(document, "image/svg+xml")
+        stream = EventStream()
+        session = EditSession(lambda log: log.apply_svg(self._served))
 
-        server_thread = threading.Thread(target=self.run_server, daemon=True)
-        server_thread.start()
-        time.sleep(5)
+        if self.server is None:
+            self.server = get_server()
+        else:
+            self.server.start()
 
-        self.open_in_browser()
+        self.close()
+        self.session_id = self.server.register(
+            {"figure.svg": svg, "events": stream},
+            {"edits": functools.partial(_receive_edits, session, None)},
+        )
+        self._served = document
+        self._stream = stream
+        self.ready.set()
 
-        time.sleep(10)
+        self.open_in_browser(history_limit)
 
-        os.chdir(self._cwd)
+        return session
 
 
 class NxEditor:
     """
-    Interactive editor for NetworkX graphs based on pyvis.
+    Interactive editor for NetworkX graphs based on vis-network.
 
-    This class generates a temporary HTML file containing a pyvis visualization
-    of a NetworkX graph and injects custom JavaScript controls that enable:
+    This class converts a NetworkX graph into a compact binary payload and
+    opens it in the ``nxedit.html`` editor served by the shared
+    :class:`EditorServer`. The editor page provides custom JavaScript controls
+    that enable:
 
     - node selection,
     - node deletion,
@@ -214,45 +562,95 @@ class NxEditor:
     network : networkx.Graph
         The NetworkX graph to be visualized and edited.
 
+    server : EditorServer, optional
+        Server used to serve the editor. Defaults to the process-wide server
+        returned by :func:`get_server`.
+
+    cache : bool or GraphCache
+        On-disk cache of payloads and node positions. ``True`` uses the
+        user cache directory, ``False`` disables caching.
+
     Attributes
     ----------
-    network : networkx.Graph
-        The graph displayed in the editor.
+    network : networkx.Graph or None
+        The graph displayed in the editor, ``None`` for editors created with
+        :meth:`from_arrays` or :meth:`from_edgelist`.
 
-    _package_path : str
-        Directory containing temporary files and resources.
+    server : EditorServer or None
+        Server passed to the constructor.
+
+    cache : GraphCache or None
+        Cache of payloads and node positions.
+
+    session_id : str or None
+        Identifier of the editor session, available after :meth:`edit`.
 
-    _cwd : str
-        Original working directory restored after execution.
+    undo_limit : int
+        Number of removed nodes and edges the page keeps for undo. Undo
+        entries store only the removed nodes with their incident edges, and
+        the oldest entries are dropped once the limit is exceeded.
+
+    _package_path : str
+        Directory containing the editor templates.
 
     Examples
     --------
     Open an editable visualization of a simple graph:
 
     >>> import networkx as nx
-    >>> from editor import NxEditor
+    >>> from JVG import NxEditor
     >>> G = nx.cycle_graph(4)
     >>> NxEditor(G).edit()
 
     Notes
     -----
-    Editing operations occur only in the browser and do not modify the original
-    NetworkX graph object in Python.
+    Editing operations occur in the browser and never modify the original
+    NetworkX graph object in Python. Node removals sent back by the page are
+    applied to a copy of the graph, see :meth:`edit`.
+
+    Payloads and positions are cached on disk under a content hash of the
+    graph. Node positions are sent back by the page once the physics
+    simulation has stabilized or a node has been dragged, so opening an
+    unchanged graph again skips both the conversion and the layout.
     """
 
-    def __init__(self, network: nx.Graph):
+    physics = {
+        "solver": "repulsion",
+        "repulsion": {
+            "centralGravity": 0.2,
+            "damping": 0.09,
+            "nodeDistance": 150,
+            "springConstant": 0.05,
+            "springLength": 200,
+        },
+        "stabilization": {"enabled": True, "fit": True, "iterations": 1000},
+    }
+
+    undo_limit = 1_000_000
+
+    def __init__(
+        self,
+        network: nx.Graph,
+        server: EditorServer = None,
+        cache: bool | GraphCache = True,
+    ):
         """
         Initialize an instance of :class:`NxEditor`.
 
-        This constructor stores the input NetworkX graph, determines the
-        package directory for temporary resources, and saves the current
-        working directory so it can be restored after the editing session.
+        This constructor stores the input NetworkX graph and determines the
+        package directory holding the editor templates.
 
         Parameters
         ----------
         network : networkx.Graph
             The NetworkX graph to be displayed and edited in the browser-based
-            pyvis interface.
+            interface.
+
+        server : EditorServer, optional
+            Server used to serve the editor.
+
+        cache : bool or GraphCache
+            On-disk cache of payloads and node positions.
 
         Attributes
         ----------
@@ -260,492 +658,549 @@ class NxEditor:
             The input graph rendered by the editor.
 
         _package_path : str
-            Absolute path to the package directory used to store temporary HTML
-            files and related resources.
-
-        _cwd : str
-            Original working directory, restored after :meth:`edit` completes.
+            Absolute path to the package directory with the editor templates.
 
         Notes
         -----
         The package directory path is resolved using
-        :func:`pkg_resources.resource_filename`.
+        :func:`importlib.resources.files`.
         """
 
+        if cache is True:
+            from .cache import GraphCache
+
+            cache = GraphCache()
+
         self.network = network
+        self.server = server
+        self.session_id = None
+        self.cache = cache or None
+
+        self._package_path = _package_directory()
+        self._arrays = None
+        self._neighborhoods = None
+
+    @classmethod
+    def from_arrays(
+        cls,
+        sources,
+        targets,
+        node_attrs=None,
+        nodes=None,
+        widths=None,
+        directed=False,
+        server=None,
+        cache=True,
+    ):
+        """
+        Create an editor for a graph given as edge endpoint arrays.
 
-        def get_package_directory():
-            return pkg_resources.resource_filename(__name__, "")
+        No NetworkX graph is built: the arrays, which may be memory-mapped,
+        are converted directly into the payload loaded by the page, see
+        :meth:`GraphPayload.from_arrays <JVG.payload.GraphPayload.from_arrays>`.
 
-        self._package_path = get_package_directory()
-        self._cwd = os.getcwd()
+        Parameters
+        ----------
+        sources, targets : array_like
+            Node identifiers of the edge endpoints.
 
-    def edit(self):
-        """
-        Generate and open an interactive pyvis-based graph editor.
+        node_attrs : dict, optional
+            Arrays of the ``"label"``, ``"size"``, ``"color"`` or ``"title"``
+            node attributes, aligned with ``nodes``.
+
+        nodes : array_like, optional
+            Node identifiers. Defaults to the sorted unique endpoints.
+
+        widths : array_like of float, optional
+            Edge widths.
 
-        The editor is created in ``tmp.html`` inside the package directory.
-        Custom JavaScript code is injected into the HTML to enable interactive
-        editing, exporting, and layout control.
+        directed : bool
+            Whether edges are drawn with arrows.
+
+        server, cache
+            See :class:`NxEditor`.
 
         Returns
         -------
-        None
+        NxEditor
+            Editor whose ``network`` is ``None``.
         """
-        root = tk.Tk()
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
-        root.destroy()
 
-        desired_height = int(screen_height * 0.8)
-        desired_width = int(screen_width * 0.99)
+        from .payload import GraphPayload
 
-        net = Network(
-            notebook=True, height=f"{desired_height}px", width=f"{desired_width}px"
+        editor = cls(None, server=server, cache=cache)
+        editor._arrays = GraphPayload.from_arrays(
+            sources, targets, node_attrs, nodes, widths=widths, directed=directed
         )
-        net.from_nx(self.network)
-        net.repulsion(node_distance=150, spring_length=200)
-
-        file_path = os.path.join(self._package_path, "tmp.html")
-
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        except:
-            pass
-
-        net.show(file_path)
-
-        js_code = """
-        <script type="text/javascript" src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
-
-        <script type="text/javascript">
-        
-            let selectedNodes = [];
-            let previousStyles = {}; 
-            let undoStack = [];
-    
-            function saveNetworkState() {
-                const nodes = network.body.data.nodes.get();
-                const edges = network.body.data.edges.get();
-                const styles = {};
-            
-                nodes.forEach(node => {
-                    styles[node.id] = {
-                        color: previousStyles[node.id]?.color || node.color || null
-                    };
-                });
-            
-                undoStack.push(JSON.stringify({ nodes, edges, styles }));
-            }
-            
-            
-            function removeSelectedNodes() {
-                if (selectedNodes.length > 0) {
-                    saveNetworkState();
-            
-                    network.body.data.nodes.remove(selectedNodes.map(id => ({ id })));
-                    selectedNodes = [];
-                } else {
-                    alert("No nodes selected.");
-                }
-            }
-            
-            function undo() {
-                if (undoStack.length > 0) {
-                    const previousState = JSON.parse(undoStack.pop());
-            
-                    network.body.data.nodes.clear();
-                    network.body.data.edges.clear();
-                    network.body.data.nodes.add(previousState.nodes);
-                    network.body.data.edges.add(previousState.edges);
-            
-                    Object.keys(previousState.styles).forEach(nodeId => {
-                        network.body.data.nodes.update({
-                            id: nodeId,
-                            ...previousState.styles[nodeId]
-                        });
-                    });
-            
-                    selectedNodes = [];
-                    previousStyles = previousState.styles;
-                } else {
-                    alert("Nothing to undo.");
-                }
-            }
-            
-            network.on("selectNode", function (params) {
-                if (event.ctrlKey) {
-                    selectedNodes = [...new Set([...selectedNodes, ...params.nodes])];
-                } else {
-                    selectedNodes.forEach(nodeId => {
-                        if (previousStyles[nodeId]) {
-                            network.body.data.nodes.update({
-                                id: nodeId,
-                                ...previousStyles[nodeId]
-                            });
-                        }
-                    });
-                    selectedNodes = params.nodes;
-                }
-            
-                params.nodes.forEach(nodeId => {
-                    const nodeData = network.body.data.nodes.get(nodeId);
-                    if (!previousStyles[nodeId]) {
-                        previousStyles[nodeId] = {
-                            color: nodeData.color || null
-                        };
-                    }
-                    network.body.data.nodes.update({
-                        id: nodeId,
-                        color: "black"
-                    });
-                });
-            });
-            
-            network.on("deselectNode", function (params) {
-                if (!event.ctrlKey) {
-                    selectedNodes.forEach(nodeId => {
-                        if (previousStyles[nodeId]) {
-                            network.body.data.nodes.update({
-                                id: nodeId,
-                                ...previousStyles[nodeId]
-                            });
-                        }
-                    });
-                    selectedNodes = [];
-                } else {
-                    params.nodes.forEach(nodeId => {
-                        if (previousStyles[nodeId]) {
-                            network.body.data.nodes.update({
-                                id: nodeId,
-                                ...previousStyles[nodeId]
-                            });
-                        }
-                    });
-                }
-            });
-                    
-                    
-            
-            
-            
-            function changePhysics(value) {
-                network.setOptions({
-                    physics: {
-                        solver: 'repulsion',
-                        repulsion: {
-                            nodeDistance: parseInt(value),
-                        },
-                    },
-                });
-            }
-            
-            
-            
-            
-            
-                            
-            let originalNodeSizes = {};
-            
-            function initializeOriginalNodeSizes() {
-                network.body.data.nodes.get().forEach(node => {
-                    if (!originalNodeSizes[node.id]) {
-                        originalNodeSizes[node.id] = node.size || 1; 
-                    }
-                });
-            }
-            
-            function scaleNetworkSize(scaleFactor) {
-                initializeOriginalNodeSizes(); 
-            
-                network.body.data.nodes.update(
-                    network.body.data.nodes.get().map(node => ({
-                        id: node.id,
-                        size: originalNodeSizes[node.id] * scaleFactor 
-                    }))
-                );
-            }
-                            
-                        
-            
-            function changeFontSize(size) {
-                network.body.data.nodes.update(
-                    network.body.data.nodes.get().map(node => ({
-                        id: node.id,
-                        font: { size: size }
-                    }))
-                );
-            }
-            
-            
-            let physicsEnabled = true;
-            
-            function togglePhysics() {
-                physicsEnabled = !physicsEnabled;
-            
-                network.setOptions({
-                    physics: physicsEnabled
-                });
-            
-
-                document.getElementById("togglePhysicsButton").innerText = physicsEnabled
-                    ? "Disable Physics"
-                    : "Enable Physics";
-            }
 
+        return editor
 
+    @classmethod
+    def from_edgelist(
+        cls, path, delimiter=None, comments="#", directed=False, server=None, cache=True
+    ):
+        """
+        Create an editor for a graph stored as an edge list.
 
-            function downloadFile(blob, filename) {
-                const link = document.createElement('a');
-                link.href = URL.createObjectURL(blob);
-                link.download = filename;
-                link.click();
-    
-                URL.revokeObjectURL(link.href);
-            }
+        ``.npy`` files of shape ``(m, 2)``, or ``(m, 3)`` with edge weights,
+        are memory-mapped; text files with one ``source target [weight]``
+        edge per line are parsed by NumPy, see
+        :func:`JVG.payload.read_edgelist`. Weights are used as edge widths.
 
+        Parameters
+        ----------
+        path : str or os.PathLike
+            Edge list file.
 
-            function saveGraph(format, resolution = 96) {
-                
-                if (format === "svg") {
-
-                    const positions = network.getPositions();
-
-                    const nodes = network.body.data.nodes.get();
-                    const edges = network.body.data.edges.get();
-                
-                    let minX = Infinity, maxX = -Infinity, minY = Infinity, maxY = -Infinity;
-                    Object.values(positions).forEach(pos => {
-                        minX = Math.min(minX, pos.x);
-                        maxX = Math.max(maxX, pos.x);
-                        minY = Math.min(minY, pos.y);
-                        maxY = Math.max(maxY, pos.y);
-                    });
-                
-                    const margin = 600; 
-                    const width = maxX - minX + margin * 2.5; 
-                    const height = maxY - minY + margin * 1.5; 
-                
-                    const offsetX = margin - minX; 
-                    const offsetY = margin - minY; 
-                
-                    let svgContent = `<svg xmlns="http://www.w3.org/2000/svg" width="${width}" height="${height}">`;
-                
-                    edges.forEach((edge) => {
-                        const from = positions[edge.from];
-                        const to = positions[edge.to];
-                        if (from && to) {
-                            const controlX = (from.x + to.x) / 2; 
-                            const controlY = (from.y + to.y) / 2 - 50; 
-                    
-                            const pathData = `M${from.x + offsetX},${from.y + offsetY} C${controlX + offsetX},${controlY + offsetY} ${controlX + offsetX},${controlY + offsetY} ${to.x + offsetX},${to.y + offsetY}`;
-                            const color = edge.color || "black"; 
-                            const width = edge.width || 2; 
-                            svgContent += `<path d="${pathData}" stroke="${color}" stroke-width="${width}" fill="none"/>`;
-                        }
-                    });
-                
-
-                    nodes.forEach((node) => {
-                        const pos = positions[node.id];
-                        if (pos) {
-                            const size = (node.size || 10); 
-                            const color = node.color || "blue"; 
-                            svgContent += `<circle cx="${pos.x + offsetX}" cy="${pos.y + offsetY}" r="${size}" fill="${color}" />`;
-                
-                            const labelColor = node.font?.color || "black"; 
-                            const labelFontSize = node.font?.size || 12; 
-                            svgContent += `<text x="${pos.x + offsetX + size + 5}" y="${pos.y + offsetY}" font-size="${labelFontSize}" fill="${labelColor}">${node.label || node.id}</text>`;
-                        }
-                    });
-                
-                    svgContent += `</svg>`;
-                
-                    const blob = new Blob([svgContent], { type: "image/svg+xml;charset=utf-8" });
-                    const link = document.createElement("a");
-                    link.href = URL.createObjectURL(blob);
-                    link.download = "graph.svg";
-                    link.click();
-                                            
-                    
-                } else {
-                    
-                    const positions = network.getPositions();
-
-                    const nodes = network.body.data.nodes.get();
-                    const edges = network.body.data.edges.get();
-                
-                    let minX = Infinity, maxX = -Infinity, minY = Infinity, maxY = -Infinity;
-                    Object.values(positions).forEach(pos => {
-                        minX = Math.min(minX, pos.x);
-                        maxX = Math.max(maxX, pos.x);
-                        minY = Math.min(minY, pos.y);
-                        maxY = Math.max(maxY, pos.y);
-                    });
-                
-                    const margin = 600;  
-                    const width = maxX - minX + margin * 2.5; 
-                    const height = maxY - minY + margin * 1.5; 
-                
-                    const offsetX = margin - minX; 
-                    const offsetY = margin - minY; 
-                
-                    let svgContent = `<svg xmlns="http://www.w3.org/2000/svg" width="${width}" height="${height}">`;
-                
-                    edges.forEach((edge) => {
-                        const from = positions[edge.from];
-                        const to = positions[edge.to];
-                        if (from && to) {
-                            const controlX = (from.x + to.x) / 2; 
-                            const controlY = (from.y + to.y) / 2 - 50; 
-                    
-                            const pathData = `M${from.x + offsetX},${from.y + offsetY} C${controlX + offsetX},${controlY + offsetY} ${controlX + offsetX},${controlY + offsetY} ${to.x + offsetX},${to.y + offsetY}`;
-                            const color = edge.color || "black"; 
-                            const width = edge.width || 2; 
-                            svgContent += `<path d="${pathData}" stroke="${color}" stroke-width="${width}" fill="none"/>`;
-                        }
-                    });
-                
-                    nodes.forEach((node) => {
-                        const pos = positions[node.id];
-                        if (pos) {
-                            const size = (node.size || 10); 
-                            const color = node.color || "blue"; 
-                            svgContent += `<circle cx="${pos.x + offsetX}" cy="${pos.y + offsetY}" r="${size}" fill="${color}" />`;
-                
-                            const labelColor = node.font?.color || "black"; 
-                            const labelFontSize = node.font?.size || 12; 
-                            svgContent += `<text x="${pos.x + offsetX + size + 5}" y="${pos.y + offsetY}" font-size="${labelFontSize}" fill="${labelColor}">${node.label || node.id}</text>`;
-                        }
-                    });
-                
-                    svgContent += `</svg>`;
-                    
-                    const svgBlob = new Blob([svgContent], { type: 'image/svg+xml' });
-                    const svgUrl = URL.createObjectURL(svgBlob);
-                    
-                    const getScaleFactor = (resolution = 300) => {
-                        const defaultDPI = 96;
-                        return resolution / defaultDPI;
-                    };
-                    
-                    const scaleFactor = getScaleFactor(resolution || 300);
-                    
-                    const canvas = document.createElement('canvas');
-                    const context = canvas.getContext('2d');
-                    const img = new Image();
-                    
-                    img.onload = () => {
-                        try {
-                            canvas.width = width * scaleFactor;
-                            canvas.height = height * scaleFactor;
-                    
-                            context.setTransform(scaleFactor, 0, 0, scaleFactor, 0, 0);
-                    
-                            if (format === 'jpeg' || format === 'jpg') {
-                                context.fillStyle = 'white';
-                                context.fillRect(0, 0, canvas.width, canvas.height);
-                            }
-                    
-                            context.drawImage(img, 0, 0, width, height);
-                    
-                            canvas.toBlob((blob) => {
-                                if (blob) {
-                                    downloadFile(blob, `image.${format}`);
-                                } else {
-                                    console.error('Błąd: Blob jest pusty!');
-                                }
-                            }, `image/${format}`);
-                        } catch (error) {
-                            console.error('Błąd podczas rysowania na canvasie:', error);
-                        }
-                    };
-                    
-                    img.onerror = (error) => {
-                        console.error('Nie udało się załadować obrazu SVG jako źródła:', error);
-                    };
-                    
-                    img.src = svgUrl;
-                    
-
-                        
-                        
-                }
-            }
-                        
-                        
-                        
-    
-    
-            document.body.insertAdjacentHTML('beforeend', `
-                <div style="position: fixed; top: 0; left: 0; width: 100%; background: #353834; padding: 10px; z-index: 1000; display: flex; gap: 10px; align-items: center; border-bottom: 1px solid #ddd;">
-                    <button onclick="removeSelectedNodes()">
-                        <i class="fa-solid fa-eraser"></i>
-                    </button>
-                    
-                    
-
-                    
-                    
-                    <button onclick="undo()">
-                        <i class="fa-solid fa-arrow-left"></i>
-                    </button>
-                    
-
-                    <label for="formatSelect" style="color: white;">Save As:</label>
-                    <select id="formatSelect">
-                        <option value="png">PNG</option>
-                        <option value="jpg">JPEG</option>
-                        <option value="svg">SVG</option>
-
-                    </select>
-                    
-                    <label for="resolutionSelect" style="color: white;">Resolution (DPI):</label>
-                    <select id="resolutionSelect">
-                        <option value="200">300 DPI</option>
-                        <option value="300">300 DPI</option>
-                        <option value="600">600 DPI</option>
-
-                    </select>
-                    
-                    <button onclick="saveGraph(
-                        document.getElementById('formatSelect').value,
-                        parseInt(document.getElementById('resolutionSelect').value)
-                    )">
-                        Export Graph
-                    </button>
-                    
-
-        
-                    <label style="color: white;">Font Size:</label>
-                    <input type="range" min="10" max="50" value="14" onchange="changeFontSize(this.value)">
-                    <label style="color: white;">Node Size:</label>
-                    <input type="range" min="0.1" max="10" value="0.1" onchange="scaleNetworkSize(this.value)">
-                    
-                    <button id="togglePhysicsButton" onclick="togglePhysics()">Disable Physics</button>
-
-                    <label style="color: white;">Physics:</label>
-                    <input type="range" min="50" max="500" value="200" step="10" onchange="changePhysics(this.value)">
-               
-                </div>
-            `);
-        </script>
-        """
-
-        with open(file_path, "r", encoding="utf-8") as file:
-            html_content = file.read()
-
-        font_awesome_link = '<link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">'
-        html_content = re.sub(
-            r"(<head>)", r"\1\n" + font_awesome_link, html_content, flags=re.IGNORECASE
+        delimiter : str, optional
+            Column separator of text files. Defaults to any whitespace.
+
+        comments : str
+            Prefix of comment lines in text files.
+
+        directed : bool
+            Whether edges are drawn with arrows.
+
+        server, cache
+            See :class:`NxEditor`.
+
+        Returns
+        -------
+        NxEditor
+            Editor whose ``network`` is ``None``.
+        """
+
+        from .payload import read_edgelist
+
+        sources, targets, weights = read_edgelist(path, delimiter, comments)
+
+        return cls.from_arrays(
+            sources,
+            targets,
+            widths=weights,
+            directed=directed,
+            server=server,
+            cache=cache,
         )
 
-        modified_html = re.sub(
-            r"(</body>)", js_code + "</body>", html_content, flags=re.IGNORECASE
+    def _content_key(self):
+        from .payload import graph_hash
+
+        if self._arrays is not None:
+            return self._arrays.digest()
+
+        return graph_hash(self.network)
+
+    def to_payload(self, layout=None) -> GraphPayload:
+        """
+        Convert the graph into the columnar payload loaded by the editor.
+
+        Parameters
+        ----------
+        layout : str, callable or dict, optional
+            Layout used to precompute node positions, see :meth:`edit`.
+            Without a layout the positions last stored by the editor page are
+            used, if any.
+
+        Returns
+        -------
+        GraphPayload
+        """
+
+        return self._payload(layout, self._content_key())
+
+    def _payload(self, layout, key):
+        from .payload import GraphPayload
+
+        payload = self._arrays
+        if payload is None and self.cache is not None:
+            data = self.cache.get(f"{key}.bin")
+            if data is not None:
+                payload = GraphPayload.from_bytes(data)
+                payload.nodes = list(self.network.nodes)
+
+        if payload is None:
+            payload = GraphPayload.from_networkx(self.network)
+            if self.cache is not None:
+                self.cache.put(f"{key}.bin", payload.to_bytes())
+
+        payload.positions = self._positions(layout, payload, key)
+
+        return payload
+
+    def _positions(self, layout, payload, key):
+        import numpy as np
+
+        from .layout import compute_layout
+
+        if layout is not None:
+            return compute_layout(
+                layout, self.network, payload, key=key, store=self.cache
+            )
+        if self.cache is None:
+            return None
+
+        data = self.cache.get(f"{key}.last.pos")
+        if data is None or len(data) != 8 * payload.number_of_nodes:
+            return None
+
+        return np.frombuffer(data, dtype="<f4").reshape(-1, 2)
+
+    def _store_positions(self, key, payload, body):
+        import numpy as np
+
+        n = payload.number_of_nodes
+        positions = np.frombuffer(body, dtype="<f4")
+        if len(positions) != 2 * n:
+            raise ValueError(f"Expected positions of {n} nodes.")
+
+        # Nodes deleted in the browser have no position; they keep the last
+        # stored one, or the one the page was opened with.
+        positions = positions.reshape(-1, 2)
+        missing = ~np.isfinite(positions).all(axis=1)
+        if missing.any():
+            previous = self._positions(None, payload, key)
+            if previous is None:
+                previous = payload.positions
+            if previous is None:
+                return
+
+            positions = positions.copy()
+            positions[missing] = previous[missing]
+
+        self.cache.put(f"{key}.last.pos", positions.astype("<f4").tobytes())
+
+    def render_html(
+        self,
+        width=None,
+        height=None,
+        physics=True,
+        positions_url=None,
+        expand_url=None,
+        query_url=None,
+        query=None,
+        events_url=None,
+    ):
+        """
+        Render the editor page.
+
+        Parameters
+        ----------
+        width, height : int or str, optional
+            Canvas size, see :meth:`edit`.
+
+        physics : bool
+            Whether the physics simulation runs when the page opens.
+
+        positions_url : str, optional
+            URL the page posts the node positions to after the layout has
+            stabilized or nodes were dragged.
+
+        expand_url : str, optional
+            URL the page posts the index of a double-clicked super-node to,
+            to fetch its members, see :meth:`JVG.lod.GraphAggregation.expand`.
+
+        query_url : str, optional
+            URL the page posts ego-network queries to, see
+            :meth:`JVG.neighborhood.NeighborhoodIndex.query`.
+
+        query : dict, optional
+            Query the page sends to ``query_url`` when it opens.
+
+        events_url : str, optional
+            URL of the Server-Sent Events stream of the changes pushed by
+            :class:`JVG.live.GraphSession`.
+
+        Returns
+        -------
+        bytes
+            The HTML document.
+        """
+
+        import jinja2
+
+        options = {
+            "edges": {
+                "color": {"inherit": True},
+                "smooth": (
+                    {"enabled": True, "type": "dynamic"}
+                    if physics
+                    else {"enabled": True, "type": "continuous"}
+                ),
+            },
+            "interaction": {"dragNodes": True},
+            "physics": dict(self.physics, enabled=physics),
+        }
+
+        environment = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(self._package_path)
         )
+        template = environment.get_template("nxedit.html")
+
+        return template.render(
+            width=_css_length(width, "99vw"),
+            height=_css_length(height, "80vh"),
+            options=json.dumps(options),
+            physics=physics,
+            payload_url="graph.bin",
+            positions_url=positions_url,
+            expand_url=expand_url,
+            query_url=query_url,
+            query=query,
+            events_url=events_url,
+            undo_limit=self.undo_limit,
+        ).encode("utf-8")
+
+    def close(self):
+        """
+        Remove the editor session and release the data it serves.
+
+        Returns
+        -------
+        None
+        """
+        if self.server is not None and self.session_id is not None:
+            self.server.unregister(self.session_id)
+            self.session_id = None
+
+    def apply_edits(self, log: EditLog) -> nx.Graph | NxEditor:
+        """
+        Apply a recorded edit log to a copy of the graph.
+
+        Parameters
+        ----------
+        log : EditLog
+            Edits sent by the editor page, see :meth:`edit`.
+
+        Returns
+        -------
+        networkx.Graph or NxEditor
+            The edited copy of the graph, or for an editor created from
+            arrays, an editor of the edited graph.
+        """
+
+        if self._arrays is None:
+            return log.apply_graph(self.network)
+
+        index = {node: i for i, node in enumerate(self._arrays.nodes)}
+        removed = [
+            index[node]
+            for operation in log
+            if operation["op"] == "remove_nodes"
+            for node in operation["nodes"]
+            if node in index
+        ]
+
+        editor = type(self)(None, server=self.server, cache=self.cache or False)
+        editor._arrays = self._arrays.remove_nodes(removed)
+
+        return editor
+
+    def _neighborhood_index(self, key, payload):
+        from .neighborhood import NeighborhoodIndex
+
+        if self._neighborhoods is None or self._neighborhoods[0] != key:
+            self._neighborhoods = (key, NeighborhoodIndex(payload, self.network))
+
+        # Payloads of the same content differ at most in their positions.
+        index = self._neighborhoods[1]
+        index.payload = payload
+
+        return index
+
+    def edit(
+        self,
+        width=None,
+        height=None,
+        layout=None,
+        clusters=None,
+        seeds=None,
+        hops=1,
+        max_degree=None,
+        where=None,
+    ):
+        """
+        Generate and open an interactive graph editor.
 
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(modified_html)
+        The editor page and the graph payload are kept in memory and served
+        by the editor server under a new session. The page downloads the
+        payload as typed arrays and fills the vis-network data sets from it.
+
+        Parameters
+        ----------
+        width : int or str, optional
+            Width of the graph canvas. Integers are interpreted as pixels,
+            strings as CSS lengths. Defaults to ``"99vw"``.
+
+        height : int or str, optional
+            Height of the graph canvas. Integers are interpreted as pixels,
+            strings as CSS lengths. Defaults to ``"80vh"``.
+
+        layout : str, callable or dict, optional
+            Precompute node positions in Python instead of running the
+            physics simulation in the browser. ``"force"`` runs the built-in
+            vectorized force layout, a callable such as
+            :func:`networkx.kamada_kawai_layout` is called with the graph, and
+            a mapping of nodes to coordinates is used as is. Callables need a
+            graph, so editors created from arrays accept only ``"force"`` and
+            mappings. Positions are cached per graph content. Without a
+            layout, the positions the page stored when the graph was last
+            edited are reused. The page opens with physics disabled whenever
+            positions are known; it can be enabled again with the physics
+            toggle.
+
+        clusters : str, array_like or dict, optional
+            Open the graph aggregated into clusters instead of showing every
+            node. ``"louvain"`` uses the Louvain communities of the graph,
+            ``"grid"`` the cells of a grid over the node positions (computed
+            with the ``"force"`` layout when no layout is given), and a
+            cluster label per node or a mapping of nodes to labels is used
+            as is, see :func:`JVG.lod.cluster_labels`. The page loads one
+            super-node per cluster, connected by super-edges weighted by
+            the edges between the clusters, and fetches the members of a
+            super-node from the server when it is double-clicked. Node
+            positions are not stored in this mode.
+
+        seeds : iterable, optional
+            Open only the ego-network of these nodes instead of the whole
+            graph. Double-clicking a node fetches its ego-network from the
+            server, which answers from an adjacency index built once per
+            graph, see :class:`JVG.neighborhood.NeighborhoodIndex`. The
+            ``hops``, ``max_degree`` and ``where`` of these queries can be
+            changed on the page. Node positions are not stored in this mode,
+            and it cannot be combined with ``clusters``.
+
+        hops : int
+            Distance of the nodes of an ego-network from its center.
+
+        max_degree : int, optional
+            Nodes with more edges are shown but not expanded by ego-network
+            queries.
+
+        where : dict, optional
+            Node attribute values, or lists of values, the nodes of an
+            ego-network must have. Values are compared as strings.
+
+        Returns
+        -------
+        GraphSession or EditSession
+            Handle receiving the edits sent back by the page. Its
+            :meth:`~JVG.edits.EditSession.wait` method, or ``await``, returns
+            the result of :meth:`apply_edits`, a copy of the graph with the
+            removed nodes deleted, or for an editor created from arrays, an
+            editor of that graph. Unless ``clusters`` is given, the handle
+            is a :class:`~JVG.live.GraphSession` that also adds, removes and
+            updates nodes and edges on the open page.
+
+        Raises
+        ------
+        ValueError
+            If ``clusters`` and ``seeds`` are combined or a seed is not a
+            node of the graph.
+
+        Notes
+        -----
+        The default canvas size is relative to the browser viewport, so no GUI
+        toolkit is needed and the editor can be generated on headless machines.
+        """
+        from .edits import EditSession
+        from .payload import GraphPayload
+        from .server import MemoryResource, get_server
+
+        if clusters is not None and seeds is not None:
+            raise ValueError("Clusters and seeds cannot be combined.")
+
+        key = self._content_key()
+        if isinstance(clusters, str) and clusters == "grid" and layout is None:
+            layout = "force"
+        payload = self._payload(layout, key)
+        stream = None
+        if clusters is None:
+            from .live import GraphSession
+            from .server import EventStream
+
+            stream = EventStream()
+            session = GraphSession(self.apply_edits, stream, payload)
+        else:
+            session = EditSession(self.apply_edits)
+
+        physics = payload.positions is None
+        handlers = {}
+        query = None
+        if seeds is not None:
+            index = self._neighborhood_index(key, payload)
+            try:
+                seeds = [payload.nodes.index(seed) for seed in seeds]
+            except ValueError:
+                raise ValueError("Seeds must be nodes of the graph.") from None
+            where = {
+                str(name): [
+                    str(value)
+                    for value in (
+                        values if isinstance(values, (list, tuple, set)) else [values]
+                    )
+                ]
+                for name, values in (where or {}).items()
+            }
+            query = {
+                "seeds": seeds,
+                "hops": hops,
+                "max_degree": max_degree,
+                "where": where,
+            }
 
-        webbrowser.open(file_path)
+            # The page starts empty and loads the ego-networks it queries.
+            node_keys = functools.partial(_node_keys, session.nodes)
+            handlers["neighborhood"] = index.query_resource
+            payload = GraphPayload([], [], [], directed=payload.directed)
+        elif clusters is not None:
+            from .lod import GraphAggregation, cluster_labels
+
+            aggregation = GraphAggregation(
+                payload, cluster_labels(clusters, self.network, payload)
+            )
+            payload = aggregation.top_payload()
+            handlers["expand"] = aggregation.expand_resource
+            node_keys = aggregation.node_keys
+        else:
+            node_keys = functools.partial(_node_keys, session.nodes)
+            if self.cache is not None:
+                handlers["positions"] = functools.partial(
+                    self._store_positions, key, payload
+                )
+        handlers["edits"] = functools.partial(_receive_edits, session, node_keys)
+
+        resources = {
+            "editor.html": MemoryResource(
+                self.render_html(
+                    width,
+                    height,
+                    physics=physics,
+                    positions_url="positions" if "positions" in handlers else None,
+                    expand_url="expand" if "expand" in handlers else None,
+                    query_url="neighborhood" if query is not None else None,
+                    query=query,
+                    events_url=None if stream is None else "events",
+                ),
+                "text/html; charset=utf-8",
+            ),
+            "graph.bin": MemoryResource(
+                payload.to_bytes(),
+                "application/octet-stream",
+                compress=True,
+            ),
+        }
+        if stream is not None:
+            resources["events"] = stream
+
+        if self.server is None:
+            self.server = get_server()
+        else:
+            self.server.start()
+
+        self.close()
+        self.session_id = self.server.register(resources, handlers)
+
+        webbrowser.open(self.server.session_url(self.session_id, "editor.html"))
+
+        return session
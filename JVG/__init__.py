@@ -1,23 +1,45 @@
-pattern = r"""
-        _  ____   _         _____              _                     
-       | ||  _ \ (_)       / ____|            | |                   
-       | || |_) | _   ___ | (___   _   _  ___ | |_  ___  _ __ ___   
-   _   | ||  _ < | | / _ \ \___ \ | | | |/ __|| __|/ _ \| '_ ` _ \  
-  | |__| || |_) || || (_) |____) || |_| |\__ \| |_|  __/| | | | | | 
-   \____/ |____/ |_| \___/|_____/  \__, ||___/ \__|\___||_| |_| |_|  
-                                    __/ |                                   
-                                   |___/                                   
 """
+JVectorGraph - interactive browser editors for Matplotlib and NetworkX figures.
 
-print(pattern)
+Both editors are served from memory by one local HTTP server shared by the
+process; graphs are drawn in the browser with vis-network. The editors are
+imported lazily on first attribute access, so importing the package does not
+load Matplotlib, NetworkX or NumPy, nor start the server.
+"""
+
+__version__ = "1.0.2"
+
+__all__ = [
+    "MplEditor",
+    "NxEditor",
+    "EditLog",
+    "batch_export",
+    "EditorServer",
+    "get_server",
+]
+
+_lazy_attributes = {
+    "MplEditor": ".JVG",
+    "NxEditor": ".JVG",
+    "EditLog": ".edits",
+    "batch_export": ".batch",
+    "EditorServer": ".server",
+    "get_server": ".server",
+}
+
+
+def __getattr__(name):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-print("")
+    import importlib
 
-print("")
+    module = importlib.import_module(_lazy_attributes[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
 
-print("Welcome in JVectorGraph v.1.0.2 library")
-print("")
-print("Loading required packages...")
+    return value
 
 
-print("JVectorGraph is ready to use")
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,273 @@
+import concurrent.futures
+import multiprocessing
+import os
+import statistics
+import time
+
+from .edits import EditLog
+
+FORMATS = ("svg", "png", "pdf")
+
+
+class ExportResult:
+    """
+    Outcome of exporting one figure with :func:`batch_export`.
+
+    Attributes
+    ----------
+    name : str
+        File name of the figure without extension.
+
+    paths : list of str
+        Written files, one per format.
+
+    seconds : float
+        Time spent rendering, editing and writing the figure.
+
+    error : str or None
+        Error message when the export failed.
+    """
+
+    def __init__(self, name, paths=(), seconds=0.0, error=None):
+        self.name = name
+        self.paths = list(paths)
+        self.seconds = seconds
+        self.error = error
+
+    def __repr__(self):
+        state = f"error={self.error!r}" if self.error else f"paths={self.paths!r}"
+        return f"ExportResult({self.name!r}, {state}, seconds={self.seconds:.3f})"
+
+
+class BatchReport:
+    """
+    Timing report of :func:`batch_export`.
+
+    Attributes
+    ----------
+    results : list of ExportResult
+        Per-figure results in the order of the input figures.
+
+    seconds : float
+        Wall time of the whole batch.
+
+    workers : int
+        Number of worker processes, ``0`` when run in-process.
+    """
+
+    def __init__(self, results, seconds, workers):
+        self.results = results
+        self.seconds = seconds
+        self.workers = workers
+
+    @property
+    def failed(self):
+        """
+        Results of the figures that could not be exported.
+
+        Returns
+        -------
+        list of ExportResult
+        """
+
+        return [result for result in self.results if result.error]
+
+    @property
+    def throughput(self):
+        """
+        Exported figures per second of wall time.
+
+        Returns
+        -------
+        float
+        """
+
+        exported = len(self.results) - len(self.failed)
+        return exported / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        """
+        Describe the batch in a few lines.
+
+        Returns
+        -------
+        str
+        """
+
+        times = [result.seconds for result in self.results if not result.error]
+        lines = [
+            f"{len(self.results)} figures in {self.seconds:.2f} s "
+            f"with {self.workers or 'no'} workers, "
+            f"{self.throughput:.2f} figures/s"
+        ]
+        if times:
+            lines.append(
+                f"per figure: median {statistics.median(times) * 1000:.1f} ms, "
+                f"max {max(times) * 1000:.1f} ms"
+            )
+        for result in self.failed:
+            lines.append(f"failed {result.name}: {result.error}")
+
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
+
+
+def batch_export(
+    figures,
+    edit_log=None,
+    formats=("svg",),
+    dpi=300,
+    workers=None,
+    directory=".",
+    names=None,
+    **options,
+):
+    """
+    Export many figures headlessly, applying one edit log to each of them.
+
+    Every figure is rendered and normalized as by :class:`MplEditor`, the
+    edit log is replayed on the document and the result is written in each
+    of the requested formats. No server or browser is involved. Figures are
+    processed in parallel worker processes.
+
+    Parameters
+    ----------
+    figures : iterable
+        Matplotlib figures, or picklable callables without arguments
+        returning a figure. Callables avoid sending large figures to the
+        workers.
+
+    edit_log : EditLog or str or os.PathLike, optional
+        Edits to apply, or the path of a log saved with
+        :meth:`EditLog.save`.
+
+    formats : iterable of str
+        Output formats among ``"svg"``, ``"png"`` and ``"pdf"``. PNG and PDF
+        are converted from the edited SVG with the optional ``cairosvg``
+        package.
+
+    dpi : float
+        Resolution of PNG output.
+
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs; ``0``
+        exports in the calling process.
+
+    directory : str or os.PathLike
+        Output directory, created if needed.
+
+    names : iterable of str, optional
+        File names of the figures without extension. Defaults to
+        ``figure-00000``, ``figure-00001``, ...
+
+    **options
+        Keyword arguments of :class:`MplEditor`, e.g. ``precision`` or
+        ``compact``.
+
+    Returns
+    -------
+    BatchReport
+        Per-figure timing and the throughput of the batch. Failing figures
+        are reported instead of stopping the batch.
+
+    Raises
+    ------
+    ValueError
+        If a format is not supported.
+
+    ImportError
+        If PNG or PDF output is requested without ``cairosvg`` installed.
+    """
+
+    formats = tuple(formats)
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unsupported export formats: {sorted(unknown)}")
+    if set(formats) - {"svg"}:
+        try:
+            import cairosvg  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "PNG and PDF export requires cairosvg: pip install cairosvg"
+            ) from None
+
+    if edit_log is not None and not isinstance(edit_log, EditLog):
+        edit_log = EditLog.load(edit_log)
+
+    figures = list(figures)
+    width = max(5, len(str(len(figures))))
+    names = (
+        list(names)
+        if names is not None
+        else [f"figure-{i:0{width}d}" for i in range(len(figures))]
+    )
+    if len(names) != len(figures):
+        raise ValueError("Expected one name per figure.")
+
+    directory = os.fspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    jobs = [
+        (figure, name, edit_log, formats, dpi, directory, options)
+        for figure, name in zip(figures, names)
+    ]
+
+    start = time.perf_counter()
+    if workers == 0 or not jobs:
+        results = [_export(*job) for job in jobs]
+    else:
+        # Spawned workers do not inherit the threads of the editor server.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+        ) as executor:
+            results = list(executor.map(_export, *zip(*jobs)))
+
+    return BatchReport(results, time.perf_counter() - start, workers)
+
+
+def _initialize_worker():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _export(figure, name, edit_log, formats, dpi, directory, options):
+    from matplotlib.figure import Figure
+
+    from .JVG import MplEditor
+
+    start = time.perf_counter()
+    paths = []
+    try:
+        if not isinstance(figure, Figure):
+            figure = figure()
+
+        editor = MplEditor(figure, **options)
+        if edit_log is None:
+            document = editor.svg_document()
+        else:
+            document = editor.apply_edits(edit_log)
+
+        for extension in formats:
+            path = os.path.join(directory, f"{name}.{extension}")
+            if extension == "svg":
+                with open(path, "wb") as file:
+                    file.write(document)
+            else:
+                import cairosvg
+
+                convert = cairosvg.svg2png if extension == "png" else cairosvg.svg2pdf
+                convert(bytestring=document, write_to=path, dpi=dpi)
+            paths.append(path)
+    except Exception as error:
+        return ExportResult(
+            name, paths, time.perf_counter() - start, f"{type(error).__name__}: {error}"
+        )
+
+    return ExportResult(name, paths, time.perf_counter() - start)
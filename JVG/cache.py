@@ -0,0 +1,175 @@
+import contextlib
+import os
+import sys
+import tempfile
+import threading
+
+
+def cache_directory():
+    """
+    Return the user cache directory of JVectorGraph.
+
+    The ``JVG_CACHE_DIR`` environment variable takes precedence over the
+    platform default (``~/.cache``/``XDG_CACHE_HOME`` on Linux,
+    ``~/Library/Caches`` on macOS and ``LOCALAPPDATA`` on Windows).
+
+    Returns
+    -------
+    str
+    """
+
+    if os.environ.get("JVG_CACHE_DIR"):
+        return os.environ["JVG_CACHE_DIR"]
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return os.path.join(base, "JVectorGraph", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/JVectorGraph")
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "JVectorGraph")
+
+
+class GraphCache:
+    """
+    Size-bounded on-disk cache of editor data.
+
+    Entries are files named after their key. Reading an entry marks it as
+    recently used; when the total size exceeds ``max_bytes`` the least
+    recently used entries are removed.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory. Defaults to :func:`cache_directory`.
+
+    max_bytes : int
+        Upper bound of the total size of the cached entries.
+    """
+
+    def __init__(self, directory=None, max_bytes=512 * 2**20):
+        self.directory = directory or cache_directory()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """
+        Read an entry.
+
+        Parameters
+        ----------
+        key : str
+            Entry name.
+
+        Returns
+        -------
+        bytes or None
+            Content of the entry or ``None`` when it is not cached.
+        """
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except OSError:
+            return None
+
+        return data
+
+    def put(self, key, data):
+        """
+        Write an entry and evict old entries if the cache is too large.
+
+        Write errors are ignored, so a read-only or full cache directory
+        only disables caching.
+
+        Parameters
+        ----------
+        key : str
+            Entry name.
+
+        data : bytes
+            Content of the entry.
+
+        Returns
+        -------
+        None
+        """
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    file.write(data)
+                os.replace(temporary, self._path(key))
+            except BaseException:
+                # Do not leave the partial entry behind.
+                with contextlib.suppress(OSError):
+                    os.unlink(temporary)
+                raise
+        except OSError:
+            return
+
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits ``max_bytes``.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            try:
+                entries = [
+                    entry
+                    for entry in os.scandir(self.directory)
+                    if entry.is_file() and not entry.name.endswith(".tmp")
+                ]
+            except OSError:
+                return
+
+            stats = sorted(
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in entries
+            )
+            total = sum(size for _, size, _ in stats)
+
+            for _, size, path in stats:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+
+    def clear(self):
+        """
+        Remove all entries.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            try:
+                entries = list(os.scandir(self.directory))
+            except OSError:
+                return
+
+            for entry in entries:
+                if entry.is_file():
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
@@ -0,0 +1,495 @@
+import asyncio
+import json
+import math
+import re
+import threading
+import xml.etree.ElementTree as ET
+
+# Importing svgproc registers the SVG namespaces used to write documents.
+from . import svgproc  # noqa: F401
+
+_TRANSLATE = re.compile(r"translate\(([^)]+)\)")
+_SCALE = re.compile(r"^scale\(([^)]+)\)$")
+_LENGTH = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(.*)$")
+
+SVG_OPERATIONS = {"delete", "move", "recolor", "scale", "raise", "lower", "crop"}
+GRAPH_OPERATIONS = {"remove_nodes"}
+
+_NUMBER_FIELDS = {"move": ("dx", "dy"), "scale": ("factor",)}
+
+
+class EditLog:
+    """
+    Replayable list of edit operations recorded by the editor pages.
+
+    Every operation is a JSON object with an ``"op"`` name. Figure edits
+    address SVG elements by their ``id``:
+
+    - ``{"op": "delete", "ids": [...]}`` removes the elements,
+    - ``{"op": "move", "ids": [...], "dx": 5, "dy": 0}`` shifts them,
+    - ``{"op": "recolor", "ids": [...], "color": "#ff0000"}`` sets their
+      fill and stroke,
+    - ``{"op": "scale", "ids": [...], "factor": 1.1}`` scales them,
+    - ``{"op": "raise", "ids": [...]}`` and ``{"op": "lower", "ids": [...]}``
+      move them to the top or the bottom of their parent,
+    - ``{"op": "crop", "viewBox": [x, y, width, height]}`` crops the figure
+      to a rectangle in user units of the document.
+
+    Graph edits address nodes by their NetworkX keys:
+
+    - ``{"op": "remove_nodes", "nodes": [...]}`` removes the nodes with
+      their incident edges.
+
+    Saved logs write tuple node keys, e.g. of :func:`networkx.grid_2d_graph`,
+    as JSON arrays and read them back as tuples. Other keys must be JSON
+    values.
+
+    Parameters
+    ----------
+    operations : iterable of dict, optional
+        Recorded operations, oldest first.
+
+    Attributes
+    ----------
+    operations : list of dict
+        Recorded operations, oldest first.
+
+    Examples
+    --------
+    Apply the edits recorded on one figure to other figures headlessly:
+
+    >>> session = MplEditor(figures[0]).edit()
+    >>> session.wait()
+    >>> session.log.save("edits.json")
+    >>> log = EditLog.load("edits.json")
+    >>> svgs = [MplEditor(figure).apply_edits(log) for figure in figures[1:]]
+    """
+
+    def __init__(self, operations=None):
+        self.operations = list(operations or [])
+
+    def __len__(self):
+        return len(self.operations)
+
+    def __iter__(self):
+        return iter(self.operations)
+
+    def __eq__(self, other):
+        return isinstance(other, EditLog) and self.operations == other.operations
+
+    def __repr__(self):
+        return f"EditLog({self.operations!r})"
+
+    def append(self, operation):
+        """
+        Record an operation.
+
+        Parameters
+        ----------
+        operation : dict
+            Operation with an ``"op"`` name, see :class:`EditLog`.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If the operation is not known or its fields are missing or
+            invalid.
+        """
+
+        if not isinstance(operation, dict) or operation.get("op") not in (
+            SVG_OPERATIONS | GRAPH_OPERATIONS
+        ):
+            raise ValueError(f"Unknown edit operation: {operation!r}")
+
+        name = operation["op"]
+        if name == "crop":
+            view_box = operation.get("viewBox")
+            if not (
+                isinstance(view_box, list)
+                and len(view_box) == 4
+                and all(_is_number(value) for value in view_box)
+                and view_box[2] > 0
+                and view_box[3] > 0
+            ):
+                raise ValueError(f"Invalid crop rectangle: {operation!r}")
+        elif name == "remove_nodes":
+            if not isinstance(operation.get("nodes"), list):
+                raise ValueError(f"Invalid node list: {operation!r}")
+        else:
+            ids = operation.get("ids")
+            if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+                raise ValueError(f"Invalid element ids: {operation!r}")
+            for field in _NUMBER_FIELDS.get(name, ()):
+                if not _is_number(operation.get(field)):
+                    raise ValueError(f"Invalid {field!r}: {operation!r}")
+            if name == "recolor" and not isinstance(operation.get("color"), str):
+                raise ValueError(f"Invalid 'color': {operation!r}")
+
+        self.operations.append(operation)
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Parse a log sent by an editor page or written by :meth:`to_json`.
+
+        Parameters
+        ----------
+        data : str or bytes
+            JSON object with an ``"operations"`` list.
+
+        Returns
+        -------
+        EditLog
+
+        Raises
+        ------
+        ValueError
+            If the data is not a valid edit log.
+        """
+
+        try:
+            operations = json.loads(data)["operations"]
+        except (TypeError, KeyError, json.JSONDecodeError) as error:
+            raise ValueError(f"Invalid edit log: {error}") from None
+        if not isinstance(operations, list):
+            raise ValueError("Invalid edit log: operations must be a list")
+
+        log = cls()
+        for operation in operations:
+            if isinstance(operation, dict) and isinstance(operation.get("nodes"), list):
+                # Node keys are hashable, so arrays can only be tuples.
+                operation["nodes"] = [_node_key(node) for node in operation["nodes"]]
+            log.append(operation)
+
+        return log
+
+    def to_json(self):
+        """
+        Serialize the log.
+
+        Returns
+        -------
+        str
+
+        Raises
+        ------
+        ValueError
+            If a node key is not a JSON value or a tuple of them.
+        """
+
+        try:
+            return json.dumps({"operations": self.operations}, allow_nan=False)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"Cannot serialize edit log: {error}") from None
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a log saved with :meth:`save`.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+
+        Returns
+        -------
+        EditLog
+        """
+
+        with open(path, encoding="utf-8") as file:
+            return cls.from_json(file.read())
+
+    def save(self, path):
+        """
+        Write the log as JSON.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If the log cannot be serialized, see :meth:`to_json`.
+        """
+
+        data = self.to_json()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(data)
+
+    def apply_svg(self, data):
+        """
+        Replay the figure edits on an SVG document.
+
+        Elements are looked up by ``id``, so the log applies to any figure
+        normalized the same way, see :func:`JVG.svgproc.normalize_svg`.
+        Operations on ids missing from the document are skipped.
+
+        Parameters
+        ----------
+        data : bytes
+            SVG document.
+
+        Returns
+        -------
+        bytes
+            The edited SVG document.
+        """
+
+        root = ET.fromstring(data)
+        parents = {child: parent for parent in root.iter() for child in parent}
+        elements = {element.get("id"): element for element in root.iter()}
+
+        for operation in self.operations:
+            name = operation["op"]
+            if name == "crop":
+                _crop(root, operation["viewBox"])
+                continue
+            if name not in SVG_OPERATIONS:
+                continue
+
+            for element_id in operation["ids"]:
+                element = elements.get(element_id)
+                parent = parents.get(element)
+                if parent is None:
+                    continue
+
+                if name == "delete":
+                    parent.remove(element)
+                    del parents[element]
+                elif name in ("raise", "lower"):
+                    parent.remove(element)
+                    parent.insert(len(parent) if name == "raise" else 0, element)
+                elif name == "move":
+                    _move(element, operation["dx"], operation["dy"])
+                elif name == "scale":
+                    _scale(element, operation["factor"])
+                elif name == "recolor":
+                    _recolor(element, operation["color"])
+
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    def apply_graph(self, graph):
+        """
+        Replay the graph edits on a copy of a NetworkX graph.
+
+        Parameters
+        ----------
+        graph : networkx.Graph
+
+        Returns
+        -------
+        networkx.Graph
+            Edited copy; the input graph is left unchanged.
+        """
+
+        graph = graph.copy()
+        for operation in self.operations:
+            if operation["op"] == "remove_nodes":
+                graph.remove_nodes_from(operation["nodes"])
+
+        return graph
+
+
+def _node_key(value):
+    if isinstance(value, list):
+        return tuple(_node_key(item) for item in value)
+    return value
+
+
+def _is_number(value):
+    # JSON numbers only: booleans are ints in Python, NaN is accepted by json.
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    )
+
+
+# The transform edits match the ones made by vecedit.html, so a replayed
+# log produces the document the user saw in the browser.
+
+
+def _move(element, dx, dy):
+    transform = element.get("transform", "")
+    match = _TRANSLATE.search(transform)
+
+    x = y = 0.0
+    if match:
+        values = [float(value) for value in re.split(r"[\s,]+", match[1].strip())]
+        x, y = values[0], values[1] if len(values) > 1 else 0.0
+
+    translate = f"translate({_number(x + dx)}, {_number(y + dy)})"
+    if match:
+        transform = _TRANSLATE.sub(translate, transform, count=1)
+    else:
+        transform = f"{transform} {translate}".strip()
+
+    element.set("transform", transform)
+
+
+def _scale(element, factor):
+    parts = element.get("transform", "").strip().split()
+
+    found = False
+    for i, part in enumerate(parts):
+        match = _SCALE.match(part)
+        if match:
+            found = True
+            parts[i] = f"scale({_number(float(match[1]) * factor)})"
+    if not found:
+        parts.append(f"scale({_number(factor)})")
+
+    element.set("transform", " ".join(parts).strip())
+
+
+def _recolor(element, color):
+    element.set("fill", color)
+    element.set("stroke", color)
+
+    declarations = [
+        declaration
+        for declaration in element.get("style", "").split(";")
+        if declaration.strip()
+        and declaration.split(":")[0].strip() not in ("fill", "stroke")
+    ]
+    declarations += [f"fill: {color}", f"stroke: {color}"]
+    element.set("style", "; ".join(part.strip() for part in declarations) + ";")
+
+
+def _crop(root, view_box):
+    x, y, width, height = (float(value) for value in view_box)
+    lengths = {name: _LENGTH.match(root.get(name, "")) for name in ("width", "height")}
+
+    if root.get("viewBox"):
+        old = [
+            float(value) for value in re.split(r"[\s,]+", root.get("viewBox").strip())
+        ]
+        old = {"width": old[2], "height": old[3]}
+    else:
+        # Without a viewBox user units are the lengths of the document.
+        old = {name: float(match[1]) if match else 0 for name, match in lengths.items()}
+
+    for name, size in (("width", width), ("height", height)):
+        match = lengths[name]
+        if match and old[name]:
+            root.set(name, _number(float(match[1]) * size / old[name]) + match[2])
+
+    root.set("viewBox", " ".join(_number(value) for value in (x, y, width, height)))
+
+
+def _number(value):
+    return repr(float(value)).removesuffix(".0")
+
+
+class EditSession:
+    """
+    Handle of an editor opened with ``edit()``.
+
+    The editor page sends its edit log when the user presses the send
+    button. The handle waits for it either by blocking with :meth:`wait` or
+    with ``await``.
+
+    Parameters
+    ----------
+    apply : callable
+        Called with a received :class:`EditLog`; returns the edited figure
+        or graph.
+
+    Attributes
+    ----------
+    log : EditLog or None
+        Last log sent by the page.
+    """
+
+    def __init__(self, apply):
+        self.log = None
+
+        self._apply = apply
+
+        self._result = None
+        self._received = threading.Event()
+        self._lock = threading.Lock()
+
+    def receive(self, log):
+        """
+        Store a log sent by the page and apply it.
+
+        Parameters
+        ----------
+        log : EditLog
+
+        Returns
+        -------
+        None
+        """
+
+        result = self._apply(log)
+        with self._lock:
+            self.log = log
+            self._result = result
+        self._received.set()
+
+    def done(self):
+        """
+        Whether the page has sent its edits.
+
+        Returns
+        -------
+        bool
+        """
+
+        return self._received.is_set()
+
+    def result(self):
+        """
+        Return the edited figure or graph without waiting.
+
+        Returns
+        -------
+        bytes or networkx.Graph or NxEditor or None
+            The last received log applied to the edited figure or graph,
+            ``None`` before the page has sent its edits.
+        """
+
+        with self._lock:
+            return self._result
+
+    def wait(self, timeout=None):
+        """
+        Block until the page sends its edits.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds to wait; waits indefinitely by default.
+
+        Returns
+        -------
+        bytes or networkx.Graph or NxEditor
+            The edited SVG document of an :class:`MplEditor` or the edited
+            copy of the graph of an :class:`NxEditor`, see
+            :meth:`NxEditor.apply_edits`.
+
+        Raises
+        ------
+        TimeoutError
+            If no edits were received in time.
+        """
+
+        if not self._received.wait(timeout):
+            raise TimeoutError("The editor did not send its edits in time.")
+
+        return self.result()
+
+    def __await__(self):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None, self.wait).__await__()
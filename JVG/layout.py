@@ -0,0 +1,307 @@
+import collections
+import threading
+
+import numpy as np
+
+EDGE_LENGTH = 150
+
+_cache = collections.OrderedDict()
+_cache_lock = threading.Lock()
+_cache_size = 32
+
+
+def force_layout(
+    n, sources, targets, iterations=100, seed=0, exact_below=3000, cells=1024
+):
+    """
+    Vectorized force-directed (Fruchterman-Reingold) layout.
+
+    Node repulsion is computed exactly for graphs smaller than
+    ``exact_below`` nodes. For larger graphs the nodes are binned into a
+    square grid of about ``cells`` cells and every node is repelled by the
+    centroids of the cells, weighted by their node counts, which is a single
+    level Barnes-Hut approximation costing ``O(n * cells)`` per iteration.
+
+    Parameters
+    ----------
+    n : int
+        Number of nodes.
+
+    sources, targets : numpy.ndarray
+        Indices of the edge endpoints.
+
+    iterations : int
+        Number of iterations.
+
+    seed : int, optional
+        Seed of the random initial positions.
+
+    exact_below : int
+        Node count below which the exact repulsion is used.
+
+    cells : int
+        Approximate number of grid cells of the approximate repulsion.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape ``(n, 2)`` with the node positions.
+    """
+
+    rng = np.random.default_rng(seed)
+    positions = rng.random((n, 2)) * np.sqrt(max(n, 1))
+    if n < 2:
+        return positions
+
+    sources = np.asarray(sources, dtype=np.intp)
+    targets = np.asarray(targets, dtype=np.intp)
+    repulsion = _exact_repulsion if n < exact_below else _grid_repulsion
+
+    temperature = np.sqrt(n) / 10
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        displacement = repulsion(positions, cells)
+
+        delta = positions[sources] - positions[targets]
+        distance = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 1e-9)
+        attraction = delta * distance[:, None]
+        for axis in (0, 1):
+            displacement[:, axis] -= np.bincount(sources, attraction[:, axis], n)
+            displacement[:, axis] += np.bincount(targets, attraction[:, axis], n)
+
+        length = np.maximum(np.hypot(displacement[:, 0], displacement[:, 1]), 1e-9)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return positions
+
+
+def _exact_repulsion(positions, cells, chunk=2_000_000):
+    n = len(positions)
+    displacement = np.zeros_like(positions)
+    rows = max(1, chunk // n)
+
+    for start in range(0, n, rows):
+        block = positions[start : start + rows]
+        dx = block[:, 0, None] - positions[None, :, 0]
+        dy = block[:, 1, None] - positions[None, :, 1]
+        weights = 1 / np.maximum(dx * dx + dy * dy, 1e-9)
+        displacement[start : start + rows] = (
+            block * weights.sum(axis=1)[:, None] - weights @ positions
+        )
+
+    return displacement
+
+
+def _grid_repulsion(positions, cells, chunk=2_000_000):
+    side = max(1, int(np.sqrt(cells)))
+    low = positions.min(axis=0)
+    span = np.maximum(positions.max(axis=0) - low, 1e-9)
+    cell = np.minimum(((positions - low) / span * side).astype(np.intp), side - 1)
+    index = cell[:, 0] * side + cell[:, 1]
+
+    mass = np.bincount(index, minlength=side * side).astype(float)
+    sums = np.stack(
+        [
+            np.bincount(index, positions[:, axis], minlength=side * side)
+            for axis in (0, 1)
+        ],
+        axis=1,
+    )
+    occupied = mass > 0
+    mass, sums = mass[occupied], sums[occupied]
+    centroids = sums / mass[:, None]
+    own = np.cumsum(occupied) - 1
+
+    n = len(positions)
+    displacement = np.empty_like(positions)
+    rows = max(1, chunk // len(mass))
+
+    for start in range(0, n, rows):
+        block = positions[start : start + rows]
+        dx = block[:, 0, None] - centroids[None, :, 0]
+        dy = block[:, 1, None] - centroids[None, :, 1]
+        weights = mass / np.maximum(dx * dx + dy * dy, 1e-2)
+        displacement[start : start + rows] = (
+            block * weights.sum(axis=1)[:, None] - weights @ centroids
+        )
+
+    # The own cell acts through its centroid without the node itself.
+    own_cell = own[index]
+    own_mass = mass[own_cell]
+    delta = positions - centroids[own_cell]
+    displacement -= (
+        delta * (own_mass / np.maximum((delta**2).sum(axis=1), 1e-2))[:, None]
+    )
+
+    others = own_mass - 1
+    points = (sums[own_cell] - positions) / np.maximum(others, 1)[:, None]
+    delta = positions - points
+    displacement += delta * (others / np.maximum((delta**2).sum(axis=1), 1e-2))[:, None]
+
+    return displacement
+
+
+def scale_positions(positions, sources, targets, edge_length=EDGE_LENGTH):
+    """
+    Center positions and scale them to vis-network pixel coordinates.
+
+    Parameters
+    ----------
+    positions : numpy.ndarray
+        Array of shape ``(n, 2)``.
+
+    sources, targets : numpy.ndarray
+        Indices of the edge endpoints.
+
+    edge_length : float
+        Median edge length after scaling.
+
+    Returns
+    -------
+    numpy.ndarray
+        Scaled ``float32`` positions.
+    """
+
+    positions = np.asarray(positions, dtype=float)
+    if len(positions) == 0:
+        return positions.astype(np.float32)
+
+    positions = positions - positions.mean(axis=0)
+
+    if len(sources):
+        delta = positions[sources] - positions[targets]
+        reference = np.median(np.hypot(delta[:, 0], delta[:, 1]))
+    else:
+        reference = np.abs(positions).max() / max(np.sqrt(len(positions)), 1)
+
+    if reference > 0:
+        positions *= edge_length / reference
+
+    return positions.astype(np.float32)
+
+
+def compute_layout(layout, graph, payload, key=None, store=None):
+    """
+    Compute node positions for a payload.
+
+    Parameters
+    ----------
+    layout : str, callable or dict
+        ``"force"`` for :func:`force_layout`, a NetworkX-style layout
+        callable taking the graph and returning a mapping of nodes to
+        coordinates, or such a mapping.
+
+    graph : networkx.Graph or None
+        Graph passed to layout callables.
+
+    payload : GraphPayload
+        Payload whose nodes are positioned.
+
+    key : str, optional
+        Content hash of the graph. When given, results of ``"force"`` and of
+        named layout callables are cached in memory.
+
+    store : GraphCache, optional
+        On-disk cache consulted after the in-memory cache, so layouts
+        survive across processes.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``float32`` positions of shape ``(n, 2)`` in payload node order.
+
+    Raises
+    ------
+    ValueError
+        If ``layout`` is not supported, or is a callable and ``graph`` is
+        ``None``.
+    """
+
+    cache_key = _cache_key(layout, key)
+    if cache_key is not None:
+        with _cache_lock:
+            if cache_key in _cache:
+                _cache.move_to_end(cache_key)
+                return _cache[cache_key]
+
+        positions = _load(store, cache_key, payload.number_of_nodes)
+        if positions is not None:
+            _remember(cache_key, positions)
+            return positions
+
+    if isinstance(layout, str):
+        if layout != "force":
+            raise ValueError(f"Unknown layout {layout!r}.")
+        positions = force_layout(
+            payload.number_of_nodes, payload.sources, payload.targets
+        )
+    elif callable(layout) and graph is None:
+        raise ValueError("Layout callables need a NetworkX graph.")
+    else:
+        mapping = layout(graph) if callable(layout) else layout
+        positions = np.array([mapping[node] for node in payload.nodes], dtype=float)
+        positions = positions.reshape(payload.number_of_nodes, -1)[:, :2]
+
+    positions = scale_positions(positions, payload.sources, payload.targets)
+
+    if cache_key is not None:
+        _remember(cache_key, positions)
+        if store is not None:
+            store.put("%s.%s.pos" % cache_key, positions.astype("<f4").tobytes())
+
+    return positions
+
+
+def _remember(cache_key, positions):
+    with _cache_lock:
+        _cache[cache_key] = positions
+        while len(_cache) > _cache_size:
+            _cache.popitem(last=False)
+
+
+def _load(store, cache_key, n):
+    if store is None or cache_key is None:
+        return None
+
+    data = store.get("%s.%s.pos" % cache_key)
+    if data is None or len(data) != 8 * n:
+        return None
+
+    return np.frombuffer(data, dtype="<f4").reshape(n, 2)
+
+
+def layout_name(layout):
+    """
+    Stable name of a layout, used to cache its results.
+
+    Parameters
+    ----------
+    layout : str, callable or dict
+        Layout accepted by :func:`compute_layout`.
+
+    Returns
+    -------
+    str or None
+        The name, or ``None`` for mappings and anonymous callables whose
+        results cannot be cached.
+    """
+
+    if isinstance(layout, str):
+        return layout
+
+    name = getattr(layout, "__qualname__", "")
+    module = getattr(layout, "__module__", "")
+    if not callable(layout) or not name or "<" in name:
+        return None
+
+    return f"{module}.{name}"
+
+
+def _cache_key(layout, key):
+    name = layout_name(layout)
+    if key is None or name is None:
+        return None
+
+    return key, name
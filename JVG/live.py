@@ -0,0 +1,344 @@
+import collections
+import json
+import threading
+
+from .edits import EditSession
+from .payload import DEFAULT_NODE_COLOR, DEFAULT_NODE_SIZE
+
+
+class GraphSession(EditSession):
+    """
+    Handle of an :class:`NxEditor` page that also pushes graph changes.
+
+    Nodes and edges are added, removed and updated on the open page without
+    reloading it. Nodes are addressed by their keys, like in NetworkX; the
+    graph of the editor itself is not modified. Changes are collected and
+    sent to the page in one Server-Sent Event per batch, ``interval``
+    seconds after the first change of the batch or on :meth:`flush`, and
+    the page applies them once per animation frame. Pages opened later
+    replay the batches kept by the stream, see
+    :attr:`JVG.server.EventStream.max_events`.
+
+    Supported node attributes are ``label``, ``size``, ``color``, ``title``
+    and the coordinates ``x`` and ``y``; edges take a ``width`` (or
+    ``weight``), ``color`` and ``title``. Other attributes are ignored.
+
+    Removing a node also removes its edges. A removed node added again is
+    a new node of the page, with a new id and default attributes.
+
+    Parameters
+    ----------
+    apply : callable
+        Called with a received :class:`EditLog`, see :class:`EditSession`.
+
+    stream : EventStream
+        Stream the page listens to.
+
+    payload : GraphPayload
+        Payload the page was opened with.
+
+    interval : float
+        Seconds changes are collected before they are sent; ``0`` sends
+        every change at once.
+
+    Attributes
+    ----------
+    nodes : list
+        Node key of every page node id, including added and removed nodes.
+
+    Examples
+    --------
+    Animate the growth of a graph:
+
+    >>> session = NxEditor(nx.Graph()).edit()
+    >>> for u, v in simulation():
+    ...     session.add_edges([(u, v)])
+    """
+
+    def __init__(self, apply, stream, payload, interval=0.05):
+        super().__init__(apply)
+        self.stream = stream
+        self.interval = interval
+        self.nodes = list(payload.nodes)
+
+        self._payload = payload
+        self._ids = None
+        self._edge_ids = None
+        self._incident = None
+        self._edge_count = payload.number_of_edges
+
+        self._pending = []
+        self._timer = None
+        self._changes = threading.RLock()
+
+    def add_nodes(self, nodes):
+        """
+        Add nodes, or update them when they exist.
+
+        Parameters
+        ----------
+        nodes : iterable
+            Node keys or ``(node, attributes)`` pairs.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._changes:
+            items = []
+            ids = self._index()
+            for node in nodes:
+                node, attributes = _split(node, 1)
+                new = node not in ids
+                items.append(
+                    _node_item(self._node_id(node), node if new else None, attributes)
+                )
+            self._push("add_nodes", "nodes", items)
+
+    def remove_nodes(self, nodes):
+        """
+        Remove nodes with their edges. Unknown and removed nodes are
+        ignored.
+
+        Parameters
+        ----------
+        nodes : iterable
+            Node keys.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._changes:
+            ids = self._index()
+            edge_ids = self._edge_index()
+            removed = []
+            for node in nodes:
+                if node not in ids:
+                    continue
+                node_id = ids.pop(node)
+                removed.append(node_id)
+                # The page drops the edges itself; forget them here too.
+                for key in self._incident.pop(node_id, ()):
+                    del edge_ids[key]
+                    for other in set(key) - {node_id}:
+                        self._incident[other].discard(key)
+            self._push("remove_nodes", "ids", removed)
+
+    def add_edges(self, edges):
+        """
+        Add edges, adding their endpoints when needed, or update them when
+        they exist.
+
+        Parameters
+        ----------
+        edges : iterable
+            ``(u, v)`` pairs or ``(u, v, attributes)`` triples.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._changes:
+            edge_ids = self._edge_index()
+            items = []
+            updates = []
+            for edge in edges:
+                (u, v), attributes = _split(edge, 2)
+                for node in (u, v):
+                    if node not in self._index():
+                        self.add_nodes([node])
+
+                key = self._edge_key(self._ids[u], self._ids[v])
+                if key in edge_ids:
+                    update = _edge_item(edge_ids[key], attributes)
+                    if len(update) > 1:
+                        updates.append(update)
+                    continue
+
+                item = _edge_item(self._edge_count, attributes)
+                item["from"], item["to"] = self._ids[u], self._ids[v]
+                self._add_edge_key(key, self._edge_count)
+                self._edge_count += 1
+                items.append(item)
+            self._push("add_edges", "edges", items)
+            self._push("update_edges", "edges", updates)
+
+    def remove_edges(self, edges):
+        """
+        Remove edges. Unknown edges are ignored.
+
+        Parameters
+        ----------
+        edges : iterable
+            ``(u, v)`` pairs.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._changes:
+            edge_ids = self._edge_index()
+            removed = []
+            for u, v in edges:
+                key = self._edge_key(self._index().get(u), self._index().get(v))
+                if key in edge_ids:
+                    removed.append(edge_ids.pop(key))
+                    for node_id in set(key):
+                        self._incident[node_id].discard(key)
+            self._push("remove_edges", "ids", removed)
+
+    def update_attrs(self, nodes=None, edges=None):
+        """
+        Change attributes of nodes and edges.
+
+        Parameters
+        ----------
+        nodes : dict, optional
+            Attributes of nodes, keyed by node.
+
+        edges : dict, optional
+            Attributes of edges, keyed by ``(u, v)`` pairs.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KeyError
+            If a node or an edge does not exist or was removed.
+        """
+
+        with self._changes:
+            ids = self._index()
+            node_items = []
+            for node, attributes in (nodes or {}).items():
+                if node not in ids:
+                    raise KeyError(f"{node!r} is not a node of the editor.")
+                node_items.append(_node_item(ids[node], None, attributes))
+
+            edge_items = []
+            if edges:
+                edge_ids = self._edge_index()
+                for (u, v), attributes in edges.items():
+                    key = self._edge_key(ids.get(u), ids.get(v))
+                    if key not in edge_ids:
+                        raise KeyError(f"{(u, v)!r} is not an edge of the editor.")
+                    edge_items.append(_edge_item(edge_ids[key], attributes))
+
+            self._push("update_nodes", "nodes", node_items)
+            self._push("update_edges", "edges", edge_items)
+
+    def flush(self):
+        """
+        Send the collected changes now.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._changes:
+            operations, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if operations:
+                self.stream.publish(
+                    json.dumps({"ops": operations}, separators=(",", ":"))
+                )
+
+    def _push(self, name, field, items):
+        if not items:
+            return
+
+        with self._changes:
+            # Consecutive changes of one kind are merged into one operation.
+            if self._pending and self._pending[-1]["op"] == name:
+                self._pending[-1][field].extend(items)
+            else:
+                self._pending.append({"op": name, field: items})
+
+            if self.interval > 0 and self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if self.interval <= 0:
+            self.flush()
+
+    def _index(self):
+        if self._ids is None:
+            self._ids = {node: i for i, node in enumerate(self.nodes)}
+        return self._ids
+
+    def _node_id(self, node):
+        ids = self._index()
+        if node not in ids:
+            ids[node] = len(self.nodes)
+            self.nodes.append(node)
+        return ids[node]
+
+    def _edge_key(self, u, v):
+        if self._payload.directed or u is None or v is None:
+            return u, v
+        return min(u, v), max(u, v)
+
+    def _edge_index(self):
+        # Built on first use: pushing nodes only never pays for it.
+        if self._edge_ids is None:
+            payload = self._payload
+            self._edge_ids = {}
+            self._incident = collections.defaultdict(set)
+            for j, (u, v) in enumerate(
+                zip(payload.sources.tolist(), payload.targets.tolist())
+            ):
+                self._add_edge_key(self._edge_key(u, v), j)
+        return self._edge_ids
+
+    def _add_edge_key(self, key, edge_id):
+        self._edge_ids[key] = edge_id
+        for node_id in set(key):
+            self._incident[node_id].add(key)
+
+
+def _split(item, size):
+    # NetworkX style items: keys, or keys followed by an attribute dict.
+    if isinstance(item, tuple) and len(item) == size + 1 and isinstance(item[-1], dict):
+        return (item[0] if size == 1 else item[:size]), item[-1]
+    return item, {}
+
+
+def _node_item(node_id, node, attributes):
+    # New nodes get the defaults of GraphPayload, updates only what changed.
+    item = {"id": node_id}
+    if node is not None:
+        item.update(label=str(node), size=DEFAULT_NODE_SIZE, color=DEFAULT_NODE_COLOR)
+
+    for name in ("label", "color", "title"):
+        if name in attributes:
+            item[name] = str(attributes[name])
+    for name in ("size", "x", "y"):
+        if name in attributes:
+            item[name] = float(attributes[name])
+
+    return item
+
+
+def _edge_item(edge_id, attributes):
+    item = {"id": edge_id}
+
+    width = attributes.get("width", attributes.get("weight"))
+    if width is not None:
+        item["width"] = float(width)
+    for name in ("color", "title"):
+        if name in attributes:
+            item[name] = str(attributes[name])
+
+    return item
@@ -0,0 +1,327 @@
+import json
+
+import numpy as np
+
+from .payload import DEFAULT_NODE_SIZE, GraphPayload
+
+GRID_CELLS = 4096
+
+
+def cluster_labels(clusters, graph, payload, cells=GRID_CELLS):
+    """
+    Assign the nodes of a payload to clusters.
+
+    Parameters
+    ----------
+    clusters : str, array_like or dict
+        ``"louvain"`` for the Louvain communities of the graph, ``"grid"``
+        for the cells of a square grid of about ``cells`` cells over the
+        node positions, a cluster label per payload node, or a mapping of
+        nodes to cluster labels.
+
+    graph : networkx.Graph or None
+        Graph of the payload, needed for ``"louvain"``.
+
+    payload : GraphPayload
+        Payload whose nodes are clustered.
+
+    cells : int
+        Approximate number of grid cells of ``"grid"``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Cluster label of every payload node.
+
+    Raises
+    ------
+    ValueError
+        If the clusters cannot be computed.
+    """
+
+    n = payload.number_of_nodes
+
+    if isinstance(clusters, str):
+        if clusters == "grid":
+            if payload.positions is None:
+                raise ValueError("Grid clusters need node positions.")
+            side = max(1, int(np.sqrt(cells)))
+            positions = payload.positions.astype(float)
+            low = positions.min(axis=0)
+            span = np.maximum(positions.max(axis=0) - low, 1e-9)
+            cell = np.minimum(
+                ((positions - low) / span * side).astype(np.intp), side - 1
+            )
+            return cell[:, 0] * side + cell[:, 1]
+
+        if clusters == "louvain":
+            if graph is None:
+                raise ValueError("Louvain clusters need a NetworkX graph.")
+            import networkx as nx
+
+            index = {node: i for i, node in enumerate(payload.nodes)}
+            labels = np.empty(n, dtype=np.intp)
+            for label, community in enumerate(
+                nx.community.louvain_communities(graph, seed=0)
+            ):
+                labels[[index[node] for node in community]] = label
+            return labels
+
+        raise ValueError(f"Unknown clusters {clusters!r}.")
+
+    if isinstance(clusters, dict):
+        clusters = [clusters[node] for node in payload.nodes]
+
+    labels = np.asarray(clusters)
+    if labels.shape != (n,):
+        raise ValueError(f"Expected a cluster label for each of the {n} nodes.")
+
+    return labels
+
+
+class GraphAggregation:
+    """
+    Two-level view of a graph: clusters of nodes and their members.
+
+    The top level has one super-node per cluster and one super-edge per
+    pair of connected clusters, weighted by the summed weights of the edges
+    between them. Members and edges are indexed per cluster, so expanding a
+    cluster costs time proportional to its size only.
+
+    Parameters
+    ----------
+    payload : GraphPayload
+        Full graph.
+
+    labels : array_like
+        Cluster label of every node of ``payload``.
+
+    Attributes
+    ----------
+    payload : GraphPayload
+        Full graph.
+
+    names : numpy.ndarray
+        Sorted cluster labels; super-node ``c`` is the cluster ``names[c]``.
+
+    clusters : numpy.ndarray
+        Super-node index of every node.
+    """
+
+    def __init__(self, payload, labels):
+        self.payload = payload
+        self.names, clusters = np.unique(np.asarray(labels), return_inverse=True)
+        self.clusters = clusters.reshape(-1)
+
+        k = len(self.names)
+        self.counts = np.bincount(self.clusters, minlength=k)
+        self._members = np.argsort(self.clusters, kind="stable")
+        self._member_offsets = np.concatenate(([0], np.cumsum(self.counts)))
+
+        # Every edge is listed under the clusters of both of its endpoints.
+        m = payload.number_of_edges
+        source_clusters = self.clusters[payload.sources]
+        target_clusters = self.clusters[payload.targets]
+        between = source_clusters != target_clusters
+        edges = np.concatenate((np.arange(m), np.flatnonzero(between)))
+        keys = np.concatenate((source_clusters, target_clusters[between]))
+        order = np.argsort(keys, kind="stable")
+        self._edges = edges[order]
+        self._edge_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(keys, minlength=k)))
+        )
+
+    @property
+    def number_of_clusters(self):
+        return len(self.names)
+
+    def members(self, cluster):
+        """
+        Nodes of a cluster.
+
+        Parameters
+        ----------
+        cluster : int
+            Super-node index.
+
+        Returns
+        -------
+        numpy.ndarray
+            Payload indices of the members.
+        """
+
+        return self._members[
+            self._member_offsets[cluster] : self._member_offsets[cluster + 1]
+        ]
+
+    def top_payload(self):
+        """
+        Build the payload of the top level.
+
+        Super-node sizes grow with the logarithm of the member count and
+        super-edge widths with the logarithm of the summed edge weights.
+        Super-nodes are placed at the centroid of their members when the
+        full graph has positions.
+
+        Returns
+        -------
+        GraphPayload
+        """
+
+        payload = self.payload
+        k = self.number_of_clusters
+
+        sources = self.clusters[payload.sources]
+        targets = self.clusters[payload.targets]
+        between = sources != targets
+        sources, targets = sources[between], targets[between]
+        if not payload.directed:
+            sources, targets = np.minimum(sources, targets), np.maximum(
+                sources, targets
+            )
+
+        weights = None if payload.widths is None else payload.widths[between]
+        pairs, inverse = np.unique(
+            sources.astype(np.int64) * k + targets, return_inverse=True
+        )
+        weights = np.bincount(inverse.reshape(-1), weights, minlength=len(pairs))
+
+        first = self._members[self._member_offsets[:-1]]
+        positions = None
+        if payload.positions is not None:
+            positions = (
+                np.stack(
+                    [
+                        np.bincount(self.clusters, payload.positions[:, axis], k)
+                        for axis in (0, 1)
+                    ],
+                    axis=1,
+                )
+                / np.maximum(self.counts, 1)[:, None]
+            )
+
+        top = GraphPayload(
+            [f"{count} nodes" for count in self.counts.tolist()],
+            pairs // k,
+            pairs % k,
+            sizes=DEFAULT_NODE_SIZE * (1 + np.log10(np.maximum(self.counts, 1))),
+            colors=payload.palette[payload.colors[first]],
+            widths=1 + np.log2(np.maximum(weights, 1)),
+            titles=[
+                f"{name}: {count} nodes, double-click to expand"
+                for name, count in zip(self.names.tolist(), self.counts.tolist())
+            ],
+            directed=payload.directed,
+            positions=positions,
+        )
+        top.nodes = self.names.tolist()
+
+        return top
+
+    def expand(self, cluster):
+        """
+        Describe the members of a cluster for the editor page.
+
+        Parameters
+        ----------
+        cluster : int
+            Super-node index.
+
+        Returns
+        -------
+        dict
+            JSON-serializable members with their attributes and the edges
+            incident to them. Nodes are referred to by payload index; every
+            edge is followed by the clusters of its endpoints, so the page
+            can attach it to a super-node or to an expanded member.
+
+        Raises
+        ------
+        ValueError
+            If the cluster does not exist.
+        """
+
+        if not 0 <= cluster < self.number_of_clusters:
+            raise ValueError(f"Unknown cluster {cluster}.")
+
+        payload = self.payload
+        edges = self._edges[
+            self._edge_offsets[cluster] : self._edge_offsets[cluster + 1]
+        ]
+        sources, targets = payload.sources[edges], payload.targets[edges]
+
+        data = payload.describe(self.members(cluster), edges)
+        data["cluster"] = cluster
+        data["edges"] = (
+            np.column_stack(
+                (sources, targets, self.clusters[sources], self.clusters[targets])
+            )
+            .ravel()
+            .tolist()
+        )
+
+        return data
+
+    def expand_resource(self, body):
+        """
+        ``POST`` handler returning :meth:`expand` of the cluster in the body.
+
+        Parameters
+        ----------
+        body : bytes
+            Super-node index.
+
+        Returns
+        -------
+        MemoryResource
+
+        Raises
+        ------
+        ValueError
+            If the body is not the index of a cluster.
+        """
+
+        from .server import MemoryResource
+
+        data = json.dumps(self.expand(int(body)), separators=(",", ":"))
+
+        return MemoryResource(data.encode("utf-8"), "application/json")
+
+    def node_keys(self, indices):
+        """
+        Resolve node ids of the page to the nodes of the full graph.
+
+        Ids below the number of clusters are super-nodes and stand for all
+        their members; the others are expanded members, offset by the
+        number of clusters.
+
+        Parameters
+        ----------
+        indices : list of int
+            Node ids of the page.
+
+        Returns
+        -------
+        list
+            Node keys of the full graph.
+
+        Raises
+        ------
+        ValueError
+            If an id does not exist.
+        """
+
+        k = self.number_of_clusters
+        n = self.payload.number_of_nodes
+        nodes = self.payload.nodes
+
+        keys = []
+        for index in indices:
+            if not isinstance(index, int) or not 0 <= index < k + n:
+                raise ValueError("Invalid node index.")
+            if index < k:
+                keys.extend(nodes[i] for i in self.members(index))
+            else:
+                keys.append(nodes[index - k])
+
+        return keys
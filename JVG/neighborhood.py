@@ -0,0 +1,223 @@
+import json
+
+import numpy as np
+
+
+class NeighborhoodIndex:
+    """
+    Compressed sparse row adjacency of a graph for ego-network queries.
+
+    Every edge is listed in the rows of both of its endpoints, so queries
+    follow edges in both directions, also in directed graphs. The index is
+    built once with a single sort of the edges; a query then reads only the
+    rows of the nodes it reaches.
+
+    Parameters
+    ----------
+    payload : GraphPayload
+        Graph to index.
+
+    graph : networkx.Graph, optional
+        Graph of the payload, whose node attributes queries can filter on.
+        Without it, queries filter on the ``label``, ``size``, ``color`` and
+        ``title`` of the payload.
+
+    Attributes
+    ----------
+    payload : GraphPayload
+        Indexed graph.
+
+    degrees : numpy.ndarray
+        Number of edges incident to every node.
+    """
+
+    def __init__(self, payload, graph=None):
+        self.payload = payload
+        self.graph = graph
+
+        n, m = payload.number_of_nodes, payload.number_of_edges
+        ends = np.concatenate((payload.sources, payload.targets))
+        order = np.argsort(ends, kind="stable")
+
+        self._neighbors = np.concatenate((payload.targets, payload.sources))[order]
+        self._edges = order % max(m, 1)
+        self.degrees = np.bincount(ends, minlength=n)
+        self._offsets = np.concatenate(([0], np.cumsum(self.degrees)))
+
+    def _entries(self, rows):
+        # Positions of the adjacency entries of all rows, row after row.
+        starts = self._offsets[rows]
+        counts = self._offsets[rows + 1] - starts
+        shifts = starts - np.cumsum(counts) + counts
+        return np.repeat(shifts, counts) + np.arange(counts.sum())
+
+    def _matches(self, indices, where):
+        keep = np.ones(len(indices), dtype=bool)
+        for name, values in where.items():
+            values = {str(value) for value in _values(values)}
+            keep &= [
+                value is not None and str(value) in values
+                for value in (self._attribute(name, i) for i in indices)
+            ]
+
+        return keep
+
+    def _attribute(self, name, index):
+        payload = self.payload
+        if self.graph is not None:
+            return self.graph.nodes[payload.nodes[index]].get(name)
+        if name == "label":
+            return payload.labels[index]
+        if name == "size":
+            return payload.sizes[index]
+        if name == "color":
+            return payload.palette[payload.colors[index]]
+        if name == "title":
+            return None if payload.titles is None else payload.titles[index]
+
+        raise ValueError(f"Cannot filter on node attribute {name!r}.")
+
+    def ego(self, seeds, hops=1, max_degree=None, where=None):
+        """
+        Find the ego-network of some nodes.
+
+        Parameters
+        ----------
+        seeds : array_like of int
+            Positions of the center nodes.
+
+        hops : int
+            Maximum distance of the returned nodes from the seeds.
+
+        max_degree : int, optional
+            Nodes with more incident edges are returned but not expanded,
+            so hubs do not pull in large parts of the graph.
+
+        where : dict, optional
+            Node attribute values, or lists of values, reached nodes must
+            match to be returned and expanded. Values are compared as
+            strings. Seeds are always returned.
+
+        Returns
+        -------
+        nodes : numpy.ndarray
+            Positions of the nodes, seeds first, then by distance.
+
+        edges : numpy.ndarray
+            Positions of the edges incident to the nodes, in increasing
+            order. Edges of nodes with more than ``max_degree`` edges are
+            included only when both endpoints are returned.
+
+        Raises
+        ------
+        ValueError
+            If a seed does not exist or a filtered attribute is unknown.
+        """
+
+        n = self.payload.number_of_nodes
+        seeds = np.unique(np.asarray(seeds, dtype=np.intp))
+        if seeds.size and (seeds[0] < 0 or seeds[-1] >= n):
+            raise ValueError("Invalid node index.")
+
+        reached = np.zeros(n, dtype=bool)
+        reached[seeds] = True
+        layers = [seeds]
+
+        frontier = seeds
+        for _ in range(hops):
+            if max_degree is not None:
+                frontier = frontier[self.degrees[frontier] <= max_degree]
+            neighbors = np.unique(self._neighbors[self._entries(frontier)])
+            neighbors = neighbors[~reached[neighbors]]
+            if where:
+                neighbors = neighbors[self._matches(neighbors, where)]
+            if not neighbors.size:
+                break
+
+            reached[neighbors] = True
+            layers.append(neighbors)
+            frontier = neighbors
+
+        nodes = np.concatenate(layers)
+        if max_degree is None:
+            edges = self._edges[self._entries(nodes)]
+        else:
+            hubs = self.degrees[nodes] > max_degree
+            entries = self._entries(nodes[hubs])
+            edges = np.concatenate(
+                (
+                    self._edges[self._entries(nodes[~hubs])],
+                    self._edges[entries[reached[self._neighbors[entries]]]],
+                )
+            )
+
+        return nodes, np.unique(edges)
+
+    def query(self, body):
+        """
+        Answer an ego-network query of the editor page.
+
+        Parameters
+        ----------
+        body : bytes
+            JSON object with the ``"seeds"`` node positions and optionally
+            ``"hops"``, ``"max_degree"`` and ``"where"``, see :meth:`ego`.
+
+        Returns
+        -------
+        dict
+            :meth:`GraphPayload.describe` of the ego-network, with the
+            positions of the edges under ``"edge_ids"``.
+
+        Raises
+        ------
+        ValueError
+            If the query is not valid.
+        """
+
+        try:
+            query = json.loads(body)
+            seeds = [int(seed) for seed in query["seeds"]]
+            hops = int(query.get("hops", 1))
+            max_degree = query.get("max_degree")
+            max_degree = None if max_degree is None else int(max_degree)
+            where = dict(query.get("where") or {})
+        except (TypeError, KeyError, ValueError, AttributeError) as error:
+            raise ValueError(f"Invalid neighborhood query: {error}") from None
+
+        nodes, edges = self.ego(seeds, hops, max_degree, where)
+        data = self.payload.describe(nodes, edges)
+        data["edge_ids"] = edges.tolist()
+
+        return data
+
+    def query_resource(self, body):
+        """
+        ``POST`` handler returning the answer to a :meth:`query` as JSON.
+
+        Parameters
+        ----------
+        body : bytes
+            JSON query.
+
+        Returns
+        -------
+        MemoryResource
+
+        Raises
+        ------
+        ValueError
+            If the query is not valid.
+        """
+
+        from .server import MemoryResource
+
+        data = json.dumps(self.query(body), separators=(",", ":"))
+
+        return MemoryResource(data.encode("utf-8"), "application/json")
+
+
+def _values(values):
+    if isinstance(values, (list, tuple, set)):
+        return values
+    return [values]
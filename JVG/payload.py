@@ -0,0 +1,586 @@
+import hashlib
+import json
+import os
+import struct
+import warnings
+
+import numpy as np
+
+MAGIC = b"JVG1"
+
+DEFAULT_NODE_SIZE = 10
+DEFAULT_NODE_COLOR = "#97c2fc"
+
+
+class GraphPayload:
+    """
+    Columnar representation of a graph shipped to the NxEditor page.
+
+    Nodes are addressed by their position ``0..n-1``; node attributes and
+    edge endpoints are stored as flat NumPy arrays instead of per-element
+    Python objects. :meth:`to_bytes` packs the arrays into a binary document
+    that the browser maps onto typed arrays without parsing.
+
+    Parameters
+    ----------
+    labels : list of str
+        Node labels.
+
+    sources, targets : array_like of int
+        Indices of the edge endpoints.
+
+    sizes : array_like of float, optional
+        Node sizes. Defaults to ``DEFAULT_NODE_SIZE``.
+
+    colors : list of str, optional
+        Node colors. Defaults to ``DEFAULT_NODE_COLOR``.
+
+    widths : array_like of float, optional
+        Edge widths.
+
+    titles : list of str, optional
+        Node tooltips.
+
+    directed : bool
+        Whether edges are drawn with arrows.
+
+    positions : array_like of float, optional
+        Node coordinates of shape ``(n, 2)``. When present the editor opens
+        with physics disabled.
+
+    Attributes
+    ----------
+    nodes : list
+        Original node identifiers, when the payload was built from a graph.
+    """
+
+    def __init__(
+        self,
+        labels,
+        sources,
+        targets,
+        sizes=None,
+        colors=None,
+        widths=None,
+        titles=None,
+        directed=False,
+        positions=None,
+    ):
+        self.labels = [str(label) for label in labels]
+        n = len(self.labels)
+
+        self.sources = np.ascontiguousarray(sources, dtype="<i4")
+        self.targets = np.ascontiguousarray(targets, dtype="<i4")
+
+        if sizes is None:
+            sizes = np.full(n, DEFAULT_NODE_SIZE)
+        self.sizes = np.ascontiguousarray(sizes, dtype="<f4")
+
+        if colors is None:
+            colors = [DEFAULT_NODE_COLOR] * n
+        self.palette, color_index = np.unique(
+            np.asarray(colors, dtype=object).astype(str), return_inverse=True
+        )
+        self.colors = np.ascontiguousarray(color_index, dtype="<u4")
+
+        self.widths = (
+            None if widths is None else np.ascontiguousarray(widths, dtype="<f4")
+        )
+        self.titles = None if titles is None else [str(title) for title in titles]
+        self.directed = bool(directed)
+        self.positions = (
+            None
+            if positions is None
+            else np.ascontiguousarray(positions, dtype="<f4").reshape(n, 2)
+        )
+        self.nodes = None
+
+    @property
+    def number_of_nodes(self):
+        return len(self.labels)
+
+    @property
+    def number_of_edges(self):
+        return len(self.sources)
+
+    @classmethod
+    def from_networkx(cls, graph):
+        """
+        Build a payload from a NetworkX graph.
+
+        The ``size``, ``color``, ``label`` and ``title`` node attributes and
+        the ``width`` (or ``weight``) edge attribute are used when present.
+        The graph is not modified.
+
+        Parameters
+        ----------
+        graph : networkx.Graph
+            Graph to convert.
+
+        Returns
+        -------
+        GraphPayload
+        """
+
+        nodes = list(graph.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        attributes = graph.nodes
+
+        labels = [attributes[node].get("label", node) for node in nodes]
+        sizes = [attributes[node].get("size", DEFAULT_NODE_SIZE) for node in nodes]
+        colors = [attributes[node].get("color", DEFAULT_NODE_COLOR) for node in nodes]
+
+        titles = None
+        if any("title" in attributes[node] for node in nodes):
+            titles = [attributes[node].get("title", "") for node in nodes]
+
+        m = graph.number_of_edges()
+        sources = np.fromiter(
+            (index[u] for u, _ in graph.edges()), dtype="<i4", count=m
+        )
+        targets = np.fromiter(
+            (index[v] for _, v in graph.edges()), dtype="<i4", count=m
+        )
+
+        widths = None
+        if any(
+            "width" in data or "weight" in data for _, _, data in graph.edges(data=True)
+        ):
+            widths = np.fromiter(
+                (
+                    data.get("width", data.get("weight", 1))
+                    for _, _, data in graph.edges(data=True)
+                ),
+                dtype="<f4",
+                count=m,
+            )
+
+        payload = cls(
+            labels,
+            sources,
+            targets,
+            sizes=sizes,
+            colors=colors,
+            widths=widths,
+            titles=titles,
+            directed=graph.is_directed(),
+        )
+        payload.nodes = nodes
+
+        return payload
+
+    @classmethod
+    def from_arrays(
+        cls, sources, targets, node_attrs=None, nodes=None, widths=None, directed=False
+    ):
+        """
+        Build a payload from edge endpoint arrays.
+
+        The arrays are converted with vectorized NumPy operations only, so
+        memory-mapped inputs with millions of edges never turn into per-edge
+        Python objects.
+
+        Parameters
+        ----------
+        sources, targets : array_like
+            Node identifiers of the edge endpoints, e.g. integers or strings.
+
+        node_attrs : dict, optional
+            Node attribute arrays aligned with ``nodes``, among ``"label"``,
+            ``"size"``, ``"color"`` and ``"title"``.
+
+        nodes : array_like, optional
+            Node identifiers. Defaults to the sorted unique endpoints; nodes
+            without edges have to be listed here.
+
+        widths : array_like of float, optional
+            Edge widths.
+
+        directed : bool
+            Whether edges are drawn with arrows.
+
+        Returns
+        -------
+        GraphPayload
+
+        Raises
+        ------
+        ValueError
+            If an endpoint is not among ``nodes`` or an attribute is not
+            supported.
+        """
+
+        sources = np.asarray(sources)
+        targets = np.asarray(targets)
+        if sources.shape != targets.shape or sources.ndim != 1:
+            raise ValueError("Expected 1-d source and target arrays of equal length.")
+
+        if nodes is None:
+            nodes, inverse = np.unique(
+                np.concatenate((sources, targets)), return_inverse=True
+            )
+            inverse = inverse.astype("<i4", copy=False).reshape(-1)
+            sources, targets = inverse[: len(sources)], inverse[len(sources) :]
+        else:
+            nodes = np.asarray(nodes)
+            sources, targets = _node_indices(nodes, sources), _node_indices(
+                nodes, targets
+            )
+
+        node_attrs = dict(node_attrs or {})
+        unknown = set(node_attrs) - {"label", "size", "color", "title"}
+        if unknown:
+            raise ValueError(f"Unsupported node attributes: {sorted(unknown)}")
+
+        labels = node_attrs.get("label")
+        titles = node_attrs.get("title")
+        payload = cls(
+            np.asarray(nodes if labels is None else labels).astype(str).tolist(),
+            sources,
+            targets,
+            sizes=node_attrs.get("size"),
+            colors=node_attrs.get("color"),
+            widths=widths,
+            titles=None if titles is None else np.asarray(titles).astype(str).tolist(),
+            directed=directed,
+        )
+        payload.nodes = nodes.tolist()
+
+        return payload
+
+    def remove_nodes(self, indices):
+        """
+        Return a copy without some nodes and their incident edges.
+
+        Parameters
+        ----------
+        indices : array_like of int
+            Positions of the nodes to remove.
+
+        Returns
+        -------
+        GraphPayload
+            Payload with the remaining nodes renumbered in their order.
+        """
+
+        keep = np.ones(self.number_of_nodes, dtype=bool)
+        keep[np.asarray(indices, dtype=np.intp)] = False
+        index = np.cumsum(keep, dtype="<i4") - 1
+        edges = keep[self.sources] & keep[self.targets]
+
+        kept = np.flatnonzero(keep)
+        payload = GraphPayload(
+            [self.labels[i] for i in kept],
+            index[self.sources[edges]],
+            index[self.targets[edges]],
+            sizes=self.sizes[keep],
+            colors=self.palette[self.colors[keep]],
+            widths=None if self.widths is None else self.widths[edges],
+            titles=None if self.titles is None else [self.titles[i] for i in kept],
+            directed=self.directed,
+            positions=None if self.positions is None else self.positions[keep],
+        )
+        if self.nodes is not None:
+            payload.nodes = [self.nodes[i] for i in kept]
+
+        return payload
+
+    def describe(self, nodes, edges):
+        """
+        Describe some nodes and edges for the editor page.
+
+        Parameters
+        ----------
+        nodes : array_like of int
+            Positions of the nodes.
+
+        edges : array_like of int
+            Positions of the edges.
+
+        Returns
+        -------
+        dict
+            JSON-serializable lists of the node attributes, the node
+            positions as flat ``x, y`` pairs, the edge endpoints as flat
+            ``source, target`` pairs and the edge widths. Nodes keep their
+            positions in the payload as ids.
+        """
+
+        nodes = np.asarray(nodes, dtype=np.intp)
+        edges = np.asarray(edges, dtype=np.intp)
+
+        return {
+            "nodes": nodes.tolist(),
+            "labels": [self.labels[i] for i in nodes],
+            "sizes": self.sizes[nodes].tolist(),
+            "colors": self.palette[self.colors[nodes]].tolist(),
+            "titles": (
+                None if self.titles is None else [self.titles[i] for i in nodes]
+            ),
+            "positions": (
+                None
+                if self.positions is None
+                else self.positions[nodes].ravel().tolist()
+            ),
+            "edges": np.column_stack((self.sources[edges], self.targets[edges]))
+            .ravel()
+            .tolist(),
+            "widths": None if self.widths is None else self.widths[edges].tolist(),
+        }
+
+    def digest(self):
+        """
+        Content hash of the payload.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest, identical across processes for equal
+            payloads.
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+        header = [self.directed, self.labels, self.palette.tolist(), self.titles]
+        digest.update(json.dumps(header).encode("utf-8"))
+        for array in (self.sources, self.targets, self.sizes, self.colors):
+            digest.update(array.tobytes())
+        if self.widths is not None:
+            digest.update(self.widths.tobytes())
+
+        return digest.hexdigest()
+
+    def _arrays(self):
+        arrays = {
+            "sizes": self.sizes,
+            "colors": self.colors,
+            "edges": np.column_stack((self.sources, self.targets)).ravel(),
+        }
+        if self.widths is not None:
+            arrays["widths"] = self.widths
+        if self.positions is not None:
+            arrays["positions"] = self.positions.ravel()
+
+        return arrays
+
+    def to_bytes(self):
+        """
+        Pack the payload into its binary transport format.
+
+        The document starts with the ``JVG1`` magic and the little-endian
+        length of a JSON header, followed by the header. The arrays follow at
+        the next 4-byte boundary; their names, types, lengths and offsets
+        relative to that boundary are listed in the header.
+
+        Returns
+        -------
+        bytes
+        """
+
+        arrays = self._arrays()
+
+        entries = []
+        offset = 0
+        for name, array in arrays.items():
+            entries.append(
+                {
+                    "name": name,
+                    "dtype": array.dtype.name,
+                    "offset": offset,
+                    "length": len(array),
+                }
+            )
+            offset = _align(offset + array.nbytes)
+
+        header = {
+            "nodes": self.number_of_nodes,
+            "edges": self.number_of_edges,
+            "directed": self.directed,
+            "labels": self.labels,
+            "palette": self.palette.tolist(),
+            "titles": self.titles,
+            "arrays": entries,
+        }
+        encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        encoded += b" " * (_align(8 + len(encoded)) - 8 - len(encoded))
+
+        parts = [MAGIC, struct.pack("<I", len(encoded)), encoded]
+        for array in arrays.values():
+            parts.append(array.tobytes())
+            parts.append(b"\0" * (_align(array.nbytes) - array.nbytes))
+
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Unpack a payload produced by :meth:`to_bytes`.
+
+        Parameters
+        ----------
+        data : bytes
+            Binary payload.
+
+        Returns
+        -------
+        GraphPayload
+
+        Raises
+        ------
+        ValueError
+            If ``data`` is not a JVG graph payload.
+        """
+
+        if bytes(data[:4]) != MAGIC:
+            raise ValueError("Not a JVG graph payload.")
+
+        (length,) = struct.unpack_from("<I", data, 4)
+        header = json.loads(bytes(data[8 : 8 + length]))
+        base = 8 + length
+
+        arrays = {
+            entry["name"]: np.frombuffer(
+                data,
+                dtype=np.dtype(entry["dtype"]).newbyteorder("<"),
+                count=entry["length"],
+                offset=base + entry["offset"],
+            )
+            for entry in header["arrays"]
+        }
+        edges = arrays["edges"].reshape(-1, 2)
+
+        return cls(
+            header["labels"],
+            edges[:, 0],
+            edges[:, 1],
+            sizes=arrays["sizes"],
+            colors=np.asarray(header["palette"], dtype=object)[arrays["colors"]],
+            widths=arrays.get("widths"),
+            titles=header["titles"],
+            directed=header["directed"],
+            positions=arrays.get("positions"),
+        )
+
+
+def graph_hash(graph):
+    """
+    Stable content hash of a NetworkX graph.
+
+    The hash covers the graph type and attributes, the nodes and the edges
+    with their attributes, in iteration order, and is identical across
+    processes for graphs built the same way.
+
+    Parameters
+    ----------
+    graph : networkx.Graph
+        Graph to hash.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest.
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((graph.is_directed(), _items(graph.graph))).encode())
+
+    for node, data in graph.nodes(data=True):
+        digest.update(repr((node, _items(data))).encode())
+    for u, v, data in graph.edges(data=True):
+        digest.update(repr((u, v, _items(data))).encode())
+
+    return digest.hexdigest()
+
+
+def read_edgelist(path, delimiter=None, comments="#"):
+    """
+    Read an edge list without building per-edge Python objects.
+
+    ``.npy`` files holding an ``(m, 2)`` array of endpoints, or ``(m, 3)``
+    with edge weights in the last column, are memory-mapped. Text files with
+    one ``source target [weight]`` edge per line are parsed by NumPy's C
+    reader; integer node identifiers are read as integers, anything else as
+    strings.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Edge list file.
+
+    delimiter : str, optional
+        Column separator of text files. Defaults to any whitespace.
+
+    comments : str
+        Prefix of comment lines in text files.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        Sources, targets and weights, ``None`` for unweighted lists.
+
+    Raises
+    ------
+    ValueError
+        If the file is not an edge list.
+    """
+
+    if os.fspath(path).endswith(".npy"):
+        edges = np.load(path, mmap_mode="r")
+        if edges.ndim != 2 or edges.shape[1] not in (2, 3):
+            raise ValueError("Expected an array of shape (m, 2) or (m, 3).")
+
+        weights = edges[:, 2] if edges.shape[1] == 3 else None
+        return edges[:, 0], edges[:, 1], weights
+
+    first = None
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.split(comments, 1)[0].strip()
+            if line:
+                first = line.split(delimiter)
+                break
+    if first is None:
+        return np.empty(0, np.int64), np.empty(0, np.int64), None
+    if len(first) < 2:
+        raise ValueError("Expected at least two columns.")
+
+    weighted = len(first) > 2
+    options = dict(comments=comments, delimiter=delimiter, encoding="utf-8")
+
+    if all(token.lstrip("+-").isdigit() for token in first[:2]):
+        fields = [("source", "<i8"), ("target", "<i8")]
+        if weighted:
+            fields.append(("weight", "<f4"))
+        edges = np.atleast_1d(
+            np.loadtxt(path, dtype=fields, usecols=range(len(fields)), **options)
+        )
+        weights = edges["weight"] if weighted else None
+        return edges["source"], edges["target"], weights
+
+    with warnings.catch_warnings():
+        # Reading strings in chunks warns about skipped comment lines.
+        warnings.filterwarnings("ignore", "Input line", UserWarning)
+        ids = np.loadtxt(path, dtype=str, usecols=(0, 1), ndmin=2, **options)
+    weights = None
+    if weighted:
+        weights = np.loadtxt(path, dtype="<f4", usecols=(2,), ndmin=1, **options)
+
+    return ids[:, 0], ids[:, 1], weights
+
+
+def _node_indices(nodes, ids):
+    order = np.argsort(nodes, kind="stable")
+    position = np.searchsorted(nodes, ids, sorter=order)
+    position = np.minimum(position, len(nodes) - 1)
+    indices = order[position] if len(nodes) else position
+    if len(ids) and (not len(nodes) or np.any(nodes[indices] != ids)):
+        raise ValueError("Edge endpoints must be among the nodes.")
+
+    return indices.astype("<i4")
+
+
+def _items(data):
+    return sorted(data.items(), key=lambda item: repr(item[0]))
+
+
+def _align(offset, alignment=4):
+    return (offset + alignment - 1) // alignment * alignment
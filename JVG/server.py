@@ -0,0 +1,584 @@
+import functools
+import gzip
+import hashlib
+import http
+import http.server
+import os
+import posixpath
+import threading
+import urllib.parse
+import uuid
+
+
+class MemoryResource:
+    """
+    In-memory file served by :class:`EditorServer`.
+
+    Parameters
+    ----------
+    data : bytes
+        Content of the resource.
+
+    content_type : str
+        MIME type sent with the resource.
+
+    compress : bool, optional
+        Whether to offer gzip encoding. By default only textual resources
+        are compressed.
+
+    Attributes
+    ----------
+    etag : str
+        Strong entity tag derived from the content.
+    """
+
+    compress_min_size = 1024
+
+    def __init__(self, data, content_type="application/octet-stream", compress=None):
+        self.data = memoryview(data)
+        self.content_type = content_type
+        self.compress = compress
+        self.etag = '"%s"' % hashlib.sha1(self.data).hexdigest()
+
+        self._gzip = None
+        self._lock = threading.Lock()
+
+    @property
+    def compressible(self):
+        """
+        Whether the resource is worth sending gzip-compressed.
+
+        Returns
+        -------
+        bool
+        """
+
+        if len(self.data) < self.compress_min_size:
+            return False
+        if self.compress is not None:
+            return self.compress
+
+        return self.content_type.startswith("text/") or self.content_type.endswith(
+            ("+xml", "/json", "/javascript")
+        )
+
+    def gzipped(self):
+        """
+        Return the gzip-compressed content, compressing it on first use.
+
+        Returns
+        -------
+        memoryview
+        """
+
+        with self._lock:
+            if self._gzip is None:
+                self._gzip = memoryview(gzip.compress(self.data, compresslevel=6))
+
+        return self._gzip
+
+
+class EventStream:
+    """
+    Server-Sent Events stream served by :class:`EditorServer`.
+
+    Every published event is numbered, and the last ``max_events`` events
+    are kept, so pages that connect late or reconnect with a
+    ``Last-Event-ID`` header receive the events they missed. Older events
+    are dropped to bound the memory of long-running streams; a page that
+    missed them starts with the oldest kept event. The stream ends for all
+    pages when it is closed.
+
+    Parameters
+    ----------
+    max_events : int, optional
+        Number of events kept for replay; defaults to the class attribute.
+
+    Attributes
+    ----------
+    keepalive : float
+        Seconds after which an idle stream sends a comment, which detects
+        pages that were closed.
+
+    max_events : int
+        Number of events kept for replay.
+    """
+
+    content_type = "text/event-stream"
+    keepalive = 15.0
+    max_events = 10_000
+
+    def __init__(self, max_events=None):
+        if max_events is not None:
+            self.max_events = max_events
+
+        self._events = []
+        self._dropped = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        return self._dropped + len(self._events)
+
+    def publish(self, data):
+        """
+        Send an event to all connected pages.
+
+        Parameters
+        ----------
+        data : str
+            Event data on a single line, e.g. compact JSON.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._condition:
+            if self._closed:
+                return
+            event = f"id: {len(self)}\ndata: {data}\n\n"
+            self._events.append(event.encode("utf-8"))
+
+            excess = len(self._events) - self.max_events
+            if excess > 0:
+                del self._events[:excess]
+                self._dropped += excess
+
+            self._condition.notify_all()
+
+    def close(self):
+        """
+        End the stream for all pages.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def chunks(self, last_event_id=None):
+        """
+        Iterate over the encoded events following an event.
+
+        Waits for new events until the stream is closed, yielding a comment
+        whenever no event was published for ``keepalive`` seconds.
+
+        Parameters
+        ----------
+        last_event_id : int, optional
+            Number of the last event received; starts with the oldest kept
+            event by default.
+
+        Yields
+        ------
+        bytes
+        """
+
+        position = 0 if last_event_id is None else last_event_id + 1
+        while True:
+            with self._condition:
+                if position >= len(self) and not self._closed:
+                    self._condition.wait(self.keepalive)
+                position = max(position, self._dropped)
+                events = self._events[position - self._dropped :]
+                closed = self._closed
+
+            position += len(events)
+            if events:
+                yield b"".join(events)
+            elif closed:
+                return
+            else:
+                yield b":\n\n"
+
+
+class EditorRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    Request handler of :class:`EditorServer`.
+
+    Static files (editor pages) are served from the handler ``directory``.
+    Paths of the form ``/s/<session_id>/<name>`` are resolved against the
+    in-memory resources registered for that session first and fall back to
+    the static directory, so that a page opened from a session URL can refer
+    to its figure with a relative path. ``POST`` requests to a session path
+    are passed to the handler registered under that name, and
+    :class:`EventStream` resources stay open until their stream ends.
+    """
+
+    chunk_size = 1 << 20
+
+    def do_GET(self):
+        resource = self._session_resource()
+        if resource is None:
+            super().do_GET()
+        elif isinstance(resource, EventStream):
+            self._send_events(resource)
+        else:
+            self._send_resource(resource)
+
+    def do_HEAD(self):
+        resource = self._session_resource()
+        if resource is None:
+            super().do_HEAD()
+        elif isinstance(resource, EventStream):
+            self._send_events(resource, body=False)
+        else:
+            self._send_resource(resource, body=False)
+
+    def do_POST(self):
+        parts = _session_parts(self.path)
+        handler = None if parts is None else self.server.editor.handler(*parts)
+        if handler is None:
+            self.send_error(http.HTTPStatus.NOT_FOUND)
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            result = handler(body)
+        except ValueError as error:
+            self.send_error(http.HTTPStatus.BAD_REQUEST, str(error))
+            return
+        except Exception:
+            # A failing handler must not leave the page without a response.
+            self.send_error(http.HTTPStatus.INTERNAL_SERVER_ERROR)
+            return
+
+        if result is None:
+            self.send_response(http.HTTPStatus.NO_CONTENT)
+            self.end_headers()
+        else:
+            self._send_resource(result)
+
+    def translate_path(self, path):
+        parts = _session_parts(path)
+        if parts is not None:
+            path = "/" + parts[1]
+
+        return super().translate_path(path)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _session_resource(self):
+        parts = _session_parts(self.path)
+        if parts is None:
+            return None
+
+        return self.server.editor.resource(*parts)
+
+    def _send_resource(self, resource, body=True):
+        use_gzip = resource.compressible and "gzip" in self.headers.get(
+            "Accept-Encoding", ""
+        )
+        data = resource.gzipped() if use_gzip else resource.data
+        etag = resource.etag[:-1] + '-gzip"' if use_gzip else resource.etag
+
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(http.HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(http.HTTPStatus.OK)
+        self.send_header("Content-Type", resource.content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+
+        if body:
+            for start in range(0, len(data), self.chunk_size):
+                self.wfile.write(data[start : start + self.chunk_size])
+
+    def _send_events(self, stream, body=True):
+        last_event_id = self.headers.get("Last-Event-ID", "")
+
+        self.send_response(http.HTTPStatus.OK)
+        self.send_header("Content-Type", stream.content_type)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        if not body:
+            return
+        try:
+            for chunk in stream.chunks(
+                int(last_event_id) if last_event_id.isdigit() else None
+            ):
+                self.wfile.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _session_parts(path):
+    path = urllib.parse.unquote(urllib.parse.urlsplit(path).path)
+    parts = posixpath.normpath(path).lstrip("/").split("/")
+
+    if len(parts) == 3 and parts[0] == "s":
+        return parts[1], parts[2]
+
+    return None
+
+
+class EditorServer:
+    """
+    Threaded HTTP server shared by editor sessions.
+
+    A single server serves any number of figures at the same time. Every
+    figure is registered as a session and exposed under its own URL prefix
+    ``/s/<session_id>/``, so opening another figure only registers a new
+    session instead of binding a new port.
+
+    Parameters
+    ----------
+    host : str
+        Interface the server binds to.
+
+    port : int
+        Port the server binds to. ``0`` selects a free ephemeral port.
+
+    directory : str, optional
+        Directory with the static editor pages. Defaults to the package
+        directory.
+
+    Attributes
+    ----------
+    ready : threading.Event
+        Set while the server is listening.
+
+    port : int
+        Port the server is bound to, available after :meth:`start`.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, directory=None):
+        self.host = host
+        self.port = port
+        self.directory = directory or os.path.dirname(os.path.abspath(__file__))
+        self.ready = threading.Event()
+
+        self._httpd = None
+        self._thread = None
+        self._sessions = {}
+        self._handlers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        """
+        Base URL of the running server.
+
+        Returns
+        -------
+        str
+        """
+
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """
+        Bind the server and start serving in a daemon thread.
+
+        Calling :meth:`start` on a running server has no effect. The method
+        returns once the socket is listening.
+
+        Returns
+        -------
+        EditorServer
+            The running server.
+
+        Raises
+        ------
+        OSError
+            If the server could not bind to its port.
+        """
+
+        with self._lock:
+            if self._httpd is not None:
+                return self
+
+            handler = functools.partial(EditorRequestHandler, directory=self.directory)
+            httpd = http.server.ThreadingHTTPServer((self.host, self.port), handler)
+            httpd.editor = self
+
+            self._httpd = httpd
+            self.port = httpd.server_address[1]
+            self._thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+            self._thread.start()
+            self.ready.set()
+
+        return self
+
+    def shutdown(self):
+        """
+        Stop the server and release its port.
+
+        Registered sessions are kept, so the server can be started again.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            if self._httpd is None:
+                return
+
+            self.ready.clear()
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+
+            self._httpd = None
+            self._thread = None
+
+    def register(self, resources, handlers=None):
+        """
+        Register a new session.
+
+        Parameters
+        ----------
+        resources : dict
+            Mapping of resource names to :class:`MemoryResource` or
+            :class:`EventStream` objects served under the session URL.
+
+        handlers : dict, optional
+            Mapping of names to callables receiving the body of ``POST``
+            requests to the session URL. A handler returns ``None`` or a
+            :class:`MemoryResource` sent as the response, and raises
+            :class:`ValueError` to reject the request.
+
+        Returns
+        -------
+        str
+            Identifier of the new session.
+        """
+
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[session_id] = dict(resources)
+            self._handlers[session_id] = dict(handlers or {})
+
+        return session_id
+
+    def unregister(self, session_id):
+        """
+        Remove a session with its resources and handlers.
+
+        The event streams of the session are closed.
+
+        Parameters
+        ----------
+        session_id : str
+            Identifier returned by :meth:`register`.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            resources = self._sessions.pop(session_id, {})
+            self._handlers.pop(session_id, None)
+
+        for resource in resources.values():
+            if isinstance(resource, EventStream):
+                resource.close()
+
+    def resource(self, session_id, name):
+        """
+        Look up a resource of a session.
+
+        Parameters
+        ----------
+        session_id : str
+            Identifier returned by :meth:`register`.
+
+        name : str
+            Resource name.
+
+        Returns
+        -------
+        MemoryResource or EventStream or None
+            The registered resource or ``None`` when it does not exist.
+        """
+
+        with self._lock:
+            return self._sessions.get(session_id, {}).get(name)
+
+    def handler(self, session_id, name):
+        """
+        Look up a ``POST`` handler of a session.
+
+        Parameters
+        ----------
+        session_id : str
+            Identifier returned by :meth:`register`.
+
+        name : str
+            Handler name.
+
+        Returns
+        -------
+        callable or None
+            The registered handler or ``None`` when it does not exist.
+        """
+
+        with self._lock:
+            return self._handlers.get(session_id, {}).get(name)
+
+    def session_url(self, session_id, name, **query):
+        """
+        Build the URL of a file served for a session.
+
+        Parameters
+        ----------
+        session_id : str
+            Identifier returned by :meth:`register`.
+
+        name : str
+            Resource or static file name.
+
+        **query
+            Query string parameters.
+
+        Returns
+        -------
+        str
+        """
+
+        url = f"{self.url}/s/{session_id}/{urllib.parse.quote(name)}"
+        if query:
+            url += "?" + urllib.parse.urlencode(query)
+
+        return url
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_server():
+    """
+    Return the process-wide editor server, starting it on first use.
+
+    The port is taken from the ``JVG_PORT`` environment variable and
+    defaults to a free ephemeral port.
+
+    Returns
+    -------
+    EditorServer
+    """
+
+    global _server
+
+    with _server_lock:
+        if _server is None:
+            _server = EditorServer(port=int(os.environ.get("JVG_PORT", 0)))
+
+    return _server.start()
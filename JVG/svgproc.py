@@ -0,0 +1,614 @@
+import collections
+import io
+import math
+import re
+import xml.etree.ElementTree as ET
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+NORMALIZED_ATTRIBUTE = "data-jvg-normalized"
+
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", XLINK_NS)
+ET.register_namespace("cc", "http://creativecommons.org/ns#")
+ET.register_namespace("dc", "http://purl.org/dc/elements/1.1/")
+ET.register_namespace("rdf", "http://www.w3.org/1999/02/22-rdf-syntax-ns#")
+
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_REFERENCE = re.compile(r"url\(\s*['\"]?#([^'\")\s]+)")
+
+_DRAWABLE = {
+    "path",
+    "rect",
+    "circle",
+    "ellipse",
+    "line",
+    "polyline",
+    "polygon",
+    "text",
+    "use",
+    "image",
+}
+_DEFINITIONS = {"defs", "clipPath", "mask", "marker", "pattern", "symbol"}
+_COORDINATES = {
+    "d",
+    "points",
+    "x",
+    "y",
+    "width",
+    "height",
+    "cx",
+    "cy",
+    "r",
+    "rx",
+    "ry",
+    "x1",
+    "y1",
+    "x2",
+    "y2",
+}
+_GROUP_ONLY = {"id", "transform", "clip-path", "style"}
+
+
+def parse_transform(text):
+    """
+    Parse an SVG transform list into an affine matrix.
+
+    Parameters
+    ----------
+    text : str or None
+        Value of a ``transform`` attribute.
+
+    Returns
+    -------
+    tuple of float
+        Matrix ``(a, b, c, d, e, f)`` as in SVG ``matrix(a b c d e f)``.
+    """
+
+    matrix = _IDENTITY
+    for name, arguments in _TRANSFORM.findall(text or ""):
+        values = [float(value) for value in _NUMBER.findall(arguments)]
+
+        if name == "matrix":
+            step = tuple(values[:6])
+        elif name == "translate":
+            step = (1, 0, 0, 1, values[0], values[1] if len(values) > 1 else 0)
+        elif name == "scale":
+            step = (values[0], 0, 0, values[1] if len(values) > 1 else values[0], 0, 0)
+        elif name == "rotate":
+            angle = math.radians(values[0])
+            cos, sin = math.cos(angle), math.sin(angle)
+            step = (cos, sin, -sin, cos, 0, 0)
+            if len(values) == 3:
+                cx, cy = values[1], values[2]
+                step = compose(
+                    compose((1, 0, 0, 1, cx, cy), step), (1, 0, 0, 1, -cx, -cy)
+                )
+        elif name == "skewX":
+            step = (1, 0, math.tan(math.radians(values[0])), 1, 0, 0)
+        else:
+            step = (1, math.tan(math.radians(values[0])), 0, 1, 0, 0)
+
+        matrix = compose(matrix, step)
+
+    return matrix
+
+
+def compose(outer, inner):
+    """
+    Compose two affine matrices.
+
+    Parameters
+    ----------
+    outer, inner : tuple of float
+        Matrices ``(a, b, c, d, e, f)``; ``inner`` is applied first.
+
+    Returns
+    -------
+    tuple of float
+    """
+
+    a1, b1, c1, d1, e1, f1 = outer
+    a2, b2, c2, d2, e2, f2 = inner
+
+    return (
+        a1 * a2 + c1 * b2,
+        b1 * a2 + d1 * b2,
+        a1 * c2 + c1 * d2,
+        b1 * c2 + d1 * d2,
+        a1 * e2 + c1 * f2 + e1,
+        b1 * e2 + d1 * f2 + f1,
+    )
+
+
+def format_transform(matrix):
+    """
+    Format an affine matrix as an SVG transform list.
+
+    The translation is written first, so the editor's move commands shift
+    the element in the coordinates of its parent.
+
+    Parameters
+    ----------
+    matrix : tuple of float
+        Matrix ``(a, b, c, d, e, f)``.
+
+    Returns
+    -------
+    str or None
+        The transform, or ``None`` for the identity.
+    """
+
+    a, b, c, d, e, f = matrix
+    parts = []
+
+    if e or f:
+        parts.append(f"translate({_format_number(e)} {_format_number(f)})")
+    if b or c:
+        parts.append(
+            "matrix(%s 0 0)" % " ".join(_format_number(value) for value in (a, b, c, d))
+        )
+    elif (a, d) != (1, 1):
+        parts.append(f"scale({_format_number(a)} {_format_number(d)})")
+
+    return " ".join(parts) or None
+
+
+def _format_number(value, precision=6):
+    text = f"{value:.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+
+    return "0" if text in ("", "-0") else text
+
+
+def _round_numbers(text, precision):
+    return _NUMBER.sub(
+        lambda match: _format_number(round(float(match.group()), precision), precision),
+        text,
+    )
+
+
+def _text(text):
+    # Indentation between elements is dropped; it only inflates the document.
+    return text if text and not text.isspace() else None
+
+
+def _local(tag):
+    return tag.rpartition("}")[2]
+
+
+def _references(element):
+    for name, value in element.attrib.items():
+        if name in ("href", f"{{{XLINK_NS}}}href") and value.startswith("#"):
+            yield value[1:]
+        else:
+            yield from _REFERENCE.findall(value)
+
+
+def normalize_svg(data, precision=None, strip_defs=True, deduplicate=False):
+    """
+    Prepare an SVG document for the editor in a single streaming pass.
+
+    The document is read with :func:`xml.etree.ElementTree.iterparse` and
+    rewritten so that:
+
+    - groups are flattened; their transforms are composed into the
+      transforms of their children and their styles and presentation
+      attributes are inherited by the children,
+    - clip paths of grouped elements are dropped, as the editor moves and
+      scales elements individually,
+    - every drawable element gets a stable ``id`` derived from the ``id`` of
+      its innermost group (``line2d_1``, ``line2d_1-1``, ...),
+    - coordinates are optionally rounded to ``precision`` decimals,
+    - definitions that are no longer referenced are optionally removed,
+    - repeated content is optionally deduplicated: identical marker
+      definitions of different artists are merged, paths drawn more than
+      once are defined once and drawn with ``<use>``, and repeated styles
+      become CSS classes.
+
+    The root element is marked with ``data-jvg-normalized`` so that the
+    editor page skips its own normalization.
+
+    Parameters
+    ----------
+    data : bytes
+        SVG document.
+
+    precision : int, optional
+        Number of decimals kept in coordinates. By default coordinates are
+        kept as they are.
+
+    strip_defs : bool
+        Whether to remove unreferenced definitions.
+
+    deduplicate : bool
+        Whether to deduplicate repeated paths, definitions and styles.
+
+    Returns
+    -------
+    bytes
+        The normalized document.
+    """
+
+    root = None
+    # Output parents; one entry per open source element. Groups have no
+    # output element and carry the transform, attributes and id counter
+    # inherited by their children.
+    stack = []
+    used_ids = set()
+    references = set()
+    definitions = []
+    counter = 0
+    pending = None
+
+    for event, element in ET.iterparse(io.BytesIO(data), events=("start", "end")):
+        if pending is not None:
+            # The tail of an element is only complete once the next event
+            # has been parsed.
+            source, output = pending
+            output.tail = _text(source.tail)
+            source.clear()
+            pending = None
+
+        tag = _local(element.tag)
+
+        if event == "start":
+            if root is None:
+                root = ET.Element(element.tag, element.attrib)
+                stack.append({"output": root, "definitions": False})
+                continue
+
+            parent = stack[-1]
+            inherited = parent.get("group")
+            in_definitions = parent["definitions"] or tag in _DEFINITIONS
+
+            if tag == "g":
+                attributes = dict(inherited["attributes"]) if inherited else {}
+                style = element.get("style")
+                if style:
+                    attributes["style"] = ";".join(
+                        filter(None, (attributes.get("style"), style))
+                    )
+                for name, value in element.attrib.items():
+                    if name not in _GROUP_ONLY:
+                        attributes[name] = value
+
+                matrix = parse_transform(element.get("transform"))
+                if inherited:
+                    matrix = compose(inherited["matrix"], matrix)
+
+                stack.append(
+                    {
+                        "output": parent["output"],
+                        "definitions": in_definitions,
+                        "group": {
+                            "matrix": matrix,
+                            "attributes": attributes,
+                            "id": element.get("id")
+                            or (inherited["id"] if inherited else None),
+                            "count": [0],
+                        },
+                    }
+                )
+                continue
+
+            attributes = dict(element.attrib)
+            if inherited and tag not in _DEFINITIONS:
+                attributes.pop("clip-path", None)
+                for name, value in inherited["attributes"].items():
+                    if name == "style":
+                        attributes["style"] = ";".join(
+                            filter(None, (value, attributes.get("style")))
+                        )
+                    else:
+                        attributes.setdefault(name, value)
+
+                if inherited["matrix"] != _IDENTITY:
+                    matrix = compose(
+                        inherited["matrix"],
+                        parse_transform(attributes.get("transform")),
+                    )
+                    transform = format_transform(matrix)
+                    if transform is None:
+                        attributes.pop("transform", None)
+                    else:
+                        attributes["transform"] = transform
+
+            for name in _COORDINATES.intersection(attributes):
+                value = attributes[name]
+                if precision is not None:
+                    value = _round_numbers(value, precision)
+                attributes[name] = " ".join(value.split())
+
+            if "id" not in attributes and tag in _DRAWABLE and not in_definitions:
+                if inherited and inherited["id"]:
+                    count = inherited["count"]
+                    candidate = inherited["id"]
+                    if count[0]:
+                        candidate = f"{candidate}-{count[0]}"
+                    count[0] += 1
+                else:
+                    candidate = f"element-{counter}"
+                    counter += 1
+                while candidate in used_ids:
+                    candidate = f"element-{counter}"
+                    counter += 1
+                attributes["id"] = candidate
+
+            if "id" in attributes:
+                used_ids.add(attributes["id"])
+
+            output = ET.SubElement(parent["output"], element.tag, attributes)
+            if tag == "defs":
+                definitions.append(output)
+            if not in_definitions:
+                references.update(_references(output))
+
+            stack.append({"output": output, "definitions": in_definitions})
+        else:
+            entry = stack.pop()
+            if "group" in entry or entry["output"] is root:
+                element.clear()
+            else:
+                entry["output"].text = _text(element.text)
+                pending = (element, entry["output"])
+
+    if deduplicate:
+        _deduplicate(root, definitions, references)
+    if strip_defs:
+        _strip_definitions(root, definitions, references)
+
+    root.set(NORMALIZED_ATTRIBUTE, "1")
+
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def _strip_definitions(root, definitions, references):
+    by_id = {}
+    for defs in definitions:
+        for child in defs:
+            if child.get("id"):
+                by_id[child.get("id")] = child
+
+    # Definitions may refer to other definitions, e.g. markers using glyphs.
+    queue = list(references)
+    reachable = set()
+    while queue:
+        name = queue.pop()
+        if name in reachable or name not in by_id:
+            continue
+        reachable.add(name)
+        for element in by_id[name].iter():
+            queue.extend(_references(element))
+
+    for defs in definitions:
+        for child in list(defs):
+            if child.get("id") and child.get("id") not in reachable:
+                defs.remove(child)
+
+
+def _deduplicate(root, definitions, references):
+    href = f"{{{XLINK_NS}}}href"
+    shared = ET.Element(f"{{{SVG_NS}}}defs")
+
+    # Markers of different artists are defined separately even when equal.
+    aliases = {}
+    canonical = {}
+    for defs in definitions:
+        for child in list(defs):
+            name = child.get("id")
+            if name is None or _local(child.tag) != "path":
+                continue
+            key = tuple(
+                sorted(item for item in child.attrib.items() if item[0] != "id")
+            )
+            if key in canonical:
+                aliases[name] = canonical[key]
+                defs.remove(child)
+            else:
+                canonical[key] = name
+
+    drawn = [
+        element
+        for element in root
+        if _local(element.tag) not in _DEFINITIONS | {"metadata", "style"}
+    ]
+
+    paths = collections.Counter(
+        element.get("d") for element in drawn if _local(element.tag) == "path"
+    )
+    shared_paths = {}
+    for element in drawn:
+        d = element.get("d")
+        if _local(element.tag) != "path" or paths[d] < 2:
+            continue
+        if d not in shared_paths:
+            shared_paths[d] = f"jvg-p{len(shared_paths)}"
+            ET.SubElement(shared, f"{{{SVG_NS}}}path", id=shared_paths[d], d=d)
+        del element.attrib["d"]
+        element.tag = f"{{{SVG_NS}}}use"
+        element.set(href, "#" + shared_paths[d])
+    references.update(shared_paths.values())
+
+    if aliases:
+        for element in root.iter():
+            for name, value in list(element.attrib.items()):
+                if name in ("href", href) and value[1:] in aliases:
+                    element.set(name, "#" + aliases[value[1:]])
+                    references.add(aliases[value[1:]])
+
+    styles = collections.Counter(element.get("style") for element in drawn)
+    classes = {}
+    for element in drawn:
+        style = element.get("style")
+        if not style or styles[style] < 2:
+            continue
+        if style not in classes:
+            classes[style] = f"jvg-s{len(classes)}"
+        del element.attrib["style"]
+        element.set(
+            "class", " ".join(filter(None, (element.get("class"), classes[style])))
+        )
+    if classes:
+        ET.SubElement(shared, f"{{{SVG_NS}}}style", type="text/css").text = "".join(
+            f".{name}{{{style}}}" for style, name in classes.items()
+        )
+
+    if len(shared):
+        root.insert(0, shared)
+
+
+def diff_svg(old, new):
+    """
+    Describe the changes between two renderings of a figure by element id.
+
+    Elements are matched by their ``id`` among the children of the root and
+    of its ``defs``, which covers every element of a normalized document.
+    Changed attributes and ``style`` declarations are reported one by one,
+    so changes made to the other attributes of an element in the editor
+    survive the update. Elements whose tag or content changed are replaced
+    as a whole. Changes of the order of existing elements are not reported.
+
+    Parameters
+    ----------
+    old, new : bytes
+        SVG documents.
+
+    Returns
+    -------
+    list of dict
+        Operations turning ``old`` into ``new``, in order:
+
+        - ``{"op": "remove", "ids": [...]}`` removes elements,
+        - ``{"op": "update", "id": ..., "attributes": {...}, "style": {...}}``
+          sets attributes and style properties, or removes them when their
+          value is ``None``; the root has the id ``None``,
+        - ``{"op": "replace", "id": ..., "svg": ...}`` replaces an element
+          by its new markup,
+        - ``{"op": "insert", "svg": ..., "after": ..., "defs": ...}`` adds an
+          element after the element with the id ``after``, or first when it
+          is ``None``, in the root or in its ``defs``,
+        - ``{"op": "styles", "css": [...]}`` replaces the style sheets.
+    """
+
+    old_root, new_root = ET.fromstring(old), ET.fromstring(new)
+    old_elements, new_elements = _identified(old_root), _identified(new_root)
+
+    operations = []
+    removed = [key for key in old_elements if key not in new_elements]
+    if removed:
+        operations.append({"op": "remove", "ids": removed})
+
+    update = _attribute_changes(old_root, new_root)
+    if update:
+        operations.append({"op": "update", "id": None, **update})
+
+    previous = {False: None, True: None}
+    for key, (element, in_defs) in new_elements.items():
+        if key not in old_elements:
+            operations.append(
+                {
+                    "op": "insert",
+                    "svg": _markup(element),
+                    "after": previous[in_defs],
+                    "defs": in_defs,
+                }
+            )
+        else:
+            before = old_elements[key][0]
+            if (
+                before.tag != element.tag
+                or _text(before.text) != _text(element.text)
+                or _children(before) != _children(element)
+            ):
+                operations.append({"op": "replace", "id": key, "svg": _markup(element)})
+            else:
+                update = _attribute_changes(before, element)
+                if update:
+                    operations.append({"op": "update", "id": key, **update})
+        previous[in_defs] = key
+
+    css = [_styles(root) for root in (old_root, new_root)]
+    if css[0] != css[1]:
+        operations.append({"op": "styles", "css": css[1]})
+
+    return operations
+
+
+def _identified(root):
+    elements = {}
+    for child in root:
+        if child.get("id"):
+            elements[child.get("id")] = child, False
+        elif _local(child.tag) == "defs":
+            for definition in child:
+                if definition.get("id"):
+                    elements[definition.get("id")] = definition, True
+
+    return elements
+
+
+def _attribute_changes(old, new):
+    attributes = {}
+    style = {}
+    for name in dict.fromkeys([*old.attrib, *new.attrib]):
+        before, after = old.get(name), new.get(name)
+        if before == after:
+            continue
+        if name == "style":
+            before, after = _declarations(before), _declarations(after)
+            for key in dict.fromkeys([*before, *after]):
+                if before.get(key) != after.get(key):
+                    style[key] = after.get(key)
+        else:
+            attributes[_qualified(name)] = after
+
+    changes = {}
+    if attributes:
+        changes["attributes"] = attributes
+    if style:
+        changes["style"] = style
+
+    return changes
+
+
+def _declarations(style):
+    declarations = {}
+    for declaration in (style or "").split(";"):
+        name, _, value = declaration.partition(":")
+        if name.strip():
+            declarations[name.strip()] = value.strip()
+
+    return declarations
+
+
+def _qualified(name):
+    if name.startswith(f"{{{XLINK_NS}}}"):
+        return "xlink:" + _local(name)
+    return name
+
+
+def _children(element):
+    return [_markup(child) for child in element]
+
+
+def _markup(element):
+    # The tail belongs to the parent; it is not part of the element.
+    tail, element.tail = element.tail, None
+    try:
+        return ET.tostring(element, encoding="unicode")
+    finally:
+        element.tail = tail
+
+
+def _styles(root):
+    return [
+        element.text or ""
+        for element in root.iter(f"{{{SVG_NS}}}style")
+        if not element.get("id")
+    ]
@@ -0,0 +1,61 @@
+"""
+Batch export benchmark.
+
+Exports near-identical line and scatter figures with
+:func:`JVG.batch_export`, replaying a small edit log on every figure, and
+reports the wall time, the throughput and the per-figure time for growing
+numbers of worker processes.
+
+Usage
+-----
+    python benchmarks/bench_batch.py [figures] [workers...]
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from JVG.batch import batch_export
+from JVG.edits import EditLog
+
+DEFAULT_FIGURES = 64
+LOG = EditLog(
+    [
+        {"op": "recolor", "ids": ["line2d_13"], "color": "#d62728"},
+        {"op": "move", "ids": ["text_1"], "dx": 0, "dy": -5},
+    ]
+)
+
+
+def figure(seed):
+    rng = np.random.default_rng(seed)
+    fig = Figure()
+    ax = fig.subplots()
+    ax.plot(np.cumsum(rng.standard_normal(500)))
+    ax.scatter(*rng.random((2, 2000)) * 500, s=2)
+    ax.set_title(f"run {seed}")
+
+    return fig
+
+
+def main(count=DEFAULT_FIGURES, *workers):
+    workers = workers or sorted({0, 1, 2, os.cpu_count() or 1})
+    figures = [figure(seed) for seed in range(count)]
+
+    print(f"{'workers':>8} {'wall s':>8} {'fig/s':>8} {'median ms':>10} {'max ms':>8}")
+    for n in workers:
+        with tempfile.TemporaryDirectory() as directory:
+            report = batch_export(figures, LOG, directory=directory, workers=n)
+
+        times = sorted(result.seconds * 1000 for result in report.results)
+        print(
+            f"{n:>8} {report.seconds:>8.2f} {report.throughput:>8.2f} "
+            f"{times[len(times) // 2]:>10.1f} {times[-1]:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
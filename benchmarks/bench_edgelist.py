@@ -0,0 +1,101 @@
+"""
+Building the NxEditor payload from an edge list with and without NetworkX.
+
+For every size a random edge list is saved as ``.npy`` and, in a fresh
+interpreter, turned into the binary payload served to the page either by
+building an ``nx.Graph`` first or with :meth:`JVG.JVG.NxEditor.from_edgelist`,
+which memory-maps the file. Wall time and the peak resident set size of
+the interpreter are reported.
+
+Usage
+-----
+    python benchmarks/bench_edgelist.py [edges ...]
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+NETWORKX_LIMIT = 2_000_000
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_one(mode, path):
+    from JVG import JVG
+
+    before = peak_rss_mb()
+    start = time.perf_counter()
+
+    if mode == "networkx":
+        import networkx as nx
+
+        graph = nx.Graph()
+        graph.add_edges_from(np.load(path).tolist())
+        editor = JVG.NxEditor(graph, cache=False)
+    else:
+        editor = JVG.NxEditor.from_edgelist(path, cache=False)
+
+    data = editor.to_payload().to_bytes()
+    elapsed = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "seconds": elapsed,
+                "rss_mb": peak_rss_mb() - before,
+                "payload_mb": len(data) / 2**20,
+            }
+        )
+    )
+
+
+def measure(mode, path):
+    result = subprocess.run(
+        [sys.executable, __file__, "--one", mode, path],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(sizes):
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'edges':>10} {'nx time [s]':>12} {'nx RSS +MB':>11} "
+        f"{'array time [s]':>15} {'array RSS +MB':>14} {'payload MB':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for edges in sizes:
+            path = os.path.join(directory, f"edges-{edges}.npy")
+            np.save(path, rng.integers(0, max(edges // 5, 1), (edges, 2)))
+
+            arrays = measure("arrays", path)
+            if edges <= NETWORKX_LIMIT:
+                graph = measure("networkx", path)
+                nx_columns = f"{graph['seconds']:>12.2f} {graph['rss_mb']:>11.1f}"
+            else:
+                nx_columns = f"{'skipped':>12} {'':>11}"
+
+            print(
+                f"{edges:>10} {nx_columns} {arrays['seconds']:>15.2f} "
+                f"{arrays['rss_mb']:>14.1f} {arrays['payload_mb']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--one"]:
+        run_one(sys.argv[2], sys.argv[3])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
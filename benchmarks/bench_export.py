@@ -0,0 +1,65 @@
+"""
+Compact export benchmark.
+
+Renders scatter plots of growing size with :class:`JVG.JVG.MplEditor` in the
+default and in the compact mode and reports, for both, the number of SVG
+elements, the size of the document and the time taken to render and
+normalize it.
+
+Usage
+-----
+    python benchmarks/bench_export.py [points...]
+"""
+
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from JVG import JVG
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def export(fig, compact):
+    editor = JVG.MplEditor(fig, compact=compact)
+
+    start = time.perf_counter()
+    editor.svg_document()
+    elapsed = time.perf_counter() - start
+
+    return editor.stats.elements, editor.stats.bytes, elapsed
+
+
+def main(*sizes):
+    sizes = sizes or DEFAULT_SIZES
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'points':>8} {'elements':>9} {'MB':>7} {'ms':>8} "
+        f"{'compact elements':>17} {'MB':>7} {'ms':>8}"
+    )
+    for size in sizes:
+        fig, ax = plt.subplots()
+        ax.scatter(*rng.random((2, size)), c=rng.random(size), s=4)
+        ax.scatter(*rng.random((2, size // 10)), marker="x")
+        ax.set_title(f"{size} points")
+
+        vector = export(fig, compact=False)
+        compact = export(fig, compact=True)
+
+        print(
+            f"{size:>8} {vector[0]:>9} {vector[1] / 2**20:>7.2f} "
+            f"{vector[2] * 1000:>8.1f} {compact[0]:>17} "
+            f"{compact[1] / 2**20:>7.2f} {compact[2] * 1000:>8.1f}"
+        )
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
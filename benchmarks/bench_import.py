@@ -0,0 +1,54 @@
+"""
+Import-time benchmark of the JVG package.
+
+Runs ``python -X importtime`` in fresh interpreters and reports the median
+cumulative import time of ``import JVG`` and ``from JVG import JVG``. The
+script exits with a non-zero status when a median exceeds the target.
+
+Usage
+-----
+    python benchmarks/bench_import.py [repeats] [target_ms]
+"""
+
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "JVG": "import JVG",
+    "JVG.JVG": "from JVG import JVG",
+}
+
+
+def import_time(statement, module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1000
+
+    raise RuntimeError(f"{module} was not imported by {statement!r}")
+
+
+def main(repeats=10, target_ms=50):
+    failed = False
+
+    for module, statement in STATEMENTS.items():
+        times = [import_time(statement, module) for _ in range(repeats)]
+        median = statistics.median(times)
+        status = "ok" if median <= target_ms else "SLOW"
+        failed |= median > target_ms
+
+        print(f"{statement:<22} {median:8.2f} ms (target {target_ms} ms) {status}")
+
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,86 @@
+"""
+Live updates pushed to an open NxEditor page.
+
+A growing graph is streamed edge by edge with
+:class:`JVG.live.GraphSession` while a client reads the Server-Sent Events
+stream of the page. For every batching interval the report gives the
+number of edges pushed per second until the client received all of them,
+the number of events and the bytes sent per edge.
+
+Usage
+-----
+    python benchmarks/bench_live.py [edges ...]
+"""
+
+import json
+import sys
+import threading
+import time
+import urllib.request
+import webbrowser
+
+import networkx as nx
+import numpy as np
+
+from JVG import JVG
+
+DEFAULT_SIZES = (10_000, 100_000)
+INTERVALS = (0, 0.01, 0.05)
+
+
+def read_events(url, edges, counts):
+    with urllib.request.urlopen(url) as response:
+        received = 0
+        for line in response:
+            if line.startswith(b"data: "):
+                counts["events"] += 1
+                counts["bytes"] += len(line)
+                delta = json.loads(line[6:])
+                received += sum(
+                    len(operation["edges"])
+                    for operation in delta["ops"]
+                    if operation["op"] == "add_edges"
+                )
+                if received >= edges:
+                    return
+
+
+def main(*sizes):
+    sizes = sizes or DEFAULT_SIZES
+    rng = np.random.default_rng(0)
+
+    urls = []
+    webbrowser.open = urls.append
+
+    print(f"{'edges':>8} {'interval':>9} {'edges/s':>10} {'events':>7} {'B/edge':>7}")
+    for size in sizes:
+        pairs = rng.integers(0, size // 4, (size, 2)).tolist()
+
+        for interval in INTERVALS:
+            editor = JVG.NxEditor(nx.Graph(), cache=False)
+            session = editor.edit()
+            session.interval = interval
+
+            counts = {"events": 0, "bytes": 0}
+            reader = threading.Thread(
+                target=read_events,
+                args=(urls[-1].replace("editor.html", "events"), size, counts),
+            )
+            reader.start()
+
+            start = time.perf_counter()
+            for u, v in pairs:
+                session.add_edges([(u, v)])
+            session.flush()
+            reader.join()
+            elapsed = time.perf_counter() - start
+            editor.close()
+
+            print(
+                f"{size:>8} {interval:>9} {size / elapsed:>10.0f} "
+                f"{counts['events']:>7} {counts['bytes'] / size:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,69 @@
+"""
+Level-of-detail payloads of NxEditor.
+
+For every size a random graph with spatial locality is clustered on a grid with
+:class:`JVG.lod.GraphAggregation`. The report compares the full payload the
+page would load with the top-level payload of the super-nodes, and gives
+the time to aggregate the graph and the mean time to expand one cluster.
+
+Usage
+-----
+    python benchmarks/bench_lod.py [nodes ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from JVG.lod import GraphAggregation, cluster_labels
+from JVG.payload import GraphPayload
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+EDGES_PER_NODE = 4
+EXPANSIONS = 100
+LONG_RANGE = 0.01
+
+
+def main(*sizes):
+    sizes = sizes or DEFAULT_SIZES
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'nodes':>9} {'full MB':>8} {'clusters':>9} {'top MB':>7} "
+        f"{'aggregate s':>12} {'expand ms':>10}"
+    )
+    for size in sizes:
+        # Nodes on a jittered square lattice, mostly linked to lattice
+        # neighbours with a few long-range edges, as in real-world graphs.
+        side = int(np.sqrt(size))
+        sources = rng.integers(0, size, EDGES_PER_NODE * size)
+        offsets = rng.integers(-2, 3, (2, len(sources)))
+        targets = (sources + offsets[0] + side * offsets[1]) % size
+        far = rng.random(len(sources)) < LONG_RANGE
+        targets[far] = rng.integers(0, size, far.sum())
+
+        payload = GraphPayload.from_arrays(sources, targets, nodes=np.arange(size))
+        lattice = np.column_stack((np.arange(size) % side, np.arange(size) // side))
+        payload.positions = lattice + rng.random((size, 2))
+
+        start = time.perf_counter()
+        aggregation = GraphAggregation(payload, cluster_labels("grid", None, payload))
+        top = aggregation.top_payload().to_bytes()
+        aggregate = time.perf_counter() - start
+
+        clusters = rng.integers(0, aggregation.number_of_clusters, EXPANSIONS)
+        start = time.perf_counter()
+        for cluster in clusters.tolist():
+            aggregation.expand_resource(str(cluster).encode())
+        expand = (time.perf_counter() - start) / EXPANSIONS
+
+        print(
+            f"{size:>9} {len(payload.to_bytes()) / 2**20:>8.2f} "
+            f"{aggregation.number_of_clusters:>9} {len(top) / 2**20:>7.2f} "
+            f"{aggregate:>12.2f} {expand * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
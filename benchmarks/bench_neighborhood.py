@@ -0,0 +1,66 @@
+"""
+Ego-network queries of NxEditor.
+
+For every size a random graph is indexed with
+:class:`JVG.neighborhood.NeighborhoodIndex`. The report gives the time to
+build the index, the mean time and response size of two-hop queries with
+a degree cap around random seeds, and the size of the full payload the
+page would otherwise load.
+
+Usage
+-----
+    python benchmarks/bench_neighborhood.py [nodes ...]
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+
+from JVG.neighborhood import NeighborhoodIndex
+from JVG.payload import GraphPayload
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+EDGES_PER_NODE = 4
+QUERIES = 100
+MAX_DEGREE = 50
+
+
+def main(*sizes):
+    sizes = sizes or DEFAULT_SIZES
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'nodes':>9} {'full MB':>8} {'index s':>8} {'query ms':>9} "
+        f"{'nodes/query':>12} {'KB/query':>9}"
+    )
+    for size in sizes:
+        # Preferential attachment-like endpoints give a few large hubs.
+        sources = rng.integers(0, size, EDGES_PER_NODE * size)
+        targets = (size * rng.random(EDGES_PER_NODE * size) ** 3).astype(np.int64)
+        payload = GraphPayload.from_arrays(sources, targets, nodes=np.arange(size))
+
+        start = time.perf_counter()
+        index = NeighborhoodIndex(payload)
+        build = time.perf_counter() - start
+
+        seeds = rng.integers(0, size, QUERIES)
+        reached = sent = 0
+        start = time.perf_counter()
+        for seed in seeds.tolist():
+            query = {"seeds": [seed], "hops": 2, "max_degree": MAX_DEGREE}
+            response = index.query_resource(json.dumps(query).encode())
+            reached += len(json.loads(bytes(response.data))["nodes"])
+            sent += len(response.data)
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"{size:>9} {len(payload.to_bytes()) / 2**20:>8.2f} {build:>8.2f} "
+            f"{elapsed / QUERIES * 1000:>9.1f} {reached / QUERIES:>12.0f} "
+            f"{sent / QUERIES / 1024:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
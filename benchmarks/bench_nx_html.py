@@ -0,0 +1,85 @@
+"""
+Wall time and peak memory of opening an NxEditor against graph size.
+
+Every graph size is measured in a fresh interpreter so that the peak
+resident set size is not inflated by previous runs. The reported peak RSS
+increase is measured relative to the process state after the graph was
+built. The sizes of the editor page and of the binary graph payload
+served to the browser are reported as well. The browser is not launched.
+
+Usage
+-----
+    python benchmarks/bench_nx_html.py [edges ...]
+"""
+
+import json
+import resource
+import subprocess
+import sys
+import time
+
+DEFAULT_SIZES = [10_000, 100_000, 300_000]
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_one(edges):
+    import webbrowser
+
+    import networkx as nx
+
+    from JVG import JVG
+
+    webbrowser.open = lambda url: None
+
+    graph = nx.gnm_random_graph(edges // 5, edges, seed=0)
+    editor = JVG.NxEditor(graph)
+    before = peak_rss_mb()
+
+    start = time.perf_counter()
+    editor.edit()
+    elapsed = time.perf_counter() - start
+
+    html = editor.server.resource(editor.session_id, "editor.html")
+    payload = editor.server.resource(editor.session_id, "graph.bin")
+    editor.close()
+
+    print(
+        json.dumps(
+            {
+                "edges": edges,
+                "seconds": elapsed,
+                "rss_mb": peak_rss_mb() - before,
+                "html_mb": html.data.nbytes / 2**20,
+                "payload_mb": payload.data.nbytes / 2**20,
+            }
+        )
+    )
+
+
+def main(sizes):
+    print(
+        f"{'edges':>10} {'time [s]':>10} {'peak RSS +MB':>14} "
+        f"{'HTML MB':>10} {'payload MB':>12}"
+    )
+    for edges in sizes:
+        result = subprocess.run(
+            [sys.executable, __file__, "--one", str(edges)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        row = json.loads(result.stdout.strip().splitlines()[-1])
+        print(
+            f"{row['edges']:>10} {row['seconds']:>10.2f} "
+            f"{row['rss_mb']:>14.1f} {row['html_mb']:>10.2f} {row['payload_mb']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--one"]:
+        run_one(int(sys.argv[2]))
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
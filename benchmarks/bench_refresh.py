@@ -0,0 +1,66 @@
+"""
+Refresh of an open MplEditor page after changing the figure.
+
+For every number of lines, the colour of one line is changed and the page is
+updated with :meth:`JVG.JVG.MplEditor.refresh`. The report gives the time of
+the refresh and the bytes it sends, next to the size of the full document
+that reloading the page would transfer.
+
+Usage
+-----
+    python benchmarks/bench_refresh.py [lines ...]
+"""
+
+import json
+import sys
+import time
+import webbrowser
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from JVG import JVG
+from JVG.svgproc import diff_svg
+
+DEFAULT_SIZES = (10, 100, 1000)
+POINTS = 100
+
+
+def main(*sizes):
+    sizes = sizes or DEFAULT_SIZES
+    rng = np.random.default_rng(0)
+
+    urls = []
+    webbrowser.open = urls.append
+
+    print(f"{'lines':>6} {'full KB':>8} {'refresh ms':>11} {'sent B':>7}")
+    for size in sizes:
+        fig, ax = plt.subplots()
+        lines = ax.plot(rng.random((POINTS, size)))
+
+        editor = JVG.MplEditor(fig)
+        editor.edit()
+        before = editor.svg_document()
+
+        lines[size // 2].set_color("black")
+        start = time.perf_counter()
+        editor.refresh()
+        elapsed = time.perf_counter() - start
+
+        after = editor.svg_document()
+        sent = json.dumps({"ops": diff_svg(before, after)}, separators=(",", ":"))
+        editor.close()
+        plt.close(fig)
+
+        print(
+            f"{size:>6} {len(after) / 1024:>8.1f} {elapsed * 1000:>11.1f} "
+            f"{len(sent):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
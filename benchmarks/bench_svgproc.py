@@ -0,0 +1,63 @@
+"""
+SVG normalization benchmark.
+
+Renders scatter plots of growing size and reports the size of the raw SVG
+and the time Matplotlib takes to render it, the time
+:func:`JVG.svgproc.normalize_svg` takes, and the size of the normalized
+document with full and with rounded coordinates.
+
+Usage
+-----
+    python benchmarks/bench_svgproc.py [points...]
+"""
+
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from JVG import JVG
+from JVG.svgproc import normalize_svg
+
+DEFAULT_SIZES = (1_000, 10_000, 50_000)
+
+
+def main(*sizes):
+    sizes = sizes or DEFAULT_SIZES
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'points':>8} {'raw MB':>8} {'render ms':>10} {'norm ms':>9} "
+        f"{'norm MB':>8} {'2 dec MB':>9}"
+    )
+    for size in sizes:
+        fig, ax = plt.subplots()
+        ax.scatter(*rng.random((2, size)))
+        for line in rng.random((size // 10, 2, 8)):
+            ax.plot(*line, linewidth=0.5)
+        editor = JVG.MplEditor(fig)
+
+        start = time.perf_counter()
+        raw = editor.render_svg()
+        render = time.perf_counter() - start
+
+        start = time.perf_counter()
+        normalized = normalize_svg(raw)
+        elapsed = time.perf_counter() - start
+        rounded = normalize_svg(raw, precision=2)
+
+        print(
+            f"{size:>8} {len(raw) / 2**20:>8.2f} {render * 1000:>10.1f} "
+            f"{elapsed * 1000:>9.1f} {len(normalized) / 2**20:>8.2f} "
+            f"{len(rounded) / 2**20:>9.2f}"
+        )
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
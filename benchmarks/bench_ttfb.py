@@ -0,0 +1,80 @@
+"""
+Time-to-first-byte benchmark for the MplEditor page.
+
+Measures how long :meth:`JVG.JVG.MplEditor.edit` takes to return for the
+first and for subsequent figures of a process, and how long the browser
+would wait for the first byte of the editor page and of the exported SVG.
+The browser itself is not launched.
+
+Usage
+-----
+    python benchmarks/bench_ttfb.py [repeats] [figures]
+"""
+
+import http.client
+import statistics
+import sys
+import time
+import urllib.parse
+import webbrowser
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+from JVG import JVG
+
+
+def ttfb(url):
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port)
+    connection.request("GET", path)
+    response = connection.getresponse()
+    first_byte = time.perf_counter() - start
+    response.read()
+    connection.close()
+
+    return first_byte
+
+
+def main(repeats=20, figures=10):
+    opened = []
+    webbrowser.open = opened.append
+
+    editors = []
+    edit_times = []
+    for _ in range(figures):
+        fig, ax = plt.subplots()
+        ax.scatter(range(1000), range(1000))
+        editor = JVG.MplEditor(fig)
+
+        start = time.perf_counter()
+        editor.edit()
+        edit_times.append(time.perf_counter() - start)
+        editors.append(editor)
+
+    page_url = opened[-1]
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(page_url).query)
+    svg_url = urllib.parse.urljoin(page_url, query["graph"][0])
+
+    page = [ttfb(page_url) for _ in range(repeats)]
+    svg = [ttfb(svg_url) for _ in range(repeats)]
+
+    print(f"first edit() returned after {edit_times[0] * 1000:9.2f} ms")
+    if figures > 1:
+        rest = statistics.median(edit_times[1:])
+        print(f"next edit() (median)        {rest * 1000:9.2f} ms")
+    print(f"editor page TTFB (median)   {statistics.median(page) * 1000:9.2f} ms")
+    print(f"figure SVG TTFB (median)    {statistics.median(svg) * 1000:9.2f} ms")
+
+    for editor in editors:
+        editor.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
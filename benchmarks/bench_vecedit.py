@@ -0,0 +1,183 @@
+"""
+Browser benchmark of loading, edits, undo and redo in the MplEditor page.
+
+Serves synthetic SVG documents with the given numbers of paths (about 240
+bytes each, so 100000 paths are a 24 MB document), opens a driver page in
+the system browser and reports, against the document size:
+
+- the time to interactive, from navigating the editor frame until the
+  figure is loaded and the next frame is painted,
+- the median milliseconds of a color edit, an undo and a redo,
+- the median milliseconds of selecting an element with a click after the
+  undo and redo rounds,
+- the JavaScript heap size where the browser reports it.
+
+Usage
+-----
+    python benchmarks/bench_vecedit.py [sizes...]
+"""
+
+import json
+import sys
+import threading
+import webbrowser
+
+import numpy as np
+
+from JVG.server import EditorServer, MemoryResource
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+EDITS = 50
+
+DRIVER = """<!DOCTYPE html>
+<html>
+<body>
+<pre id="log">running...</pre>
+<iframe id="frame" width="1200" height="800"></iframe>
+<script>
+const sizes = %(sizes)s;
+const edits = %(edits)d;
+const frame = document.getElementById('frame');
+const log = document.getElementById('log');
+
+function median(values) {
+    const sorted = [...values].sort((a, b) => a - b);
+    return sorted[Math.floor(sorted.length / 2)];
+}
+
+function time(action) {
+    const start = performance.now();
+    action();
+    return performance.now() - start;
+}
+
+async function loadEditor(size) {
+    const start = performance.now();
+    const loaded = new Promise(resolve => frame.onload = resolve);
+    frame.src = `vecedit.html?graph=figure-${size}.svg`;
+    await loaded;
+
+    const doc = frame.contentDocument;
+    while (!doc.getElementById('svg-editor').style.width) {
+        await new Promise(resolve => setTimeout(resolve, 5));
+    }
+    await new Promise(resolve => frame.contentWindow.requestAnimationFrame(resolve));
+
+    return { doc, interactive: performance.now() - start };
+}
+
+async function run() {
+    const results = [];
+
+    for (const size of sizes) {
+        const { doc, interactive } = await loadEditor(size);
+        const win = frame.contentWindow;
+        const paths = doc.querySelectorAll('#svg-editor path');
+        const click = id => time(() => doc.getElementById(id).click());
+        const edit = [], undo = [], redo = [], select = [];
+
+        for (let i = 0; i < edits; i++) {
+            win.clearSelection();
+            win.selectElement(paths[i * 7919 %% paths.length]);
+            edit.push(click('apply-color'));
+        }
+        for (let i = 0; i < edits; i++) {
+            undo.push(click('undo'));
+        }
+        for (let i = 0; i < edits; i++) {
+            redo.push(click('redo'));
+        }
+        for (let i = 0; i < edits; i++) {
+            const path = paths[i * 104729 %% paths.length];
+            select.push(time(() => path.dispatchEvent(
+                new win.MouseEvent('click', { bubbles: true })
+            )));
+        }
+
+        results.push({
+            size,
+            interactive,
+            select: median(select),
+            edit: median(edit),
+            undo: median(undo),
+            redo: median(redo),
+            heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+        });
+        log.textContent = JSON.stringify(results, null, 1);
+    }
+
+    await fetch('results', { method: 'POST', body: JSON.stringify(results) });
+}
+
+run();
+</script>
+</body>
+</html>
+"""
+
+
+def synthetic_svg(paths, points=10, seed=0):
+    rng = np.random.default_rng(seed)
+    coordinates = rng.random((paths, points, 2)) * 800
+
+    parts = [
+        '<svg xmlns="http://www.w3.org/2000/svg" width="800" height="800" '
+        'viewBox="0 0 800 800"><g id="figure_1">'
+    ]
+    for i, line in enumerate(coordinates):
+        d = "M " + " L ".join(f"{x:.2f} {y:.2f}" for x, y in line)
+        parts.append(
+            f'<g id="line2d_{i}"><path d="{d}" '
+            'style="fill:none;stroke:#1f77b4;stroke-width:1.5"/></g>'
+        )
+    parts.append("</g></svg>")
+
+    return "".join(parts).encode("utf-8")
+
+
+def main(*sizes):
+    sizes = sizes or DEFAULT_SIZES
+    done = threading.Event()
+    results = []
+
+    def receive(body):
+        results.extend(json.loads(body))
+        done.set()
+
+    documents = {size: synthetic_svg(size) for size in sizes}
+    resources = {
+        f"figure-{size}.svg": MemoryResource(data, "image/svg+xml")
+        for size, data in documents.items()
+    }
+    resources["bench.html"] = MemoryResource(
+        (DRIVER % {"sizes": json.dumps(list(sizes)), "edits": EDITS}).encode(),
+        "text/html; charset=utf-8",
+    )
+
+    server = EditorServer().start()
+    session_id = server.register(resources, {"results": receive})
+    url = server.session_url(session_id, "bench.html")
+    print(f"benchmark page: {url}")
+    webbrowser.open(url)
+
+    if not done.wait(timeout=1800):
+        sys.exit("no results received from the browser")
+
+    print(
+        f"{'paths':>8} {'SVG MB':>8} {'TTI ms':>9} {'edit ms':>9} {'undo ms':>9} "
+        f"{'redo ms':>9} {'click ms':>9} {'heap MB':>9}"
+    )
+    for row in results:
+        megabytes = len(documents[row["size"]]) / 2**20
+        heap = "n/a" if row["heap"] is None else f"{row['heap'] / 2**20:.1f}"
+        print(
+            f"{row['size']:>8} {megabytes:>8.1f} {row['interactive']:>9.1f} "
+            f"{row['edit']:>9.2f} {row['undo']:>9.2f} {row['redo']:>9.2f} "
+            f"{row['select']:>9.2f} {heap:>9}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
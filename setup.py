@@ -21,9 +21,13 @@ setup(
         include_package_data=True, 
         install_requires=[
                 "matplotlib",
-                "pyvis",
-                "networkx"
+                "networkx",
+                "numpy",
+                "jinja2"
             ], 
+        extras_require={
+                "png": ["cairosvg"],
+            },
         keywords=['vector', 'graph', 'svg', 'png', 'mpl', 'jpeg'],
         license = 'MIT',
         classifiers = [
@@ -33,7 +37,7 @@ setup(
             "Operating System :: Microsoft :: Windows",
             "Operating System :: POSIX :: Linux",
         ],
-        python_requires='>=3.7',
+        python_requires='>=3.9',
 )
 
 
@@ -1,10 +1,37 @@
+import asyncio
+import concurrent.futures
+import gzip
+import http.client
+import json
 import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
 
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
 import pytest
 
 from JVG import JVG
+from JVG.batch import batch_export
+from JVG.cache import GraphCache
+from JVG.edits import EditLog
+from JVG.payload import GraphPayload
+from JVG.server import EditorServer
+from JVG.svgproc import normalize_svg
+
+
+@pytest.fixture(autouse=True)
+def cache_directory(monkeypatch, tmp_path):
+    directory = tmp_path / "cache"
+    monkeypatch.setenv("JVG_CACHE_DIR", str(directory))
+
+    return directory
 
 
 def test_mpl_editor_initialization():
@@ -13,7 +40,6 @@ def test_mpl_editor_initialization():
 
     assert editor.figure is fig
     assert os.path.isdir(editor._package_path)
-    assert isinstance(editor._cwd, str)
 
 
 def test_nx_editor_initialization():
@@ -27,4 +53,975 @@ def test_nx_editor_initialization():
 
     assert editor.network is G
     assert os.path.isdir(editor._package_path)
-    assert isinstance(editor._cwd, str)
+
+
+def test_mpl_editor_edit_waits_for_server(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    fig, ax = plt.subplots()
+    ax.plot([1, 2, 3])
+    editor = JVG.MplEditor(fig)
+
+    start = time.perf_counter()
+    editor.edit()
+    elapsed = time.perf_counter() - start
+
+    assert editor.ready.is_set()
+    assert elapsed < 5
+    assert len(opened) == 1
+
+    with urllib.request.urlopen(opened[0]) as response:
+        assert response.status == 200
+
+    editor.close()
+
+
+def test_editors_share_one_server(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    editors = []
+    for n in range(3):
+        fig, ax = plt.subplots()
+        ax.set_title(f"figure-{n}")
+        editor = JVG.MplEditor(fig)
+        editor.edit()
+        editors.append(editor)
+
+    assert len({editor.server for editor in editors}) == 1
+    assert len(set(opened)) == 3
+
+    bodies = set()
+    for editor in editors:
+        url = editor.server.session_url(editor.session_id, "figure.svg")
+        with urllib.request.urlopen(url) as response:
+            bodies.add(response.read())
+
+        editor.close()
+
+    assert len(bodies) == 3
+
+
+def test_editor_server_start_shutdown():
+    server = EditorServer(port=0)
+    server.start()
+    port = server.port
+
+    assert server.ready.is_set()
+    assert port != 0
+    with urllib.request.urlopen(f"{server.url}/vecedit.html") as response:
+        assert response.status == 200
+
+    server.shutdown()
+
+    assert not server.ready.is_set()
+    with pytest.raises(OSError):
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/vecedit.html", timeout=1)
+
+
+def test_mpl_editor_serves_svg_from_memory(monkeypatch):
+    monkeypatch.setattr(JVG.webbrowser, "open", lambda url: None)
+    before = set(os.listdir(os.path.dirname(JVG.__file__)))
+
+    fig, ax = plt.subplots()
+    ax.scatter(range(500), range(500))
+    editor = JVG.MplEditor(fig)
+    editor.edit()
+
+    assert set(os.listdir(os.path.dirname(JVG.__file__))) == before
+
+    url = urllib.parse.urlsplit(
+        editor.server.session_url(editor.session_id, "figure.svg")
+    )
+    connection = http.client.HTTPConnection(url.hostname, url.port)
+
+    connection.request("GET", url.path, headers={"Accept-Encoding": "gzip"})
+    response = connection.getresponse()
+    body = response.read()
+    etag = response.getheader("ETag")
+
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert int(response.getheader("Content-Length")) == len(body)
+    assert gzip.decompress(body).startswith(b"<?xml")
+
+    connection.request(
+        "GET", url.path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    response = connection.getresponse()
+    response.read()
+
+    assert response.status == 304
+
+    connection.close()
+    editor.close()
+
+
+def test_editors_do_not_change_working_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(JVG.webbrowser, "open", lambda url: None)
+    monkeypatch.chdir(tmp_path)
+
+    figures = []
+    for n in range(8):
+        fig, ax = plt.subplots()
+        ax.plot(range(n + 2))
+        figures.append(fig)
+
+    def open_editor(fig):
+        editor = JVG.MplEditor(fig)
+        editor.edit()
+        editor.close()
+
+    def relative_io(n):
+        for i in range(50):
+            assert os.getcwd() == str(tmp_path)
+            with open(f"io_{n}_{i}.txt", "w") as file:
+                file.write(str(i))
+        return n
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        editors = [pool.submit(open_editor, fig) for fig in figures]
+        writers = [pool.submit(relative_io, n) for n in range(4)]
+        for future in editors + writers:
+            future.result()
+
+    assert os.getcwd() == str(tmp_path)
+    assert len(list(tmp_path.glob("io_*.txt"))) == 4 * 50
+
+
+def test_package_import_is_lazy_and_silent():
+    code = (
+        "import sys, JVG; "
+        "print(sorted(m for m in ('matplotlib', 'networkx', 'pyvis', 'tkinter', "
+        "'pkg_resources', 'http.server') if m in sys.modules))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=root,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
+
+    import JVG as package
+
+    assert package.MplEditor is JVG.MplEditor
+    assert package.NxEditor is JVG.NxEditor
+
+
+def test_nx_editor_edit_is_headless(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+    monkeypatch.delenv("DISPLAY", raising=False)
+
+    editor = JVG.NxEditor(nx.path_graph(5))
+
+    editor.edit()
+    with urllib.request.urlopen(opened[-1]) as response:
+        html = response.read().decode("utf-8")
+
+    assert "80vh" in html and "99vw" in html
+    assert html.count("font-awesome") == 1
+    assert "function removeSelectedNodes" in html
+    assert html.count('id="export-worker"') == 1
+    assert "svgContent +=" not in html
+
+    editor.edit(width=800, height="600px")
+    with urllib.request.urlopen(opened[-1]) as response:
+        html = response.read().decode("utf-8")
+
+    assert "800px" in html and "600px" in html
+    assert len(opened) == 2
+
+    editor.close()
+
+
+def test_nx_editor_serves_graph_payload(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    G = nx.DiGraph()
+    G.add_node("a", size=20, color="red", title="first")
+    G.add_node("b")
+    G.add_edge("a", "b", weight=3)
+    G.add_edge("b", "c")
+
+    editor = JVG.NxEditor(G)
+    editor.edit()
+
+    with urllib.request.urlopen(
+        urllib.parse.urljoin(opened[-1], "graph.bin")
+    ) as response:
+        payload = GraphPayload.from_bytes(response.read())
+
+    assert payload.labels == ["a", "b", "c"]
+    assert payload.directed
+    assert payload.sizes.tolist() == [20, 10, 10]
+    assert list(payload.palette[payload.colors]) == ["red", "#97c2fc", "#97c2fc"]
+    assert payload.titles == ["first", "", ""]
+    assert payload.sources.tolist() == [0, 1]
+    assert payload.targets.tolist() == [1, 2]
+    assert payload.widths.tolist() == [3, 1]
+    assert "weight" in G.edges["a", "b"] and "size" not in G.nodes["b"]
+
+    editor.close()
+
+
+def test_nx_editor_precomputed_layout(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    G = nx.cycle_graph(30)
+    editor = JVG.NxEditor(G)
+
+    payload = editor.to_payload(layout="force")
+    assert payload.positions.shape == (30, 2)
+    assert (
+        JVG.NxEditor(nx.cycle_graph(30)).to_payload("force").positions
+        is payload.positions
+    )
+
+    payload = editor.to_payload(layout=nx.circular_layout)
+    distances = np.hypot(*payload.positions.T)
+    assert np.allclose(distances, distances[0], rtol=1e-3)
+
+    editor.edit(layout=nx.circular_layout)
+    with urllib.request.urlopen(opened[-1]) as response:
+        html = response.read().decode("utf-8")
+    with urllib.request.urlopen(
+        urllib.parse.urljoin(opened[-1], "graph.bin")
+    ) as response:
+        served = GraphPayload.from_bytes(response.read())
+
+    assert "let physicsEnabled = false;" in html
+    assert np.allclose(served.positions, payload.positions)
+
+    editor.close()
+
+
+def test_nx_editor_reuses_cached_payload_and_positions(monkeypatch, cache_directory):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    G = nx.path_graph(4)
+    editor = JVG.NxEditor(G)
+    editor.edit()
+
+    with urllib.request.urlopen(opened[-1]) as response:
+        assert "let physicsEnabled = true;" in response.read().decode("utf-8")
+
+    def post_positions(positions):
+        request = urllib.request.Request(
+            urllib.parse.urljoin(opened[-1], "positions"),
+            data=np.array(positions, dtype="<f4").tobytes(),
+            method="POST",
+        )
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 204
+
+    # Without earlier positions, deleted nodes would have none.
+    post_positions([0, 0, 1, 1, 2, 2, np.nan, np.nan])
+    assert len(os.listdir(cache_directory)) == 1
+
+    post_positions([5, 5, 1, 1, 2, 2, 3, 3])
+    post_positions([0, 0, 1, 1, 2, 2, np.nan, np.nan])
+
+    request = urllib.request.Request(
+        urllib.parse.urljoin(opened[-1], "positions"), data=b"\0" * 4, method="POST"
+    )
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request)
+    assert error.value.code == 400
+    editor.close()
+
+    def convert(graph):
+        raise AssertionError("the cached payload was not used")
+
+    monkeypatch.setattr(GraphPayload, "from_networkx", convert)
+
+    editor = JVG.NxEditor(nx.path_graph(4))
+    editor.edit()
+
+    with urllib.request.urlopen(opened[-1]) as response:
+        assert "let physicsEnabled = false;" in response.read().decode("utf-8")
+    with urllib.request.urlopen(
+        urllib.parse.urljoin(opened[-1], "graph.bin")
+    ) as response:
+        served = GraphPayload.from_bytes(response.read())
+
+    assert served.positions.tolist() == [[0, 0], [1, 1], [2, 2], [3, 3]]
+    assert len(os.listdir(cache_directory)) == 2
+
+    editor.close()
+
+
+def test_graph_cache_evicts_least_recently_used(tmp_path):
+    cache = GraphCache(str(tmp_path), max_bytes=250)
+
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    os.utime(tmp_path / "a", (0, 0))
+    os.utime(tmp_path / "b", (1, 1))
+    assert cache.get("a") == b"a" * 100
+
+    cache.put("c", b"c" * 100)
+
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+
+    # Failed writes leave no temporary files behind.
+    (tmp_path / "d").mkdir()
+    cache.put("d", b"d")
+    with pytest.raises(TypeError):
+        cache.put("e", "not bytes")
+    assert sorted(os.listdir(tmp_path)) == ["a", "c", "d"]
+    assert cache.get("b") is None
+
+
+def test_mpl_editor_history_limit(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    fig, ax = plt.subplots()
+    editor = JVG.MplEditor(fig)
+
+    editor.edit(history_limit=8)
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(opened[-1]).query)
+    assert query == {
+        "graph": ["figure.svg"],
+        "events": ["events"],
+        "historyLimit": ["8"],
+    }
+
+    with urllib.request.urlopen(opened[-1]) as response:
+        assert b"new EditHistory(historyLimit)" in response.read()
+
+    editor.close()
+
+
+def test_normalize_svg_flattens_groups():
+    svg = b"""<svg xmlns="http://www.w3.org/2000/svg"
+        xmlns:xlink="http://www.w3.org/1999/xlink">
+     <defs>
+      <path id="marker" d="M 0 0 L 1 1"/>
+      <path id="unused" d="M 0 0"/>
+      <clipPath id="clip"><rect x="0" y="0" width="9" height="9"/></clipPath>
+     </defs>
+     <g id="line2d_1" transform="translate(10 20)" style="fill: red">
+      <g transform="scale(2)">
+       <path d="M 0.123456 1.5 L 2 3" clip-path="url(#clip)" style="stroke: blue"/>
+       <use xlink:href="#marker" x="1" y="1"/>
+      </g>
+     </g>
+    </svg>"""
+
+    root = ET.fromstring(normalize_svg(svg, precision=2))
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+
+    assert root.get("data-jvg-normalized") == "1"
+    assert root.find(".//svg:g", ns) is None
+
+    path, use = root.findall("svg:path", ns) + root.findall("svg:use", ns)
+    assert path.get("id") == "line2d_1" and use.get("id") == "line2d_1-1"
+    assert path.get("transform") == "translate(10 20) scale(2 2)"
+    assert path.get("style") == "fill: red;stroke: blue"
+    assert path.get("d") == "M 0.12 1.5 L 2 3"
+    assert path.get("clip-path") is None
+
+    defined = [element.get("id") for element in root.find("svg:defs", ns)]
+    assert defined == ["marker"]
+
+
+def test_mpl_editor_caches_normalized_document():
+    fig, ax = plt.subplots()
+    ax.plot(range(10))
+    editor = JVG.MplEditor(fig)
+
+    document = editor.svg_document()
+    assert b"data-jvg-normalized" in document and b"<g" not in document
+    assert editor.svg_document() is document
+
+    ax.plot(range(5))
+    assert editor.svg_document() is not document
+    assert JVG.MplEditor(fig, normalize=False).svg_document().count(b"<g") > 0
+
+
+def test_normalize_svg_deduplicates():
+    svg = b"""<svg xmlns="http://www.w3.org/2000/svg"
+        xmlns:xlink="http://www.w3.org/1999/xlink">
+     <defs><path id="C0_0_a" d="M 0 0 L 1 1"/></defs>
+     <use xlink:href="#C0_0_a" x="1" y="1" style="fill: red"/>
+     <defs><path id="C1_0_b" d="M 0 0 L 1 1"/></defs>
+     <use xlink:href="#C1_0_b" x="2" y="2" style="fill: red"/>
+     <path d="M 0 0 L 5 5 L 9 9" style="stroke: blue"/>
+     <path d="M 0 0 L 5 5 L 9 9" transform="translate(1 1)" style="fill: none"/>
+    </svg>"""
+
+    root = ET.fromstring(normalize_svg(svg, deduplicate=True))
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+    href = "{http://www.w3.org/1999/xlink}href"
+
+    uses = root.findall("svg:use", ns)
+    assert [use.get(href) for use in uses] == [
+        "#C0_0_a",
+        "#C0_0_a",
+        "#jvg-p0",
+        "#jvg-p0",
+    ]
+    assert uses[0].get("class") == uses[1].get("class") == "jvg-s0"
+    assert uses[2].get("style") == "stroke: blue"
+    assert uses[3].get("transform") == "translate(1 1)"
+    assert ".jvg-s0{fill: red}" in root.find(".//svg:style", ns).text
+    assert [path.get("id") for path in root.iterfind(".//svg:defs/svg:path", ns)] == [
+        "jvg-p0",
+        "C0_0_a",
+    ]
+
+
+def test_mpl_editor_compact_rasterizes_dense_artists():
+    fig, ax = plt.subplots()
+    points = ax.scatter(np.arange(5000), np.arange(5000))
+    ax.plot(range(10), "o-")
+    ax.set_title("title")
+
+    vector = JVG.MplEditor(fig).svg_document()
+    compact = JVG.MplEditor(fig, compact=True, raster_threshold=1000).svg_document()
+
+    assert b"<image" not in vector and compact.count(b"<image") == 1
+    assert compact.count(b"<use") < vector.count(b"<use") - 4000
+    assert b'id="text_1"' in compact and b'id="line2d_' in compact
+    assert not points.get_rasterized()
+
+    editor = JVG.MplEditor(fig, compact=True, raster_threshold=1000)
+    assert editor.stats is None
+    document = editor.svg_document()
+    stats = editor.stats
+    assert stats.bytes == len(document) < stats.rendered_bytes
+    assert stats.elements < stats.rendered_elements
+    assert (stats.rasterized_artists, stats.rasterized_elements) == (1, 5000)
+
+
+def test_edit_log_replays_svg_edits(tmp_path):
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    ax.plot([0, 1], [1, 0])
+    document = normalize_svg(JVG.MplEditor(fig, normalize=False).render_svg())
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+
+    log = EditLog(
+        [
+            {"op": "delete", "ids": ["line2d_14", "missing"]},
+            {"op": "move", "ids": ["line2d_13"], "dx": 5, "dy": -2},
+            {"op": "move", "ids": ["line2d_13"], "dx": 1, "dy": 0},
+            {"op": "scale", "ids": ["line2d_13"], "factor": 2},
+            {"op": "recolor", "ids": ["line2d_13"], "color": "#ff0000"},
+            {"op": "lower", "ids": ["line2d_13"]},
+            {"op": "crop", "viewBox": [0, 0, 100, 50]},
+        ]
+    )
+    log.save(tmp_path / "edits.json")
+    assert EditLog.load(tmp_path / "edits.json") == log
+
+    root = ET.fromstring(log.apply_svg(document))
+    line = root.find("svg:path[@id='line2d_13']", ns)
+
+    assert root.find("svg:path[@id='line2d_14']", ns) is None
+    assert root[0] is line
+    assert line.get("transform") == "translate(6, -2) scale(2)"
+    assert line.get("fill") == "#ff0000" and "stroke: #ff0000" in line.get("style")
+    assert root.get("viewBox") == "0 0 100 50"
+
+    with pytest.raises(ValueError):
+        EditLog.from_json(b'{"operations": [{"op": "explode"}]}')
+
+
+def test_edit_log_rejects_malformed_operations():
+    malformed = [
+        {"op": "delete"},
+        {"op": "delete", "ids": "line2d_13"},
+        {"op": "raise", "ids": [13]},
+        {"op": "move", "ids": ["line2d_13"]},
+        {"op": "move", "ids": ["line2d_13"], "dx": "5", "dy": 0},
+        {"op": "scale", "ids": ["line2d_13"], "factor": True},
+        {"op": "recolor", "ids": ["line2d_13"], "color": None},
+        {"op": "crop", "viewBox": [None, None, 100, 50]},
+        {"op": "crop", "viewBox": [0, 0, 100]},
+        {"op": "crop", "viewBox": [0, 0, 0, 50]},
+        {"op": "remove_nodes", "nodes": "ab"},
+    ]
+    for operation in malformed:
+        with pytest.raises(ValueError):
+            EditLog([]).append(operation)
+        with pytest.raises(ValueError):
+            EditLog.from_json(json.dumps({"operations": [operation]}))
+
+    # Python's json accepts NaN, the page sends it as null.
+    with pytest.raises(ValueError):
+        EditLog.from_json('{"operations": [{"op": "scale", "ids": [], "factor": NaN}]}')
+
+    def fail(body):
+        raise KeyError("fail")
+
+    server = EditorServer(port=0).start()
+    session_id = server.register({}, {"edits": fail})
+    for handler, code in (("edits", 500), ("missing", 404)):
+        request = urllib.request.Request(
+            f"{server.url}/s/{session_id}/{handler}", data=b"{}"
+        )
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == code
+    server.shutdown()
+
+
+def test_edit_log_round_trips_tuple_node_keys(tmp_path):
+    G = nx.grid_2d_graph(3, 3)
+    log = EditLog([{"op": "remove_nodes", "nodes": [(0, 0), (1, 1)]}])
+
+    log.save(tmp_path / "edits.json")
+    loaded = EditLog.load(tmp_path / "edits.json")
+    assert loaded == log
+
+    edited = loaded.apply_graph(G)
+    assert (0, 0) not in edited and (1, 1) not in edited
+    assert edited.number_of_nodes() == 7
+
+    unsaved = EditLog([{"op": "remove_nodes", "nodes": [frozenset("ab")]}])
+    with pytest.raises(ValueError):
+        unsaved.save(tmp_path / "unsaved.json")
+    assert not (tmp_path / "unsaved.json").exists()
+
+
+def test_editors_return_edit_sessions(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    def post(url, operations):
+        request = urllib.request.Request(
+            urllib.parse.urljoin(url, "edits"),
+            data=json.dumps({"operations": operations}).encode(),
+        )
+        with urllib.request.urlopen(request) as response:
+            return response.status
+
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    session = JVG.MplEditor(fig).edit()
+
+    assert not session.done()
+    with pytest.raises(TimeoutError):
+        session.wait(timeout=0)
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post(opened[-1], [{"op": "explode"}])
+    assert error.value.code == 400
+
+    assert post(opened[-1], [{"op": "delete", "ids": ["line2d_13"]}]) == 204
+    assert b'id="line2d_13"' not in session.wait(timeout=5)
+    assert len(session.log) == 1
+
+    G = nx.Graph([("a", "b"), ("b", "c")])
+    session = JVG.NxEditor(G, cache=False).edit()
+    for nodes in ([-1], [3], ["a"]):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post(opened[-1], [{"op": "remove_nodes", "nodes": nodes}])
+        assert error.value.code == 400
+    post(opened[-1], [{"op": "remove_nodes", "nodes": [1]}])
+
+    edited = asyncio.run(asyncio.wait_for(session, timeout=5))
+    assert list(edited.nodes) == ["a", "c"] and edited.number_of_edges() == 0
+    assert session.log.operations == [{"op": "remove_nodes", "nodes": ["b"]}]
+    assert G.number_of_nodes() == 3
+
+
+def test_batch_export_applies_edit_log(tmp_path):
+    figures = []
+    for i in range(3):
+        fig, ax = plt.subplots()
+        ax.plot([0, 1], [0, i])
+        ax.plot([0, 1], [i, 0])
+        figures.append(fig)
+    log = EditLog([{"op": "delete", "ids": ["line2d_14"]}])
+    log.save(tmp_path / "edits.json")
+
+    report = batch_export(figures, log, directory=tmp_path / "in", workers=0)
+    pooled = batch_export(
+        figures[:2] + [dict],
+        tmp_path / "edits.json",
+        directory=tmp_path / "pool",
+        names=["a", "b", "c"],
+        workers=2,
+    )
+
+    assert [result.name for result in report.results] == [
+        "figure-00000",
+        "figure-00001",
+        "figure-00002",
+    ]
+    for result in report.results:
+        with open(result.paths[0], "rb") as file:
+            svg = file.read()
+        assert b'id="line2d_13"' in svg and b'id="line2d_14"' not in svg
+    assert report.throughput > 0 and "3 figures" in report.summary()
+
+    assert sorted(os.listdir(tmp_path / "pool")) == ["a.svg", "b.svg"]
+    assert [result.name for result in pooled.failed] == ["c"]
+    assert "failed c" in str(pooled)
+
+    for fig in figures:
+        plt.close(fig)
+
+
+def test_batch_export_requires_cairosvg_for_png(monkeypatch, tmp_path):
+    monkeypatch.setitem(sys.modules, "cairosvg", None)
+
+    with pytest.raises(ImportError, match="cairosvg"):
+        batch_export([], formats=("svg", "png"), directory=tmp_path)
+    with pytest.raises(ValueError):
+        batch_export([], formats=("gif",), directory=tmp_path)
+
+
+def test_nx_editor_from_edgelist(monkeypatch, tmp_path):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    (tmp_path / "edges.txt").write_text("# source target weight\na b 2\nb c 0.5\n")
+    np.save(tmp_path / "edges.npy", np.array([[7, 3], [3, 5], [5, 7]]))
+
+    editor = JVG.NxEditor.from_edgelist(tmp_path / "edges.txt", cache=False)
+    session = editor.edit(layout="force")
+
+    with urllib.request.urlopen(urllib.parse.urljoin(opened[-1], "graph.bin")) as r:
+        payload = GraphPayload.from_bytes(r.read())
+
+    assert editor.network is None
+    assert payload.labels == ["a", "b", "c"]
+    assert payload.sources.tolist() == [0, 1] and payload.targets.tolist() == [1, 2]
+    assert payload.widths.tolist() == [2, 0.5]
+    assert payload.positions.shape == (3, 2)
+
+    request = urllib.request.Request(
+        urllib.parse.urljoin(opened[-1], "edits"),
+        data=b'{"operations": [{"op": "remove_nodes", "nodes": [1]}]}',
+    )
+    urllib.request.urlopen(request).close()
+    edited = session.wait(timeout=5).to_payload()
+    assert edited.labels == ["a", "c"] and edited.number_of_edges == 0
+    editor.close()
+
+    editor = JVG.NxEditor.from_arrays(
+        *np.load(tmp_path / "edges.npy", mmap_mode="r").T,
+        nodes=[3, 5, 7, 9],
+        node_attrs={"size": [1, 2, 3, 4], "label": ["x", "y", "z", "w"]},
+    )
+    payload = editor.to_payload()
+
+    assert payload.labels == ["x", "y", "z", "w"] and payload.nodes == [3, 5, 7, 9]
+    assert payload.sources.tolist() == [2, 0, 1]
+    assert payload.sizes.tolist() == [1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        editor.to_payload(layout=nx.spring_layout)
+
+
+def test_nx_editor_expands_clusters(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    def post(path, data):
+        request = urllib.request.Request(urllib.parse.urljoin(opened[-1], path), data)
+        with urllib.request.urlopen(request) as response:
+            return response.read()
+
+    G = nx.Graph([("a", "b"), ("b", "c"), ("c", "d"), ("d", "e")])
+    G.add_edge("a", "e", weight=4)
+    clusters = {"a": "x", "b": "x", "c": "y", "d": "y", "e": "z"}
+
+    session = JVG.NxEditor(G, cache=False).edit(clusters=clusters)
+    with urllib.request.urlopen(urllib.parse.urljoin(opened[-1], "graph.bin")) as r:
+        payload = GraphPayload.from_bytes(r.read())
+
+    assert payload.labels == ["2 nodes", "2 nodes", "1 nodes"]
+    assert sorted(zip(payload.sources.tolist(), payload.targets.tolist())) == [
+        (0, 1),
+        (0, 2),
+        (1, 2),
+    ]
+
+    expanded = json.loads(post("expand", b"1"))
+    assert expanded["nodes"] == [2, 3]
+    assert expanded["labels"] == ["c", "d"]
+    edges = np.reshape(expanded["edges"], (-1, 4)).tolist()
+    assert sorted(edges) == [[1, 2, 0, 1], [2, 3, 1, 1], [3, 4, 1, 2]]
+    with pytest.raises(urllib.error.HTTPError):
+        post("expand", b"7")
+
+    # Super-node 2 stands for "e", id 3 + 2 is the expanded member "c".
+    post("edits", b'{"operations": [{"op": "remove_nodes", "nodes": [2, 5]}]}')
+    edited = session.wait(timeout=5)
+    assert sorted(edited.nodes) == ["a", "b", "d"]
+    assert session.log.operations == [{"op": "remove_nodes", "nodes": ["e", "c"]}]
+
+
+def test_nx_editor_queries_neighborhoods(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    def query(**body):
+        request = urllib.request.Request(
+            urllib.parse.urljoin(opened[-1], "neighborhood"),
+            json.dumps(body).encode(),
+        )
+        with urllib.request.urlopen(request) as response:
+            data = json.load(response)
+        return data["nodes"], np.reshape(data["edges"], (-1, 2)).tolist()
+
+    # A path a - b - c - d - e with a hub linked to all of it.
+    G = nx.path_graph(list("abcde"))
+    G.add_edges_from(("hub", node) for node in "abcde")
+    nx.set_node_attributes(G, {"a": "gene", "b": "gene", "c": "protein"}, "kind")
+
+    editor = JVG.NxEditor(G, cache=False)
+    session = editor.edit(seeds=["a"], max_degree=3)
+    with urllib.request.urlopen(urllib.parse.urljoin(opened[-1], "graph.bin")) as r:
+        assert GraphPayload.from_bytes(r.read()).number_of_nodes == 0
+    with urllib.request.urlopen(urllib.parse.urljoin(opened[-1], "editor.html")) as r:
+        assert b'"seeds": [0]' in r.read()
+
+    # The hub is returned but not expanded; its edge to "a" comes along.
+    nodes, edges = query(seeds=[0], hops=2, max_degree=3)
+    assert nodes == [0, 1, 5, 2]
+    assert sorted(edges) == [[0, 1], [0, 5], [1, 2], [1, 5], [2, 3], [2, 5]]
+
+    nodes, _ = query(seeds=[0], hops=2, where={"kind": "gene"})
+    assert nodes == [0, 1]
+    nodes, _ = query(seeds=[0], hops=3, where={"kind": ["gene", "protein"]})
+    assert nodes == [0, 1, 2]
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        query(seeds=[9])
+    assert error.value.code == 400
+    with pytest.raises(ValueError):
+        editor.edit(seeds=["x"])
+
+    post = urllib.request.Request(
+        urllib.parse.urljoin(opened[-1], "edits"),
+        b'{"operations": [{"op": "remove_nodes", "nodes": [5]}]}',
+    )
+    urllib.request.urlopen(post).close()
+    assert "hub" not in session.wait(timeout=5)
+    editor.close()
+
+
+def test_nx_editor_pushes_live_updates(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    def read_event(response):
+        lines = iter(response.readline, b"\n")
+        fields = dict(line.decode().rstrip("\n").split(": ", 1) for line in lines)
+        return int(fields["id"]), json.loads(fields["data"])["ops"]
+
+    editor = JVG.NxEditor(nx.Graph([("a", "b")]), cache=False)
+    session = editor.edit()
+    session.interval = 60
+
+    session.add_nodes([("c", {"color": "red", "x": 1})])
+    session.add_edges([("b", "c"), ("c", "d", {"weight": 2})])
+    session.update_attrs(nodes={"a": {"size": 20}})
+    with pytest.raises(KeyError):
+        session.update_attrs(edges={("a", "d"): {"width": 1}})
+
+    session.flush()
+    events = urllib.request.urlopen(urllib.parse.urljoin(opened[-1], "events"))
+    assert events.headers["Content-Type"] == "text/event-stream"
+    assert read_event(events) == (
+        0,
+        [
+            {
+                "op": "add_nodes",
+                "nodes": [
+                    {"id": 2, "label": "c", "size": 10, "color": "red", "x": 1.0},
+                    {"id": 3, "label": "d", "size": 10, "color": "#97c2fc"},
+                ],
+            },
+            {
+                "op": "add_edges",
+                "edges": [
+                    {"id": 1, "from": 1, "to": 2},
+                    {"id": 2, "width": 2.0, "from": 2, "to": 3},
+                ],
+            },
+            {"op": "update_nodes", "nodes": [{"id": 0, "size": 20.0}]},
+        ],
+    )
+
+    session.remove_edges([("b", "a"), ("a", "d")])
+    session.remove_nodes(["c"])
+    session.flush()
+    assert read_event(events) == (
+        1,
+        [{"op": "remove_edges", "ids": [0]}, {"op": "remove_nodes", "ids": [2]}],
+    )
+
+    # Reconnecting pages receive the events they missed.
+    request = urllib.request.Request(
+        urllib.parse.urljoin(opened[-1], "events"), headers={"Last-Event-ID": "0"}
+    )
+    with urllib.request.urlopen(request) as replay:
+        assert read_event(replay)[0] == 1
+
+    # Nodes added from Python can be removed on the page.
+    post = urllib.request.Request(
+        urllib.parse.urljoin(opened[-1], "edits"),
+        b'{"operations": [{"op": "remove_nodes", "nodes": [0, 3]}]}',
+    )
+    urllib.request.urlopen(post).close()
+    session.wait(timeout=5)
+    assert session.log.operations == [{"op": "remove_nodes", "nodes": ["a", "d"]}]
+
+    editor.close()
+    assert events.read() == b""
+
+
+def test_diff_svg_reports_changed_elements():
+    from JVG.svgproc import diff_svg
+
+    old = (
+        b'<svg xmlns="http://www.w3.org/2000/svg" width="10">'
+        b'<path id="a" d="M 0 0" style="stroke: red; fill: none"/>'
+        b'<path id="b" d="M 1 1"/><rect id="c"/></svg>'
+    )
+    new = (
+        b'<svg xmlns="http://www.w3.org/2000/svg" width="20">'
+        b'<path id="a" d="M 0 0" style="stroke: blue"/>'
+        b'<circle id="b"/><rect id="d"/></svg>'
+    )
+
+    assert diff_svg(old, old) == []
+    assert diff_svg(old, new) == [
+        {"op": "remove", "ids": ["c"]},
+        {"op": "update", "id": None, "attributes": {"width": "20"}},
+        {"op": "update", "id": "a", "style": {"stroke": "blue", "fill": None}},
+        {
+            "op": "replace",
+            "id": "b",
+            "svg": ET.tostring(ET.fromstring(new)[1]).decode(),
+        },
+        {
+            "op": "insert",
+            "svg": ET.tostring(ET.fromstring(new)[2]).decode(),
+            "after": "b",
+            "defs": False,
+        },
+    ]
+
+
+def test_mpl_editor_refresh_pushes_changes(monkeypatch):
+    opened = []
+    monkeypatch.setattr(JVG.webbrowser, "open", opened.append)
+
+    fig, ax = plt.subplots()
+    (line,) = ax.plot([0, 1], [0, 1], color="red")
+    line.set_gid("curve")
+    editor = JVG.MplEditor(fig)
+
+    with pytest.raises(RuntimeError):
+        editor.refresh()
+
+    session = editor.edit()
+    assert editor.refresh() == 0
+
+    line.set_color("blue")
+    assert editor.refresh() == 1
+    with urllib.request.urlopen(urllib.parse.urljoin(opened[-1], "events")) as events:
+        assert events.readline() == b"id: 0\n"
+        data = events.readline().decode().removeprefix("data: ")
+    assert json.loads(data) == {
+        "ops": [{"op": "update", "id": "curve", "style": {"stroke": "#0000ff"}}]
+    }
+
+    # Edits of the page are applied to the refreshed document.
+    request = urllib.request.Request(
+        urllib.parse.urljoin(opened[-1], "edits"),
+        data=b'{"operations": [{"op": "delete", "ids": ["patch_1"]}]}',
+    )
+    urllib.request.urlopen(request).close()
+    edited = session.wait(timeout=5)
+    assert b"#0000ff" in edited and b'id="patch_1"' not in edited
+
+    editor.close()
+    with pytest.raises(RuntimeError):
+        editor.refresh()
+
+
+def test_event_stream_bounds_replay_buffer():
+    from JVG.server import EventStream
+
+    stream = EventStream(max_events=3)
+    for i in range(5):
+        stream.publish(str(i))
+    stream.close()
+
+    assert len(stream) == 5
+    assert b"".join(stream.chunks()) == (
+        b"id: 2\ndata: 2\n\nid: 3\ndata: 3\n\nid: 4\ndata: 4\n\n"
+    )
+    assert b"".join(stream.chunks(last_event_id=0)).startswith(b"id: 2\n")
+    assert b"".join(stream.chunks(last_event_id=3)) == b"id: 4\ndata: 4\n\n"
+
+
+def test_graph_session_forgets_removed_nodes(monkeypatch):
+    monkeypatch.setattr(JVG.webbrowser, "open", lambda url: None)
+
+    editor = JVG.NxEditor(nx.Graph([("a", "b"), ("b", "c")]), cache=False)
+    session = editor.edit()
+    session.interval = 60
+    published = []
+    monkeypatch.setattr(session.stream, "publish", published.append)
+
+    session.remove_nodes(["b", "b"])
+    with pytest.raises(KeyError):
+        session.update_attrs(nodes={"b": {"color": "red"}})
+    with pytest.raises(KeyError):
+        session.update_attrs(edges={("a", "b"): {"width": 2}})
+
+    session.add_nodes(["b"])
+    session.add_edges([("a", "b")])
+    session.update_attrs(edges={("b", "a"): {"width": 2}})
+    session.flush()
+
+    assert json.loads(published[-1])["ops"] == [
+        {"op": "remove_nodes", "ids": [1]},
+        {
+            "op": "add_nodes",
+            "nodes": [{"id": 3, "label": "b", "size": 10, "color": "#97c2fc"}],
+        },
+        {"op": "add_edges", "edges": [{"id": 2, "from": 0, "to": 3}]},
+        {"op": "update_edges", "edges": [{"id": 2, "width": 2.0}]},
+    ]
+    assert session.nodes == ["a", "b", "c", "b"]
+
+    editor.close()
+
+
+def test_graph_session_updates_existing_edges(monkeypatch):
+    monkeypatch.setattr(JVG.webbrowser, "open", lambda url: None)
+
+    editor = JVG.NxEditor(nx.path_graph(3), cache=False)
+    session = editor.edit()
+    session.interval = 60
+    published = []
+    monkeypatch.setattr(session.stream, "publish", published.append)
+
+    session.add_edges([(1, 0), (0, 1, {"width": 3}), (0, 2), (2, 0)])
+    session.remove_edges([(0, 1)])
+    session.flush()
+
+    assert json.loads(published[-1])["ops"] == [
+        {"op": "add_edges", "edges": [{"id": 2, "from": 0, "to": 2}]},
+        {"op": "update_edges", "edges": [{"id": 0, "width": 3.0}]},
+        {"op": "remove_edges", "ids": [0]},
+    ]
+
+    editor.close()